@@ -0,0 +1,133 @@
+import { html, LitElement } from 'lit';
+import { customElement, property, state } from 'lit/decorators.js';
+
+
+declare global {
+    interface HTMLElementTagNameMap {
+        'o-autocomplete': AutocompleteElement,
+    }
+}
+
+type AutocompleteChoice = { value: string, label: string };
+type AutocompleteResponse = { results: AutocompleteChoice[], next_cursor: string | null };
+
+/**
+ * Searches options of the slotted select on the server.
+ * The select contains only selected options, picked results are added to it as selected options.
+ */
+@customElement('o-autocomplete')
+export class AutocompleteElement extends LitElement {
+    @property()
+    url: string = '';
+
+    @property()
+    placeholder: string = '';
+
+    @property({ type: Number })
+    delay = 250;
+
+    @state()
+    results: AutocompleteChoice[] = [];
+
+    @state()
+    open = false;
+
+    nextCursor: string | null = null;
+    loading = false;
+    term = '';
+    timer?: number;
+    controller?: AbortController;
+
+    get select(): HTMLSelectElement {
+        return this.querySelector('select')!;
+    }
+
+    protected override createRenderRoot() {
+        return this; // use the admin styles
+    }
+
+    override connectedCallback() {
+        super.connectedCallback();
+        this.select.classList.add('hidden');
+    }
+
+    async fetchResults(append: boolean) {
+        this.controller?.abort();
+        this.controller = new AbortController();
+        const url = new URL(this.url, window.location.href);
+        url.searchParams.set('q', this.term);
+        if (append && this.nextCursor) {
+            url.searchParams.set('cursor', this.nextCursor);
+        }
+
+        this.loading = true;
+        try {
+            const response = await fetch(url, {
+                signal: this.controller.signal,
+                headers: { Accept: 'application/json' },
+            });
+            const data: AutocompleteResponse = await response.json();
+            this.results = append ? [...this.results, ...data.results] : data.results;
+            this.nextCursor = data.next_cursor;
+            this.open = true;
+        } catch (e) {
+            if ((e as Error).name !== 'AbortError') {
+                throw e;
+            }
+        } finally {
+            this.loading = false;
+        }
+    }
+
+    onInput(e: Event) {
+        this.term = (e.target as HTMLInputElement).value;
+        window.clearTimeout(this.timer);
+        this.timer = window.setTimeout(() => this.fetchResults(false), this.delay);
+    }
+
+    onScroll(e: Event) {
+        const list = e.target as HTMLElement;
+        if (!this.loading && this.nextCursor && list.scrollTop + list.clientHeight >= list.scrollHeight - 20) {
+            this.fetchResults(true);
+        }
+    }
+
+    choose(choice: AutocompleteChoice) {
+        if (!this.select.multiple) {
+            this.select.replaceChildren();
+        }
+        if (![...this.select.options].some(option => option.value === choice.value)) {
+            this.select.append(new Option(choice.label, choice.value, true, true));
+        }
+        this.select.dispatchEvent(new Event('change', { bubbles: true }));
+        this.open = false;
+        this.requestUpdate();
+    }
+
+    remove(option: HTMLOptionElement) {
+        option.remove();
+        this.select.dispatchEvent(new Event('change', { bubbles: true }));
+        this.requestUpdate();
+    }
+
+    protected override render(): unknown {
+        const selected = [...this.select.selectedOptions].filter(option => option.value);
+        return html`
+            <div class="autocomplete">
+                ${selected.map(option => html`
+                    <span class="autocomplete-selected">
+                        ${option.text}
+                        <button type="button" @click=${() => this.remove(option)}>&times;</button>
+                    </span>`)}
+                <input type="search" autocomplete="off" placeholder=${this.placeholder}
+                       @input=${this.onInput} @focus=${() => this.fetchResults(false)}
+                       @keydown=${(e: KeyboardEvent) => e.key === 'Escape' && (this.open = false)}>
+                <ul class="autocomplete-results ${this.open ? '' : 'hidden'}" role="listbox" @scroll=${this.onScroll}>
+                    ${this.results.map(choice => html`
+                        <li class="autocomplete-option" role="option" @click=${() => this.choose(choice)}>
+                            ${choice.label}
+                        </li>`)}
+                </ul>
+            </div>`;
+    }
+}
@@ -1 +1,2 @@
 export * from './repeated_input';
+export * from './autocomplete';
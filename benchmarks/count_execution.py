@@ -0,0 +1,129 @@
+"""
+Compare paginate time of SADataSource count execution modes on the example Order and Product models.
+
+Usage: PYTHONPATH=. python benchmarks/count_execution.py [database URL] (from the repository root)
+The default database is a temporary SQLite file, pass an async URL (like postgresql+asyncpg://...) to measure
+another database. The benchmark creates the example tables it needs, fills them and drops them afterwards,
+so point it to an empty database.
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from examples.models import Brand, Country, Currency, Customer, Order, Product
+from ohmyadmin.datasources.sqlalchemy import CountExecution, SADataSource
+
+tables = [model.__table__ for model in [Country, Currency, Customer, Brand, Order, Product]]
+
+
+def order_rows(row_count: int) -> list[dict[str, typing.Any]]:
+    return [
+        {
+            "id": index,
+            "number": f"N{index:06}",
+            "customer_id": 1,
+            "status": Order.Status.NEW,
+            "currency_code": "USD",
+            "country_code": "US",
+            "address": "1 Main St",
+            "city": "Springfield",
+            "zip": "00001",
+            "notes": "",
+            "created_at": datetime.datetime(2026, 1, 1) + datetime.timedelta(minutes=index),
+        }
+        for index in range(1, row_count + 1)
+    ]
+
+
+def product_rows(row_count: int) -> list[dict[str, typing.Any]]:
+    return [
+        {
+            "id": index,
+            "name": f"Product {index:06}",
+            "slug": f"product-{index:06}",
+            "brand_id": 1,
+            "price": 10,
+            "compare_at_price": 12,
+            "cost_per_item": 5,
+            "description": "",
+            "availability": datetime.datetime(2026, 1, 1),
+            "sku": index,
+            "quantity": 10,
+            "security_stock": 1,
+            "barcode": f"{index:012}",
+            "can_be_returned": True,
+            "can_be_shipped": True,
+        }
+        for index in range(1, row_count + 1)
+    ]
+
+
+async def fill(session: AsyncSession, row_count: int) -> None:
+    await session.execute(sa.delete(Order))
+    await session.execute(sa.delete(Product))
+    await session.execute(sa.insert(Order), order_rows(row_count))
+    await session.execute(sa.insert(Product), product_rows(row_count))
+    await session.commit()  # concurrent counts do not see uncommitted rows
+
+
+async def measure(request: Request, datasource: SADataSource, runs: int = 200) -> float:
+    started_at = time.perf_counter()
+    for run in range(runs):
+        await datasource.paginate(request, page=run % 10 + 1, page_size=25)
+    return (time.perf_counter() - started_at) / runs * 1000
+
+
+async def main(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Order.metadata.create_all, tables=tables)
+        await connection.execute(sa.insert(Country), [{"code": "US", "name": "United States"}])
+        await connection.execute(sa.insert(Currency), [{"code": "USD", "name": "US Dollar"}])
+        await connection.execute(
+            sa.insert(Customer),
+            [
+                {
+                    "id": 1,
+                    "name": "John",
+                    "email": "john@example.com",
+                    "phone": "",
+                    "birthday": datetime.date(1990, 1, 1),
+                }
+            ],
+        )
+        await connection.execute(
+            sa.insert(Brand),
+            [{"id": 1, "name": "Acme", "slug": "acme", "website": "", "description": ""}],
+        )
+
+    modes: list[CountExecution] = ["sequential", "concurrent", "window"]
+    async with async_sessionmaker(engine)() as session:
+        request = Request({"type": "http", "state": {"dbsession": session}})
+        print(f"{'model':>8} {'rows':>7} {'sequential, ms':>15} {'concurrent, ms':>15} {'window, ms':>11}")
+        for row_count in [1_000, 10_000, 100_000]:
+            await fill(session, row_count)
+            for model, ordering in [(Order, "created_at"), (Product, "name")]:
+                timings = [
+                    await measure(request, SADataSource(model, count_execution=mode).order_by({ordering: "asc"}))
+                    for mode in modes
+                ]
+                print(f"{model.__name__:>8} {row_count:>7} {timings[0]:>15.2f} {timings[1]:>15.2f} {timings[2]:>11.2f}")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Order.metadata.drop_all, tables=tables)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        default_url = "sqlite+aiosqlite:///" + os.path.join(directory, "benchmark.sqlite")
+        asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else default_url))
@@ -0,0 +1,123 @@
+"""
+Measure the time and allocations of applying 10 filters and an ordering to SADataSource and building the statement.
+
+Usage: python benchmarks/datasource_filters.py (with ohmyadmin installed or on PYTHONPATH)
+"clone per filter" is the former strategy: every call creates the clone via __init__, guessing the primary key
+again, and adds its clause to the statement at once. "cold" clears the statement cache before every run,
+"warm" reuses cached filter expressions.
+"""
+
+import datetime
+import timeit
+import tracemalloc
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from ohmyadmin.datasources.datasource import (
+    DateFilter,
+    DateOperation,
+    InFilter,
+    NumberFilter,
+    NumberOperation,
+    OrFilter,
+    QueryFilter,
+    SortingType,
+    StringFilter,
+    StringOperation,
+)
+from ohmyadmin.datasources.sqlalchemy import SADataSource, guess_field_type, guess_pk_field, statement_cache
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str]
+    country: orm.Mapped[str]
+
+
+class Order(Base):
+    __tablename__ = "orders"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    number: orm.Mapped[str]
+    status: orm.Mapped[str]
+    total: orm.Mapped[float]
+    notes: orm.Mapped[str] = orm.mapped_column(sa.Text)
+    created_at: orm.Mapped[datetime.datetime]
+    customer_id: orm.Mapped[int] = orm.mapped_column(sa.ForeignKey("customers.id"))
+    customer: orm.Mapped[Customer] = orm.relationship()
+
+
+filters = [
+    StringFilter("number", "N00", StringOperation.STARTSWITH),
+    StringFilter("notes", "urgent", StringOperation.CONTAINS, case_insensitive=True),
+    InFilter("status", ["new", "paid"]),
+    NumberFilter("total", 10, NumberOperation.GREATER_OR_EQUAL),
+    NumberFilter("total", 1000, NumberOperation.LESS),
+    DateFilter("created_at", datetime.datetime(2026, 1, 1), DateOperation.AFTER),
+    DateFilter("created_at", datetime.datetime(2026, 12, 31), DateOperation.BEFORE),
+    StringFilter("customer.name", "john", StringOperation.CONTAINS, case_insensitive=True),
+    InFilter("customer.country", ["US", "DE"]),
+    OrFilter([InFilter("id", [1, 2, 3]), NumberFilter("customer_id", 1, NumberOperation.EQUALS)]),
+]
+
+
+class ClonePerFilterDataSource(SADataSource[Order]):
+    def _rebuild(self, stmt: sa.Select) -> "ClonePerFilterDataSource":
+        guess_field_type(self.model_class, guess_pk_field(self.model_class))
+        clone = self.__class__(self.model_class, query=self.query, query_for_list=self.query_for_list)
+        clone.__dict__["_stmt"] = stmt
+        return clone
+
+    def filter(self, clause: QueryFilter) -> "ClonePerFilterDataSource":
+        return self._rebuild(self._stmt.where(self._build_where_clause(clause)))
+
+    def order_by(self, sorting: typing.Mapping[str, SortingType]) -> "ClonePerFilterDataSource":
+        props = self.metadata.get_column_properties(list(sorting.keys()))
+        stmt = self._stmt.order_by(None)
+        for ordering_field, ordering_dir in sorting.items():
+            column = props[ordering_field].columns[0]
+            stmt = stmt.order_by(column.desc() if ordering_dir == "desc" else column.asc())
+        return self._rebuild(stmt)
+
+
+def build_statement(datasource: SADataSource[Order]) -> sa.Select:
+    for query_filter in filters:
+        datasource = datasource.filter(query_filter)
+    return datasource.order_by({"created_at": "desc", "number": "asc"})._stmt
+
+
+def measure(datasource: SADataSource[Order], cold: bool) -> tuple[float, int]:
+    def run() -> None:
+        if cold:
+            statement_cache.clear()
+        build_statement(datasource)
+
+    runs, total = timeit.Timer(run).autorange()
+    run()  # warm up the cache for the warm run allocations
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    run()
+    blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename"))
+    tracemalloc.stop()
+    return total / runs * 1_000_000, blocks
+
+
+def main() -> None:
+    print(f"{'strategy':>16} {'time, us':>9} {'allocated blocks':>17}")
+    for name, datasource, cold in [
+        ("clone per filter", ClonePerFilterDataSource(Order), False),
+        ("cold", SADataSource(Order), True),
+        ("warm", SADataSource(Order), False),
+    ]:
+        elapsed, blocks = measure(datasource, cold)
+        print(f"{name:>16} {elapsed:>9.1f} {blocks:>17}")
+
+
+if __name__ == "__main__":
+    main()
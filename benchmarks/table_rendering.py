@@ -0,0 +1,66 @@
+"""
+Compare rendering time of components.Table in the regular and the compiled modes.
+
+Usage: python benchmarks/table_rendering.py (with ohmyadmin installed or on PYTHONPATH)
+"""
+
+import dataclasses
+import timeit
+
+from async_storages import FileStorage, MemoryBackend
+from starlette.requests import Request
+
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.components import (
+    Badge,
+    BadgeColor,
+    BoolValue,
+    Link,
+    Table,
+    TableColumn,
+    TableHeadCell,
+    TableRow,
+    Text,
+)
+
+
+@dataclasses.dataclass
+class Order:
+    id: int
+    number: str
+    customer: str
+    status: str
+    paid: bool
+
+
+def build_row(order: Order) -> TableRow[TableColumn]:
+    return TableRow(
+        children=[
+            TableColumn(Link(f"/orders/{order.id}", text=order.number)),
+            TableColumn(Text(order.customer)),
+            TableColumn(Badge(order.status, {"new": BadgeColor.BLUE, "paid": BadgeColor.GREEN})),
+            TableColumn(BoolValue(order.paid)),
+        ]
+    )
+
+
+def main() -> None:
+    admin = OhMyAdmin(file_storage=FileStorage(MemoryBackend()), precompile=True)
+    request = Request({"type": "http", "state": {"ohmyadmin": admin}})
+    header = TableRow(children=[TableHeadCell(label) for label in ["Number", "Customer", "Status", "Paid"]])
+
+    print(f"{'rows':>6} {'components, ms':>16} {'compiled, ms':>14} {'speedup':>8}")
+    for row_count in [25, 100, 500]:
+        orders = [
+            Order(index, f"N{index:05}", f"Customer {index}", "new", bool(index % 2)) for index in range(row_count)
+        ]
+        timings = []
+        for compiled in [False, True]:
+            table = Table(orders, header=header, row_builder=build_row, compiled=compiled)
+            runs, total = timeit.Timer(lambda: table.render(request)).autorange()
+            timings.append(total / runs * 1000)
+        print(f"{row_count:>6} {timings[0]:>16.2f} {timings[1]:>14.2f} {timings[0] / timings[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
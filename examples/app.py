@@ -57,6 +57,7 @@ class DatabaseSessionMiddleware:
         async with self.sessionmaker() as dbsession:
             scope.setdefault("state", {})
             scope["state"]["dbsession"] = dbsession
+            scope["state"]["dbsessionmaker"] = self.sessionmaker
             await self.app(scope, receive, send)
 
 
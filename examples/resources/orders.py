@@ -7,11 +7,12 @@ from starlette.requests import Request
 from starlette_babel import formatters
 
 from examples import icons
-from examples.models import Country, Currency, Customer, Order, OrderItem, Product
+from examples.models import Country, Currency, Order, OrderItem, Product
 from examples.resources.customers import CustomerResource
 from ohmyadmin import components, filters
-from ohmyadmin.datasources.sqlalchemy import load_choices, SADataSource
-from ohmyadmin.forms.utils import safe_int_coerce
+from ohmyadmin.datasources.sqlalchemy import form_choices_from, load_choices, SADataSource
+from ohmyadmin.forms.fields import AutocompleteField
+from ohmyadmin.forms.utils import init_concurrently, safe_int_coerce
 from ohmyadmin.metrics import Partition, PartitionMetric, TrendMetric, TrendValue, ValueMetric, ValueValue
 from ohmyadmin.resources.resource import ResourceScreen
 from ohmyadmin.components import BadgeColor, CellAlign
@@ -33,7 +34,9 @@ class OrderItemForm(wtforms.Form):
 
 class OrderForm(wtforms.Form):
     number = wtforms.StringField(validators=[wtforms.validators.data_required()])
-    customer_id = wtforms.SelectField(coerce=safe_int_coerce, validators=[wtforms.validators.data_required()])
+    customer_id = AutocompleteField(
+        resource=CustomerResource, coerce=safe_int_coerce, validators=[wtforms.validators.data_required()]
+    )
     status = wtforms.SelectField(choices=Order.Status.choices, validators=[wtforms.validators.data_required()])
     currency_code = wtforms.SelectField(validators=[wtforms.validators.data_required()])
     country_code = wtforms.SelectField(validators=[wtforms.validators.data_required()])
@@ -312,6 +315,7 @@ class OrdersResource(ResourceScreen):
     )
     page_filters = [
         filters.ChoiceFilter("status", choices=Order.Status.choices),
+        filters.ChoiceFilter("customer_id", label="Customer", autocomplete=CustomerResource),
         # filters.ChoiceFilter(Order.currency_code),
         filters.DecimalFilter("total_price"),
         filters.DateRangeFilter("created_at"),
@@ -323,9 +327,18 @@ class OrdersResource(ResourceScreen):
     form_view_class = OrderFormView
 
     async def init_form(self, request: Request, form: OrderForm) -> None:
-        await load_choices(request.state.dbsession, form.customer_id, sa.select(Customer))
-        await load_choices(request.state.dbsession, form.currency_code, sa.select(Currency), value_attr="code")
-        await load_choices(request.state.dbsession, form.country_code, sa.select(Country), value_attr="code")
+        # every loader uses own session, so they run concurrently
+        sessionmaker = request.state.dbsessionmaker
+
+        async def load_product_choices() -> None:
+            choices = await form_choices_from(Product, sessionmaker=sessionmaker)(request)
+            for item_form in form.items:
+                item_form.product_id.choices = choices
 
-        for item_form in form.items:
-            await load_choices(request.state.dbsession, item_form.product_id, sa.select(Product))
+        await init_concurrently(
+            {
+                "currency_code": load_choices(sessionmaker, form.currency_code, sa.select(Currency), value_attr="code"),
+                "country_code": load_choices(sessionmaker, form.country_code, sa.select(Country), value_attr="code"),
+                "items.product_id": load_product_choices(),
+            }
+        )
@@ -0,0 +1,66 @@
+"""
+Command line tools.
+
+Precompile templates into a bytecode cache directory during the image build:
+
+    python -m ohmyadmin precompile-templates /app/.jinja-cache --template-dir templates
+
+then pass `jinja2.FileSystemBytecodeCache("/app/.jinja-cache")` as `bytecode_cache` to OhMyAdmin.
+The cache must be built by the same Python version and from the same template paths as used at runtime.
+"""
+
+import argparse
+import importlib
+import pathlib
+import sys
+import typing
+
+import jinja2
+
+from ohmyadmin.templating import create_jinja_env, precompile_templates
+
+
+def load_object(path: str) -> typing.Any:
+    module_name, _, attr = path.partition(":")
+    obj = importlib.import_module(module_name)
+    for name in attr.split(".") if attr else []:
+        obj = getattr(obj, name)
+    return obj
+
+
+def precompile_templates_command(args: argparse.Namespace) -> int:
+    directory = pathlib.Path(args.directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    bytecode_cache = jinja2.FileSystemBytecodeCache(str(directory))
+    if args.app:
+        jinja_env = load_object(args.app).jinja_env
+        jinja_env.bytecode_cache = bytecode_cache
+    else:
+        jinja_env = create_jinja_env(args.template_dir, args.template_package, bytecode_cache)
+
+    errors = precompile_templates(jinja_env)
+    for name, error in errors.items():
+        print(f"{name}: {error}", file=sys.stderr)
+
+    total = len(jinja_env.list_templates())
+    print(f"Compiled {total - len(errors)} of {total} templates into {directory}.")
+    return 1 if errors else 0
+
+
+def main(argv: typing.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="ohmyadmin")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    precompile = commands.add_parser("precompile-templates", help="Compile templates into a bytecode cache directory.")
+    precompile.add_argument("directory", help="Bytecode cache directory.")
+    precompile.add_argument("--app", help='OhMyAdmin instance to take templates from, like "myapp.admin:admin".')
+    precompile.add_argument("--template-dir", help="Additional template directory.")
+    precompile.add_argument("--template-package", help="Additional template package.")
+    precompile.set_defaults(handler=precompile_templates_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
 from ohmyadmin.actions.actions import (
     Action,
     CallbackAction,
+    ExportAction,
     LinkAction,
     ActionVariant,
     ModalActionCallback,
     SubmitAction,
     ModalAction,
 )
+from ohmyadmin.actions.jobs import AsyncioJobBackend, Job, JobBackend, ProcessPoolJobBackend
 
 __all__ = [
     "Action",
@@ -15,5 +17,10 @@ __all__ = [
     "LinkAction",
     "ModalAction",
     "CallbackAction",
+    "ExportAction",
     "ModalActionCallback",
+    "Job",
+    "JobBackend",
+    "AsyncioJobBackend",
+    "ProcessPoolJobBackend",
 ]
@@ -10,9 +10,11 @@ from starlette.responses import Response
 from starlette.types import Receive, Scope, Send
 
 from ohmyadmin import components, htmx
+from ohmyadmin.actions.jobs import Job
 from ohmyadmin.components import form
 from ohmyadmin.components import BaseFormLayoutBuilder, Component, FormLayoutBuilder
 from ohmyadmin.forms.utils import create_form, validate_on_submit
+from ohmyadmin.routing import url_for
 from ohmyadmin.templating import render_to_response
 
 ActionVariant = typing.Literal["accent", "default", "text", "danger", "link", "primary"]
@@ -58,6 +60,29 @@ class LinkAction(Action):
         return self.url
 
 
+class ExportAction(LinkAction):
+    """Download rows of the current index screen, the active search, filters and ordering apply."""
+
+    def __init__(
+        self,
+        format: str = "csv",
+        label: str = "",
+        icon: str = "",
+        variant: ActionVariant = "default",
+    ) -> None:
+        super().__init__(
+            label=label or _("Export to {format}", domain="ohmyadmin").format(format=format.upper()),
+            icon=icon,
+            variant=variant,
+        )
+        self.format = format
+
+    def get_url(self, request: Request, model: typing.Any | None = None) -> URL:
+        screen = request.state.screen
+        url = url_for(request, screen.get_export_route_name(), format=self.format)
+        return url.replace(query=request.url.query)
+
+
 class SubmitAction(Action):
     def __init__(self, label: str = "", icon: str = "", name: str = "", variant: ActionVariant = "default") -> None:
         self.name = name
@@ -105,6 +130,38 @@ class CallbackAction(Action):
         raise NotImplementedError()
 
 
+class BackgroundJobMixin:
+    label: str
+    job_template: str = "ohmyadmin/jobs/job_modal.html"
+
+    # at most this many jobs started by the action run at the same time, the rest wait in the queue
+    max_concurrent_jobs: int | None = None
+
+    def get_job_concurrency_key(self) -> str:
+        return ".".join([self.__class__.__module__, self.__class__.__name__])
+
+    async def start_job(
+        self, request: Request, fn: typing.Callable[..., typing.Any], *args: typing.Any, **kwargs: typing.Any
+    ) -> Response:
+        """
+        Run the function in the admin's job backend and respond with the job progress modal.
+
+        With the default backend `fn` is an async function that receives the Job as the first argument.
+        It runs after the response is sent, so it must not use the request database session.
+        """
+        job: Job = request.state.ohmyadmin.job_backend.submit(
+            fn,
+            *args,
+            name=str(self.label),
+            concurrency_key=self.get_job_concurrency_key(),
+            concurrency_limit=self.max_concurrent_jobs,
+            **kwargs,
+        )
+        response = render_to_response(request, self.job_template, {"action": self, "job": job})
+        response.headers["x-ohmyadmin-job"] = job.id
+        return htmx.toast(response, _('"{name}" has been started.', domain="ohmyadmin").format(name=job.name))
+
+
 ModalActionCallback: typing.TypeAlias = typing.Callable[[Request, wtforms.Form], typing.Awaitable[Response]]
 
 
@@ -113,7 +170,7 @@ class ModalFormLayout(BaseFormLayoutBuilder):
         return components.Column([components.FormInput(field) for field in form])
 
 
-class ModalAction(Action):
+class ModalAction(BackgroundJobMixin, Action):
     dangerous: bool = False
     variant: ActionVariant = "default"
     form_class: type[wtforms.Form] = wtforms.Form
@@ -165,6 +222,8 @@ class ModalAction(Action):
         await self.initialize_form(request, form)
         if await validate_on_submit(request, form):
             response = await self.handle(request, form)
+            if "x-ohmyadmin-job" in response.headers:
+                return response  # keep the modal open to display the job progress
             return htmx.close_modal(response)
 
         form_builder = self.form_builder_class()
@@ -188,7 +247,7 @@ class ModalAction(Action):
 ObjectIds = typing.Iterable[str | int] | typing.Literal["__all__"]
 
 
-class NewAction:
+class NewAction(BackgroundJobMixin):
     dangerous: bool = False
     label: str = _("Unnamed Action", domain="ohmyadmin")
     icon: str = ""
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import datetime
+import functools
+import os
+import typing
+import uuid
+
+JobStatus = typing.Literal["pending", "running", "done", "failed", "cancelled"]
+
+
+@dataclasses.dataclass
+class Job:
+    """
+    A handle of a background job.
+
+    Job functions receive it as the first argument and call `report_progress` to update the status page.
+    """
+
+    name: str
+    id: str = dataclasses.field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = "pending"
+    progress: int = 0
+    total: int | None = None
+    message: str = ""
+    error: str = ""
+    result: typing.Any = None
+    created_at: datetime.datetime = dataclasses.field(default_factory=datetime.datetime.now)
+    finished_at: datetime.datetime | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def percent(self) -> int | None:
+        """Return the progress in percents or None if the total amount of work is unknown."""
+        if self.status == "done":
+            return 100
+        if not self.total:
+            return None
+        return min(100, round(self.progress * 100 / self.total))
+
+    def report_progress(self, progress: int, total: int | None = None, message: str = "") -> None:
+        self.progress = progress
+        self.total = total if total is not None else self.total
+        self.message = message or self.message
+
+
+class JobBackend(abc.ABC):
+    """Runs job functions outside of the request and keeps track of their state."""
+
+    @abc.abstractmethod
+    def submit(
+        self,
+        fn: typing.Callable[..., typing.Any],
+        *args: typing.Any,
+        name: str = "",
+        concurrency_key: str = "",
+        concurrency_limit: int | None = None,
+        **kwargs: typing.Any,
+    ) -> Job:
+        """
+        Schedule the function and return its job handle immediately.
+
+        At most `concurrency_limit` jobs with the same `concurrency_key` run at the same time,
+        the rest wait in the queue with "pending" status.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> Job | None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def cancel(self, job_id: str) -> bool:
+        raise NotImplementedError()
+
+    async def wait(self, job_id: str, timeout: float | None = None) -> None:
+        """Wait until the job finishes or `timeout` seconds pass, the job keeps running after the timeout."""
+        deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+        while (job := self.get(job_id)) and not job.finished:
+            if deadline is not None and asyncio.get_running_loop().time() >= deadline:
+                return
+            await asyncio.sleep(0.05)
+
+
+class AsyncioJobBackend(JobBackend):
+    """
+    Runs async job functions as tasks of the current event loop.
+
+    `max_workers` limits the number of jobs running at once across all keys.
+    The state of the last `history_size` jobs is kept in memory, so it is lost on restart
+    and is not shared between server processes.
+    """
+
+    def __init__(self, max_workers: int = 10, history_size: int = 100) -> None:
+        self.max_workers = max_workers
+        self.history_size = history_size
+        self._semaphore: asyncio.Semaphore | None = None
+        self._key_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._jobs: collections.OrderedDict[str, Job] = collections.OrderedDict()
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    def _get_semaphores(self, key: str, limit: int | None) -> list[asyncio.Semaphore]:
+        # semaphores are created lazily because they bind to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        semaphores = [self._semaphore]
+        if key and limit:
+            if key not in self._key_semaphores:
+                self._key_semaphores[key] = asyncio.Semaphore(limit)
+            semaphores.insert(0, self._key_semaphores[key])
+        return semaphores
+
+    async def execute(
+        self, job: Job, fn: typing.Callable[..., typing.Any], *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.Any:
+        return await fn(job, *args, **kwargs)
+
+    async def _run(
+        self,
+        job: Job,
+        semaphores: list[asyncio.Semaphore],
+        fn: typing.Callable[..., typing.Any],
+        args: tuple[typing.Any, ...],
+        kwargs: dict[str, typing.Any],
+    ) -> None:
+        try:
+            async with contextlib.AsyncExitStack() as stack:
+                for semaphore in semaphores:
+                    await stack.enter_async_context(semaphore)
+                job.status = "running"
+                job.result = await self.execute(job, fn, *args, **kwargs)
+                job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as ex:
+            job.status = "failed"
+            job.error = str(ex) or ex.__class__.__name__
+        finally:
+            job.finished_at = datetime.datetime.now()
+
+    def _on_task_done(self, job: Job, task: asyncio.Task[None]) -> None:
+        self._tasks.pop(job.id, None)
+        if not job.finished:
+            # the task was cancelled before it started, _run did not get a chance to update the job
+            job.status = "cancelled"
+            job.finished_at = datetime.datetime.now()
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history_size:
+            job_id, old_job = next(iter(self._jobs.items()))
+            if not old_job.finished:
+                break  # never forget running jobs
+            del self._jobs[job_id]
+
+    def submit(
+        self,
+        fn: typing.Callable[..., typing.Any],
+        *args: typing.Any,
+        name: str = "",
+        concurrency_key: str = "",
+        concurrency_limit: int | None = None,
+        **kwargs: typing.Any,
+    ) -> Job:
+        job = Job(name=name or getattr(fn, "__name__", "job"))
+        semaphores = self._get_semaphores(concurrency_key, concurrency_limit)
+        self._remember(job)
+        task = self._tasks[job.id] = asyncio.create_task(self._run(job, semaphores, fn, args, kwargs))
+        task.add_done_callback(functools.partial(self._on_task_done, job))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        if task := self._tasks.get(job_id):
+            return task.cancel()
+        return False
+
+    async def wait(self, job_id: str, timeout: float | None = None) -> None:
+        # asyncio.wait does not cancel the task on timeout, unlike asyncio.wait_for
+        if task := self._tasks.get(job_id):
+            await asyncio.wait({task}, timeout=timeout)
+
+
+class ProcessPoolJobBackend(AsyncioJobBackend):
+    """
+    Runs job functions in a pool of worker processes, use it for CPU bound jobs.
+
+    Job functions must be plain (not async) functions that can be pickled, they receive the job arguments only
+    and cannot report progress. Cancelling a job that is already running in a worker does not stop the worker.
+    """
+
+    def __init__(self, max_workers: int | None = None, history_size: int = 100) -> None:
+        max_workers = max_workers or os.cpu_count() or 1
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        super().__init__(max_workers=max_workers, history_size=history_size)
+
+    async def execute(
+        self, job: Job, fn: typing.Callable[..., typing.Any], *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
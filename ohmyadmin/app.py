@@ -5,31 +5,36 @@ import os
 import jinja2
 import operator
 import typing
+import warnings
 
 import slugify
 from async_storages import FileStorage
 from starlette import templating
+from starlette.exceptions import HTTPException
 from starlette.middleware import Middleware
 from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.requests import Request
 from starlette.responses import RedirectResponse, Response
-from starlette.routing import BaseRoute, Mount, Route, Router
+from starlette.datastructures import URL
+from starlette.routing import BaseRoute, Mount, NoMatchFound, Route, Router
 from starlette.staticfiles import StaticFiles
 from starlette.types import Receive, Scope, Send
 from starlette_babel import gettext_lazy as _
-from starlette_babel.contrib.jinja import configure_jinja_env
 from starlette_flash import flash
 
-import ohmyadmin.components.layout
 import ohmyadmin.components.menu
-from ohmyadmin import components
+from ohmyadmin import components, htmx
+from ohmyadmin.actions.jobs import AsyncioJobBackend, JobBackend
 from ohmyadmin.authentication.policy import AnonymousAuthPolicy, AuthPolicy
+from ohmyadmin.caching import CacheBackend, FragmentCache, MemoryCacheBackend
 from ohmyadmin.components.menu import MenuBuilder
 from ohmyadmin.menu import MenuItem
 from ohmyadmin.middleware import LoginRequiredMiddleware
-from ohmyadmin.templating import model_pk, static_url, to_html_attrs, url_matches
+from ohmyadmin.routing import PrefixDispatcher, URLIndex
+from ohmyadmin.templating import create_jinja_env, precompile_templates, static_url, url_matches
 from ohmyadmin.theme import Theme
 from ohmyadmin.screens.base import Screen
+from ohmyadmin.screens.jobs import JobScreen
 
 
 class OhMyAdmin(Router):
@@ -42,34 +47,37 @@ class OhMyAdmin(Router):
         menu_builder: MenuBuilder | None = None,
         template_dir: str | os.PathLike | None = None,
         template_package: str | None = None,
+        job_backend: JobBackend | None = None,
+        bytecode_cache: jinja2.BytecodeCache | None = None,
+        precompile: bool = False,
+        cache_backend: CacheBackend | None = None,
     ) -> None:
+        """
+        Pass `bytecode_cache` (e.g. `jinja2.FileSystemBytecodeCache`) to reuse compiled templates between processes,
+        `precompile` compiles all templates at startup instead of on the first request that uses them.
+        `cache_backend` stores fragments of components wrapped with `Cached`, it is in-memory by default.
+        """
         self.theme = theme
         self.screens = screens or []
         self.auth_policy = auth_policy or AnonymousAuthPolicy()
         self.file_storage = file_storage
+        self.job_backend = job_backend or AsyncioJobBackend()
+        self.fragment_cache = FragmentCache(cache_backend or MemoryCacheBackend())
         self.menu_builder = menu_builder or ohmyadmin.components.menu.MenuBuilder(builder=self._default_menu_builder)
+        self._menu_cache: dict[str, components.Component] = {}
 
-        jinja_loaders: list[jinja2.BaseLoader] = [jinja2.PackageLoader("ohmyadmin")]
-        if template_dir:
-            jinja_loaders.append(jinja2.FileSystemLoader(template_dir))
-        if template_package:
-            jinja_loaders.append(jinja2.PackageLoader(template_package))
-
-        self.jinja_env = jinja2.Environment(
-            autoescape=True,
-            undefined=jinja2.StrictUndefined,
-            extensions=["jinja2.ext.do"],
-            loader=jinja2.ChoiceLoader(jinja_loaders),
-        )
-        self.jinja_env.filters.update({"object_id": id, "model_pk": model_pk, 'to_html_attrs': to_html_attrs})
+        self.jinja_env = create_jinja_env(template_dir, template_package, bytecode_cache)
         self.templating = templating.Jinja2Templates(
             env=self.jinja_env,
             context_processors=[
                 self.context_processor,
             ],
         )
-        configure_jinja_env(self.templating.env)
+        if precompile:
+            if errors := precompile_templates(self.jinja_env):
+                warnings.warn(f"These templates cannot be compiled: {', '.join(errors)}.")
         super().__init__(routes=self.get_routes())
+        self.url_index = URLIndex(self.routes)
 
     def get_routes(self) -> list[BaseRoute]:
         return [
@@ -81,7 +89,11 @@ class OhMyAdmin(Router):
                     Route("/logout", self.logout_view, name="ohmyadmin.logout", methods=["post"]),
                     Mount("/static", app=StaticFiles(packages=["ohmyadmin"]), name="ohmyadmin.static"),
                     Route("/media/{path:path}", self.media_view, name="ohmyadmin.media"),
-                    *[
+                    Route("/jobs/{job_id}", self.job_view, name="ohmyadmin.jobs.status"),
+                    Route(
+                        "/jobs/{job_id}/cancel", self.cancel_job_view, name="ohmyadmin.jobs.cancel", methods=["post"]
+                    ),
+                    PrefixDispatcher(
                         Mount(
                             "/{group_slug}/{view_slug}".format(
                                 group_slug=slugify.slugify(screen.group),
@@ -90,7 +102,7 @@ class OhMyAdmin(Router):
                             routes=[screen.get_route()],
                         )
                         for screen in self.screens
-                    ],
+                    ),
                 ],
                 middleware=[
                     Middleware(AuthenticationMiddleware, backend=self.auth_policy.get_authentication_backend()),
@@ -144,14 +156,49 @@ class OhMyAdmin(Router):
             return RedirectResponse(path, status_code=302)
         return self.file_storage.as_response(path)
 
-    def _default_menu_builder(self, request: Request) -> components.Component:
-        return ohmyadmin.components.layout.Column(
+    async def job_view(self, request: Request) -> Response:
+        if not (job := self.job_backend.get(request.path_params["job_id"])):
+            raise HTTPException(404, "Job not found.")
+
+        if htmx.is_htmx_request(request):
+            return self.templating.TemplateResponse(request, "ohmyadmin/jobs/status.html", {"job": job})
+
+        return self.templating.TemplateResponse(
+            request,
+            "ohmyadmin/jobs/job.html",
+            {
+                "page_title": job.name,
+                "screen": JobScreen(),
+                "job": job,
+            },
+        )
+
+    async def cancel_job_view(self, request: Request) -> Response:
+        if not (job := self.job_backend.get(request.path_params["job_id"])):
+            raise HTTPException(404, "Job not found.")
+
+        # the job handles the cancellation in its task, render the status once it is applied
+        if self.job_backend.cancel(job.id):
+            await self.job_backend.wait(job.id, timeout=5)
+        return self.templating.TemplateResponse(request, "ohmyadmin/jobs/status.html", {"job": job})
+
+    def _get_menu_item_url(self, screen: Screen, root_path: str) -> URL | typing.Callable[[Request], URL]:
+        # screens with custom urls resolve them on every request
+        if type(screen).get_url is not Screen.get_url:
+            return screen.get_url
+        try:
+            return URL(root_path + self.url_path_for(screen.url_name))
+        except NoMatchFound:
+            return screen.get_url
+
+    def _build_default_menu(self, root_path: str) -> components.Component:
+        return components.Column(
             children=[
                 ohmyadmin.components.menu.MenuGroup(
                     heading=group[0],
                     items=[
                         ohmyadmin.components.menu.MenuItem(
-                            url=screen.get_url(request),
+                            url=self._get_menu_item_url(screen, root_path),
                             label=getattr(screen, "label_plural", screen.label),
                             icon=screen.icon,
                         )
@@ -162,6 +209,13 @@ class OhMyAdmin(Router):
             ]
         )
 
+    def _default_menu_builder(self, request: Request) -> components.Component:
+        # the menu depends on the mount point only, active items are highlighted when the items render
+        root_path = request.scope.get("ohmyadmin_root_path", "")
+        if (menu := self._menu_cache.get(root_path)) is None:
+            menu = self._menu_cache[root_path] = self._build_default_menu(root_path)
+        return menu
+
     def generate_user_menu(self, request: Request) -> list[MenuItem]:
         return []
 
@@ -180,6 +234,7 @@ class OhMyAdmin(Router):
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         scope.setdefault("state")
         scope["state"]["ohmyadmin"] = self
+        scope["ohmyadmin_root_path"] = scope.get("root_path", "")
         # scope["ohmyadmin_main_menu"] = await self.generate_menu(Request(scope))
         scope["ohmyadmin_user_menu"] = self.generate_user_menu(Request(scope))
         await super().__call__(scope, receive, send)
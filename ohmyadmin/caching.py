@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import abc
+import collections
+import socket
+import threading
+import time
+import typing
+import urllib.parse
+
+
+class CacheBackend(abc.ABC):
+    """
+    Stores strings by key.
+
+    Backends are synchronous because components render synchronously.
+    Backends must not raise on connection problems, a failed read is a miss and a failed write is ignored.
+    Backends that do network I/O set `blocking`, then pages are rendered and tags are invalidated
+    in worker threads so the I/O does not hold the event loop.
+    """
+
+    blocking: bool = False
+
+    @abc.abstractmethod
+    def get(self, key: str) -> str | None:
+        raise NotImplementedError()
+
+    def get_many(self, keys: typing.Sequence[str]) -> list[str | None]:
+        return [self.get(key) for key in keys]
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Keeps values in process memory and evicts least recently used values when their total size exceeds `max_size`.
+
+    The size is the number of characters of stored values. It is not shared between server processes.
+    """
+
+    def __init__(self, max_size: int = 10 * 1024 * 1024) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._lock = threading.Lock()  # components may render in worker threads
+        self._values: collections.OrderedDict[str, tuple[str, float | None]] = collections.OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if (item := self._values.get(key)) is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        if len(value) > self.max_size:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._values[key] = (value, time.monotonic() + ttl if ttl else None)
+            self.size += len(value)
+            while self.size > self.max_size:
+                self._remove(next(iter(self._values)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        if (item := self._values.pop(key, None)) is not None:
+            self.size -= len(item[0])
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class RedisProtocolError(Exception):
+    """Raised when the server replies with an error."""
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Stores values in Redis (or any server that speaks its protocol) with a minimal blocking client.
+
+    The url format is "redis://[:password@]host[:port][/db]". Connection errors are treated as cache misses.
+    Commands block the calling thread for up to `timeout` seconds, the backend is `blocking`
+    so the admin calls it from worker threads. After a connection error the server is skipped
+    (every read is a miss) for `retry_after` seconds, then the next command reconnects.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 0.5, retry_after: float = 5) -> None:
+        parsed = urllib.parse.urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.strip("/") or 0)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._retry_at = 0.0  # time.monotonic() value before which commands are not sent
+        self._lock = threading.Lock()
+        self._socket: socket.socket | None = None
+        self._reader: typing.BinaryIO | None = None
+
+    def _connect(self) -> None:
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = typing.cast(typing.BinaryIO, self._socket.makefile("rb"))
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", str(self.db))
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = self._reader = None
+
+    def _read_reply(self) -> typing.Any:
+        assert self._reader
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server.")
+
+        kind, payload = line[:1], line[1:-2]
+        match kind:
+            case b"+":
+                return payload.decode()
+            case b"-":
+                raise RedisProtocolError(payload.decode())
+            case b":":
+                return int(payload)
+            case b"$":
+                if (length := int(payload)) < 0:
+                    return None
+                return self._reader.read(length + 2)[:-2].decode()
+            case b"*":
+                if (length := int(payload)) < 0:
+                    return None
+                return [self._read_reply() for _ in range(length)]
+        raise RedisProtocolError(f"Unexpected reply: {line!r}.")
+
+    def _send(self, *args: str) -> typing.Any:
+        assert self._socket
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._socket.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def execute(self, *args: str) -> typing.Any:
+        with self._lock:
+            if self._socket is None and time.monotonic() < self._retry_at:
+                return None
+
+            try:
+                if self._socket is None:
+                    self._connect()
+                return self._send(*args)
+            except (OSError, ConnectionError):
+                self._disconnect()
+                self._retry_at = time.monotonic() + self.retry_after
+                return None
+            except RedisProtocolError:
+                self._disconnect()
+                return None
+
+    def get(self, key: str) -> str | None:
+        return self.execute("GET", key)
+
+    def get_many(self, keys: typing.Sequence[str]) -> list[str | None]:
+        return self.execute("MGET", *keys) or [None] * len(keys)
+
+    def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        if ttl:
+            self.execute("SET", key, value, "EX", str(ttl))
+        else:
+            self.execute("SET", key, value)
+
+    def delete(self, key: str) -> None:
+        self.execute("DEL", key)
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+
+class FragmentCache:
+    """
+    Caches rendered HTML fragments.
+
+    Fragments may be tagged, invalidating a tag makes all fragments with the tag stale. Every tag has a version
+    stored in the backend, it is a part of the fragment keys, so invalidation is a single write.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str = "ohmyadmin:") -> None:
+        self.backend = backend
+        self.prefix = prefix
+
+    def _get_tag_versions(self, tags: typing.Sequence[str]) -> list[str]:
+        tag_keys = [f"{self.prefix}tag:{tag}" for tag in tags]
+        versions = self.backend.get_many(tag_keys) if tag_keys else []
+        for index, version in enumerate(versions):
+            if version is None:
+                # a new version, not a counter: evicted tags must not bring back fragments of old versions
+                versions[index] = str(time.time_ns())
+                self.backend.set(tag_keys[index], typing.cast(str, versions[index]))
+        return typing.cast(list[str], versions)
+
+    def get_or_render(
+        self,
+        key: str,
+        render: typing.Callable[[], str],
+        ttl: int | None = None,
+        tags: typing.Sequence[str] = (),
+    ) -> str:
+        versions = self._get_tag_versions(tags)
+        fragment_key = ":".join([f"{self.prefix}fragment:{key}", *versions])
+        if (content := self.backend.get(fragment_key)) is not None:
+            return content
+
+        content = render()
+        self.backend.set(fragment_key, str(content), ttl)
+        return content
+
+    def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            self.backend.set(f"{self.prefix}tag:{tag}", str(time.time_ns()))
+
+
+class ChoicesCache:
+    """
+    Keeps loaded select field choices in process memory.
+
+    Entries expire after their `ttl` and the least recently used entries are evicted when there are more
+    than `max_size` of them. Entries may be tagged (data sources tag them with the tables the choices come from),
+    resources invalidate the tags of their data source when objects change.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._version = 0  # bumped on invalidation, loads started before it are not stored
+        self._entries: collections.OrderedDict[
+            str, tuple[list[typing.Any], float | None, tuple[str, ...]]
+        ] = collections.OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Awaitable[typing.Iterable[typing.Any]]],
+        ttl: int | None = None,
+        tags: typing.Sequence[str] = (),
+    ) -> list[typing.Any]:
+        """Return a copy of cached choices, calling `loader` on a miss."""
+        if (entry := self._entries.get(key)) is not None:
+            choices, expires_at, _ = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return list(choices)
+            self._remove(key)
+
+        self.misses += 1
+        version = self._version
+        choices = list(await loader())
+        if version == self._version:
+            self._remove(key)
+            self._entries[key] = (choices, time.monotonic() + ttl if ttl else None, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+        return list(choices)
+
+    def _remove(self, key: str) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            for tag in entry[2]:
+                if keys := self._tags.get(tag):
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+
+    def invalidate(self, *tags: str) -> None:
+        self._version += 1
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        self._version += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+choices_cache = ChoicesCache()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 import enum
+import functools
 import typing
 
 from markupsafe import Markup
@@ -9,12 +10,23 @@ from starlette.requests import Request
 
 from ohmyadmin.templating import render_to_string
 
+# templates that render nothing but the composed child, streamed pages skip them
+_CHILD_ONLY_TEMPLATES = {"ohmyadmin/components/compose.html", "ohmyadmin/components/forms/form_view.html"}
+
 
 class BaseComponent(abc.ABC):
     @abc.abstractmethod
     def render(self, request: Request) -> str:
         raise NotImplementedError()
 
+    def render_stream(self, request: Request) -> typing.Iterable[str]:
+        """
+        Render the component in pieces, streamed pages send them to the browser as they are ready.
+
+        Renders in one piece by default.
+        """
+        yield self.render(request)
+
 
 class Component(BaseComponent):
     template_name: str = ""
@@ -23,6 +35,14 @@ class Component(BaseComponent):
         assert self.template_name, f"Component {self.__class__} does not define template."
         return render_to_string(request, self.template_name, {"component": self})
 
+    def cache_key(self, request: Request) -> str | None:
+        """
+        Return the key to cache the rendered HTML under when the component is wrapped with Cached.
+
+        The key must cover everything the output depends on (user, locale, URL, etc.), None disables caching.
+        """
+        return None
+
 
 class ComposeComponent(Component):
     template_name: str = "ohmyadmin/components/compose.html"
@@ -36,6 +56,12 @@ class ComposeComponent(Component):
         child = self.compose(request)
         return render_to_string(request, self.template_name, {"component": child, "self": self})
 
+    def render_stream(self, request: Request) -> typing.Iterable[str]:
+        if type(self).render is not ComposeComponent.render or self.template_name not in _CHILD_ONLY_TEMPLATES:
+            yield self.render(request)
+            return
+        yield from self.compose(request).render_stream(request)
+
 
 ComponentBuilder = typing.Callable[[], Component]
 
@@ -172,6 +198,42 @@ class Group(Component):
         self.description = description
 
 
+class Cached(Component):
+    """
+    Render the component once and serve its HTML from the admin fragment cache until `ttl` seconds pass
+    or any of `tags` is invalidated. Resources invalidate their `get_cache_tag()` when objects change.
+
+    Without `key` the key is taken from `component.cache_key(request)`.
+    """
+
+    def __init__(
+        self,
+        component: Component,
+        key: str | None = None,
+        ttl: int | None = 300,
+        tags: typing.Sequence[str] = (),
+    ) -> None:
+        self.component = component
+        self.key = key
+        self.ttl = ttl
+        self.tags = tags
+
+    def cache_key(self, request: Request) -> str | None:
+        key = self.key or self.component.cache_key(request)
+        if key is None:
+            return None
+        return f"{self.component.__class__.__module__}.{self.component.__class__.__qualname__}:{key}"
+
+    def render(self, request: Request) -> str:
+        fragment_cache = getattr(request.state.ohmyadmin, "fragment_cache", None)
+        if fragment_cache is None or (key := self.cache_key(request)) is None:
+            return self.component.render(request)
+
+        return Markup(
+            fragment_cache.get_or_render(key, functools.partial(self.component.render, request), self.ttl, self.tags)
+        )
+
+
 class HTML(Component):
     def __init__(self, markup: str) -> None:
         self.markup = markup
@@ -14,12 +14,12 @@ class MenuItem(Component):
 
     def __init__(
         self,
-        url: str | URL | LazyURL,
+        url: str | URL | LazyURL | typing.Callable[[Request], URL],
         label: str,
         icon: str = "",
         trailing: Component | None = None,
     ) -> None:
-        self.url = URL(url) if isinstance(str, URL) else url
+        self.url = URL(url) if isinstance(url, str) else url
         self.label = label
         self.icon = icon
         self.trailing = trailing
@@ -30,6 +30,8 @@ class MenuItem(Component):
                 return self.url
             case LazyURL():
                 return self.url.resolve(request)
+            case _ if callable(self.url):
+                return self.url(request)
             case _:
                 return URL(self.url)
 
@@ -7,10 +7,10 @@ from starlette.datastructures import URL
 from starlette.requests import Request
 
 from ohmyadmin.components.base import Component
-from ohmyadmin.components.text import Text
+from ohmyadmin.components.text import Badge, BoolValue, Link, Text
 from ohmyadmin.ordering import SortingHelper
 from ohmyadmin.routing import resolve_url, URLType
-from ohmyadmin.templating import render_to_string
+from ohmyadmin.templating import render_to_stream, render_to_string
 
 
 class CellAlign(enum.StrEnum):
@@ -80,8 +80,22 @@ class TableRow(Component, typing.Generic[_ROW]):
         self.children = children
 
 
+# cell components that the compiled table renders with macros of "ohmyadmin/components/inline.html".
+# subclasses are not listed on purpose: they may override templates.
+_INLINE_MACROS: dict[type[Component], str] = {Text: "text", Link: "link", Badge: "badge", BoolValue: "bool_value"}
+
+
 class Table(Component, typing.Generic[T]):
+    """
+    A table of items, one row per item built by `row_builder`.
+
+    In the compiled mode the body is rendered by one template pass: cells with Text, Link, Badge and BoolValue
+    children are rendered by macros instead of a template render per row, cell and child component.
+    Other children are rendered as usual.
+    """
+
     template_name: str = "ohmyadmin/components/table/table.html"
+    compiled_template_name: str = "ohmyadmin/components/table/table_compiled.html"
 
     def __init__(
         self,
@@ -89,11 +103,41 @@ class Table(Component, typing.Generic[T]):
         header: TableRow[TableHeadCell],
         row_builder: typing.Callable[[T], TableRow[TableColumn]],
         summary: typing.Sequence[TableColumn] | None = None,
+        compiled: bool = False,
     ) -> None:
         self.items = items
         self.header = header
         self.summary = summary
         self.row_builder = row_builder
+        self.compiled = compiled
+
+    def render(self, request: Request) -> str:
+        if not self.compiled:
+            return super().render(request)
+        return render_to_string(request, self.compiled_template_name, {"component": self, "rows": self.compiled_rows})
+
+    def render_stream(self, request: Request) -> typing.Iterable[str]:
+        """Render the table in pieces: the header and every row are separate pieces."""
+        if type(self).render is not Table.render:
+            return super().render_stream(request)
+        if not self.compiled:
+            return render_to_stream(request, self.template_name, {"component": self})
+        return render_to_stream(request, self.compiled_template_name, {"component": self, "rows": self.compiled_rows})
+
+    @property
+    def compiled_rows(self) -> typing.Iterable[tuple[TableRow, list[tuple[TableColumn, str | None]] | None]]:
+        # each cell is paired with the name of the macro that renders its child,
+        # an empty name means the child renders itself and None means the cell renders itself.
+        # subclasses of TableRow and TableColumn may override templates, so they render as usual.
+        for row in self.rows:
+            if type(row) is not TableRow:
+                yield row, None
+                continue
+            cells = [
+                (cell, _INLINE_MACROS.get(type(cell.child), "") if type(cell) is TableColumn else None)
+                for cell in row.children
+            ]
+            yield row, cells
 
     def build_cells(self, item: T) -> TableRow:
         return self.row_builder(item)
@@ -11,7 +11,7 @@ from starlette.requests import Request
 from starlette_babel import gettext_lazy as _
 
 from ohmyadmin.ordering import SortingType
-from ohmyadmin.pagination import Pagination
+from ohmyadmin.pagination import CountStrategy, Cursor, CursorPagination, Pagination
 
 T = typing.TypeVar("T")
 
@@ -25,6 +25,10 @@ class DataSourceError(Exception):
 class DuplicateError(DataSourceError):
     """Should be raised when datasource tries to insert a duplicate resource."""
 
+    def __init__(self, *args: typing.Any, rows: typing.Sequence[int] = ()) -> None:
+        super().__init__(*args)
+        self.rows = list(rows)  # bulk operations: indexes of the rejected objects
+
 
 class NoObjectError(DataSourceError):
     """Should be raised when datasource returned zero values but at least one expected."""
@@ -131,13 +135,48 @@ QueryFilter: typing.TypeAlias = OrFilter | AndFilter | ValueFilter
 
 class DataSource(abc.ABC, typing.Generic[T]):
     @abc.abstractmethod
-    async def paginate(self, request: Request, page: int, page_size: int) -> Pagination[T]:
+    async def paginate(
+        self,
+        request: Request,
+        page: int,
+        page_size: int,
+        count_strategy: CountStrategy = "exact",
+        count_cap: int = 10_000,
+    ) -> Pagination[T]:
+        """
+        Return a page of rows.
+
+        `count_strategy` controls how the total row count is computed:
+        "exact" counts all matching rows, "estimated" asks the database for an estimate,
+        "capped" counts up to `count_cap` rows and "none" skips counting at all.
+        """
         raise NotImplementedError()
 
+    async def paginate_by_cursor(self, request: Request, cursor: Cursor | None, page_size: int) -> CursorPagination[T]:
+        """
+        Return a page using keyset (seek) pagination.
+
+        The page is located by the values of ordering fields of the boundary row instead of OFFSET,
+        so deep pages cost the same as the first one.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support keyset pagination.")
+
+    def stream(self, request: Request, batch_size: int = 1000) -> typing.AsyncIterator[T]:
+        """
+        Iterate over all objects without loading them into memory at once.
+
+        Objects are fetched in batches of `batch_size`, use it to export large result sets.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support streaming.")
+
     @abc.abstractmethod
     async def count(self, request: Request) -> int:
         raise NotImplementedError()
 
+    async def estimate_count(self, request: Request) -> int:
+        """Return an approximate number of rows. Falls back to an exact count."""
+        return await self.count(request)
+
     @abc.abstractmethod
     async def one(self, request: Request) -> None:
         raise NotImplementedError()
@@ -150,6 +189,45 @@ class DataSource(abc.ABC, typing.Generic[T]):
     async def create(self, request: Request, instance: T) -> None:
         raise NotImplementedError()
 
+    async def bulk_create(
+        self, request: Request, instances: typing.Sequence[T], batch_size: int = 1000, fast: bool = False
+    ) -> None:
+        """
+        Create many objects at once.
+
+        Objects that violate unique constraints are skipped and reported together after the rest is saved,
+        `DuplicateError.rows` contains their indexes. The default implementation creates objects one by one.
+        With `fast` the data source may use a bulk loading facility of the database (like PostgreSQL COPY),
+        created objects are not refreshed then and their database generated attributes stay unset.
+        """
+        duplicates: list[int] = []
+        for index, instance in enumerate(instances):
+            try:
+                await self.create(request, instance)
+            except DuplicateError:
+                duplicates.append(index)
+        if duplicates:
+            raise DuplicateError(f"{len(duplicates)} objects are duplicates.", rows=duplicates)
+
+    async def bulk_update(self, request: Request, instances: typing.Sequence[T], batch_size: int = 1000) -> None:
+        """Save changes of many objects at once, duplicates are reported like in `bulk_create`."""
+        for instance in instances:
+            await self.update(request, instance)
+
+    async def upsert(
+        self,
+        request: Request,
+        rows: typing.Sequence[typing.Mapping[str, typing.Any]],
+        conflict_fields: typing.Sequence[str] | None = None,
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        Insert rows, or update the existing ones that have the same values of `conflict_fields`.
+
+        Rows are mappings of field names to values, `conflict_fields` defaults to the primary key.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support upserts.")
+
     @abc.abstractmethod
     async def delete(self, request: Request, instance: T) -> None:
         raise NotImplementedError()
@@ -158,6 +236,18 @@ class DataSource(abc.ABC, typing.Generic[T]):
     async def delete_all(self, request: Request) -> None:
         raise NotImplementedError()
 
+    async def delete_batch(self, request: Request, batch_size: int) -> int:
+        """
+        Delete up to `batch_size` matching objects in a separate transaction and return how many were deleted.
+
+        Call it repeatedly until it returns less than `batch_size` to delete large selections
+        without holding locks for the whole operation. Data sources that cannot delete in batches
+        delete everything at once.
+        """
+        count = await self.count(request)
+        await self.delete_all(request)
+        return count
+
     @abc.abstractmethod
     async def new(self) -> T:
         raise NotImplementedError()
@@ -165,6 +255,23 @@ class DataSource(abc.ABC, typing.Generic[T]):
     def get_query_for_list(self) -> typing.Self:
         return self
 
+    def only(self, fields: typing.Sequence[str]) -> typing.Self:
+        """
+        Hint the data source to load only the given fields.
+
+        Dotted names like "customer.name" refer to the fields of related objects.
+        Data sources that do not support projections return themselves unchanged.
+        """
+        return self
+
+    def prefetch(self, fields: typing.Sequence[str]) -> typing.Self:
+        """
+        Hint the data source to eager load related objects referenced by dotted field names.
+
+        Data sources without relations return themselves unchanged.
+        """
+        return self
+
     @abc.abstractmethod
     def get_pk(self, obj: typing.Any) -> str:
         raise NotImplementedError()
@@ -179,3 +286,7 @@ class DataSource(abc.ABC, typing.Generic[T]):
 
     def get_id_field(self) -> str:
         return "id"
+
+    def get_cache_tags(self) -> list[str]:
+        """Return choices cache tags that are invalidated when objects of this data source change."""
+        return []
@@ -1,15 +1,27 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import copy
+import dataclasses
 import decimal
 import functools
+import json
 import typing
 import uuid
+import warnings
 
 import sqlalchemy as sa
 import wtforms
-from sqlalchemy import orm
+from sqlalchemy import event, orm
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.sql.util import find_tables
 from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from ohmyadmin.caching import choices_cache
 from ohmyadmin.datasources.datasource import (
     AndFilter,
     DataSource,
@@ -28,17 +40,25 @@ from ohmyadmin.datasources.datasource import (
     ValueFilter,
 )
 from ohmyadmin.ordering import SortingType
-from ohmyadmin.pagination import Pagination
+from ohmyadmin.pagination import CountStrategy, Cursor, CursorPagination, encode_cursor, Pagination
 
 T = typing.TypeVar(
     "T",
 )
 
+CountExecution = typing.Literal["sequential", "concurrent", "window"]
+
 
 def get_dbsession(request: Request) -> AsyncSession:
     return request.state.dbsession
 
 
+def is_duplicate_error(ex: IntegrityError) -> bool:
+    """Test if the error is a unique constraint violation (PostgreSQL, SQLite, MySQL wording)."""
+    message = str(ex.orig)
+    return any(text in message for text in ["duplicate key", "UNIQUE constraint failed", "Duplicate entry"])
+
+
 def get_column_properties(model_class: typing.Any, prop_names: typing.Sequence[str]) -> dict[str, orm.ColumnProperty]:
     """
     Return SQLAlchemy columns defined on entity class by their string names.
@@ -57,6 +77,54 @@ def get_column_properties(model_class: typing.Any, prop_names: typing.Sequence[s
     return props
 
 
+def get_relation_path(model_class: typing.Any, field: str) -> list[str]:
+    """
+    Return names of relationships the dotted field name walks through.
+
+    For example, "customer.country.name" gives ["customer", "country"].
+    """
+    mapper: orm.Mapper = orm.class_mapper(model_class)
+    path: list[str] = []
+    for name in field.split("."):
+        if name not in mapper.relationships:
+            break
+        path.append(name)
+        mapper = mapper.relationships[name].mapper
+    return path
+
+
+def build_relation_loader(model_class: typing.Any, relation_path: typing.Sequence[str]) -> typing.Any:
+    """
+    Build an eager loading option for a chain of relationships.
+
+    Many-to-one relations are loaded with `joinedload` within the same query,
+    collections are loaded with `selectinload` to avoid multiplying parent rows.
+    """
+    mapper: orm.Mapper = orm.class_mapper(model_class)
+    option: typing.Any = orm
+    for name in relation_path:
+        relationship = mapper.relationships[name]
+        if relationship.uselist:
+            option = option.selectinload(relationship.class_attribute)
+        else:
+            option = option.joinedload(relationship.class_attribute)
+        mapper = relationship.mapper
+    return option
+
+
+def has_joined_collections(stmt: sa.Select) -> bool:
+    """Tell whether the statement eager loads a collection with a join, which multiplies the selected rows."""
+    for option in stmt._with_options:
+        for element in getattr(option, "context", ()):
+            if ("lazy", "joined") in (element.strategy or ()) and element.path.natural_path[-2].uselist:
+                return True
+
+    # relationships mapped with lazy="joined"
+    entities = [description.get("entity") for description in stmt.column_descriptions]
+    mappers = [sa.inspect(entity).mapper for entity in entities if entity is not None]
+    return any(rel.uselist and rel.lazy == "joined" for mapper in mappers for rel in mapper.relationships)
+
+
 def guess_pk_field(model_class: type) -> str:
     mapper: orm.Mapper = orm.class_mapper(model_class)
     pk_columns = [
@@ -86,6 +154,122 @@ def guess_field_type(model_class: type, pk_field: str) -> typing.Callable:
     raise ValueError(f"Failed to guess primary key column caster for {column} (type={column.type}).")
 
 
+class ModelMetadata:
+    """
+    Memoized introspection of a mapped model class.
+
+    Walking mapper descriptors is not cheap, so every lookup is computed once and then served from a dict.
+    Use `get_model_metadata` to get a shared instance for a model class.
+    """
+
+    def __init__(self, model_class: typing.Any) -> None:
+        self.model_class = model_class
+        self.mapper: orm.Mapper = orm.class_mapper(model_class)
+        self._column_properties: dict[str, orm.ColumnProperty | None] = {}
+        self._relation_paths: dict[str, list[str]] = {}
+        self._casters: dict[str, typing.Callable] = {}
+
+    @functools.cached_property
+    def pk_field(self) -> str:
+        return guess_pk_field(self.model_class)
+
+    def get_column_properties(self, prop_names: typing.Sequence[str]) -> dict[str, orm.ColumnProperty]:
+        """Memoized version of `get_column_properties`."""
+        props: dict[str, orm.ColumnProperty] = {}
+        for name in prop_names:
+            if name not in self._column_properties:
+                self._column_properties[name] = get_column_properties(self.model_class, [name]).get(name)
+            if (prop := self._column_properties[name]) is not None:
+                props[name] = prop
+        return props
+
+    def get_relation_path(self, field: str) -> list[str]:
+        """Memoized version of `get_relation_path`."""
+        if field not in self._relation_paths:
+            self._relation_paths[field] = get_relation_path(self.model_class, field)
+        return self._relation_paths[field]
+
+    def get_caster(self, field: str) -> typing.Callable:
+        """Return a callable that converts raw values (like query params) to the column type."""
+        if field not in self._casters:
+            self._casters[field] = guess_field_type(self.model_class, field)
+        return self._casters[field]
+
+    def is_sortable(self, field: str) -> bool:
+        """Test if the field is a single column of the model or of a many-to-one relation."""
+        prop = self.get_column_properties([field]).get(field)
+        if not isinstance(prop, orm.ColumnProperty) or len(prop.columns) > 1:
+            return False
+        return not any(self.mapper.relationships[name].uselist for name in self.get_relation_path(field))
+
+
+_FILTER_VALUE_FIELDS = frozenset({"value", "values", "from_value", "to_value"})
+
+
+def get_filter_shape(clause: QueryFilter) -> typing.Hashable:
+    """
+    Return a hashable description of the filter tree without its values.
+
+    Filters that differ only by values have the same shape and compile to the same SQL.
+    """
+    match clause:
+        case AndFilter(filters=filters) | OrFilter(filters=filters):
+            return type(clause), tuple(get_filter_shape(f) for f in filters)
+        case _:
+            return type(clause), tuple(
+                (field.name, getattr(clause, field.name))
+                for field in dataclasses.fields(clause)
+                if field.name not in _FILTER_VALUE_FIELDS
+            )
+
+
+class StatementCache:
+    """
+    LRU cache of filter expressions keyed by the filter shape.
+
+    Cached expressions use bound parameter placeholders instead of values, so a hit skips building
+    the expression and the SQL text stays the same across requests (for the dialect's compiled and
+    prepared statement caches). `hits` and `misses` count lookups since the last `clear()`.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[typing.Hashable, typing.Any] = collections.OrderedDict()
+
+    def get_or_create(self, key: typing.Hashable, factory: typing.Callable[[], typing.Any]) -> typing.Any:
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        value = self._entries[key] = factory()
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+statement_cache = StatementCache()
+
+
+_model_metadata: dict[typing.Any, ModelMetadata] = {}
+
+
+def get_model_metadata(model_class: typing.Any) -> ModelMetadata:
+    if (metadata := _model_metadata.get(model_class)) is None:
+        metadata = _model_metadata[model_class] = ModelMetadata(model_class)
+    return metadata
+
+
 class SADataSource(DataSource[T]):
     def __init__(
         self,
@@ -94,37 +278,93 @@ class SADataSource(DataSource[T]):
         query_for_list: sa.Select[tuple[T]] | None = None,
         pk_column: str | None = None,
         pk_cast: typing.Callable[[typing.Any], typing.Any] | None = None,
-        _stmt: sa.Select[tuple[T]] | None = None,
+        count_execution: CountExecution = "sequential",
     ) -> None:
-        self.pk_column = pk_column or guess_pk_field(model_class)
-        self.pk_cast = pk_cast or guess_field_type(model_class, self.pk_column)
+        self.metadata = get_model_metadata(model_class)
+        self.pk_column = pk_column or self.metadata.pk_field
+        self.pk_cast = pk_cast or self.metadata.get_caster(self.pk_column)
         self.model_class = model_class
+        self.count_execution = count_execution
 
         self.query = query if query is not None else sa.select(model_class)
         self.query_for_list = query_for_list if query_for_list is not None else self.query
 
-        self._stmt = _stmt if _stmt is not None else self.query
+        # filters, ordering and loader options are collected by clones and applied in one go by _stmt
+        self._base_stmt: sa.Select[tuple[T]] = self.query
+        self._where: tuple[sa.ColumnElement[bool], ...] = ()
+        self._order: tuple[sa.ColumnElement, ...] | None = None  # None keeps the ordering of the base statement
+        self._options: tuple[typing.Any, ...] = ()
+        self._ordering: dict[str, SortingType] = {}
+        self._params: dict[str, typing.Any] = {}  # values of the filter placeholders, passed on execution
+
+    @functools.cached_property
+    def _stmt(self) -> sa.Select[tuple[T]]:
+        stmt = self._base_stmt
+        if self._where:
+            stmt = stmt.where(*self._where)
+        if self._order is not None:
+            stmt = stmt.order_by(None).order_by(*self._order)
+        if self._options:
+            stmt = stmt.options(*self._options)
+        return stmt
 
     def get_id_field(self) -> str:
         return self.pk_column
 
+    def get_cache_tags(self) -> list[str]:
+        return get_cache_tags(self.query)
+
     def order_by(self, sorting: typing.Mapping[str, SortingType]) -> typing.Self:
-        stmt = self._stmt.order_by(None)
-        props = get_column_properties(self.model_class, list(sorting.keys()))
+        props = self.metadata.get_column_properties(list(sorting.keys()))
+        clauses: list[sa.ColumnElement] = []
+        ordering: dict[str, SortingType] = {}
 
         for ordering_field, ordering_dir in sorting.items():
-            try:
-                prop = props[ordering_field]
-                if len(prop.columns) > 1:  # pragma: no cover
-                    continue
-                column = prop.columns[0]
-                stmt = stmt.order_by(column.desc() if ordering_dir == "desc" else column.asc())
-            except KeyError:
-                # ordering_field does not exist in properties, ignore
+            if not self.metadata.is_sortable(ordering_field):
+                # ordering_field does not exist in properties or is not sortable, ignore
                 continue
-        return self._clone(stmt)
+            column = self.get_sort_column(ordering_field, props[ordering_field])
+            if column is None:
+                continue
+            clauses.append(column.desc() if ordering_dir == "desc" else column.asc())
+            ordering[ordering_field] = ordering_dir
+        return self._clone(_order=tuple(clauses), _ordering=ordering)
+
+    def _selects_from(self, table: sa.FromClause) -> bool:
+        return any(
+            table in find_tables(from_clause, include_joins=True, include_aliases=True)
+            for from_clause in self._base_stmt.get_final_froms()
+        )
+
+    def get_sort_column(self, field: str, prop: orm.ColumnProperty) -> sa.ColumnElement | None:
+        """
+        Return an expression to sort by.
+
+        Columns of many-to-one relations are sorted by directly if the statement joins their table,
+        otherwise via a correlated subquery. Collections cannot be sorted by.
+        """
+        column = prop.columns[0]
+        relation_name, _, _ = field.partition(".")
+        if relation_name == field:
+            return column
+
+        relationship = self.metadata.mapper.relationships[relation_name]
+        if relationship.uselist:
+            return None
+        if column.table is not None and self._selects_from(column.table):
+            return column
+        return sa.select(column).where(relationship.primaryjoin).correlate_except(column.table).scalar_subquery()
 
     def filter_clause(self, clause: ValueFilter) -> sa.ColumnElement[bool]:
+        if "." in clause.field:
+            # filter by related model fields using EXISTS, this does not require the relation to be joined
+            relation_name, _, related_field = clause.field.partition(".")
+            relationship = self.metadata.mapper.relationships[relation_name]
+            related_datasource = SADataSource(relationship.mapper.class_)
+            expression = related_datasource.filter_clause(dataclasses.replace(clause, field=related_field))
+            attribute = relationship.class_attribute
+            return attribute.any(expression) if relationship.uselist else attribute.has(expression)
+
         column: sa.sql.ColumnElement = getattr(self.model_class, clause.field)
         match clause:
             # string operations
@@ -163,34 +403,192 @@ class SADataSource(DataSource[T]):
                 return expr <= value
 
             # array operations
+            case InFilter(values=sa.BindParameter() as values):
+                return column.in_(values)
             case InFilter(values=values):
-                field_type = guess_field_type(self.model_class, clause.field)
+                field_type = self.metadata.get_caster(clause.field)
                 return column.in_([field_type(v) for v in values])
 
             case _:
                 raise AttributeError("Unsupported filter type.")
 
-    def filter(self, clause: QueryFilter) -> typing.Self:
+    def _get_caster(self, field: str) -> typing.Callable:
+        metadata = self.metadata
+        *relation_names, name = field.split(".")
+        for relation_name in relation_names:
+            metadata = get_model_metadata(metadata.mapper.relationships[relation_name].mapper.class_)
+        return metadata.get_caster(name)
+
+    def _parametrize(self, clause: QueryFilter, prefix: str, params: dict[str, typing.Any]) -> QueryFilter:
+        """Replace filter values with bound parameters named after `prefix`, collect the values into `params`."""
+        match clause:
+            case AndFilter(filters=filters) | OrFilter(filters=filters):
+                return dataclasses.replace(clause, filters=[self._parametrize(f, prefix, params) for f in filters])
+            case InFilter(field=field, values=values):
+                name = f"{prefix}_{len(params)}"
+                caster = self._get_caster(field)
+                params[name] = [caster(value) for value in values]
+                values_param: typing.Any = sa.bindparam(name, expanding=True)  # stands in for the values
+                return dataclasses.replace(clause, values=values_param)
+            case StringFilter() | NumberFilter() | DateFilter() | DateTimeFilter():
+                name = f"{prefix}_{len(params)}"
+                params[name] = clause.value
+                value_param: typing.Any = sa.bindparam(name)  # stands in for the value of any filter type
+                return dataclasses.replace(clause, value=value_param)
+        return clause
+
+    def _build_where_clause(self, clause: QueryFilter) -> sa.ColumnElement[bool]:
         match clause:
-            # complex operations
             case AndFilter(filters=filters):
-                return self._clone(self._stmt.where(sa.and_(*[self.filter_clause(f) for f in filters])))
+                return sa.and_(*[self.filter_clause(f) for f in filters])
             case OrFilter(filters=filters):
-                return self._clone(self._stmt.where(sa.or_(*[self.filter_clause(f) for f in filters])))
+                return sa.or_(*[self.filter_clause(f) for f in filters])
             case _:
-                return self._clone(self._stmt.where(self.filter_clause(clause)))
+                return self.filter_clause(clause)
+
+    def filter(self, clause: QueryFilter) -> typing.Self:
+        # the expression is built once per filter shape and position, values are bound on execution
+        prefix = f"filter{len(self._where)}"
+        params: dict[str, typing.Any] = {}
+        template = self._parametrize(clause, prefix, params)
+        cache_key = (type(self), self.model_class, prefix, get_filter_shape(clause))
+        expression = statement_cache.get_or_create(cache_key, lambda: self._build_where_clause(template))
+        return self._clone(_where=(*self._where, expression), _params={**self._params, **params})
 
     def get_query_for_list(self) -> typing.Self:
-        return self._clone(self.query_for_list)
+        return self._clone(
+            _base_stmt=self.query_for_list, _where=(), _order=None, _options=(), _ordering={}, _params={}
+        )
+
+    def only(self, fields: typing.Sequence[str]) -> typing.Self:
+        """
+        Load only the given model attributes and eager load the referenced relations.
+
+        Plain names are applied via `load_only`, "relation.attr" names load the relation with
+        `joinedload` (many-to-one) or `selectinload` (collections) limited to the referenced attributes,
+        a bare relation name loads the whole related object.
+        If any field is not a mapped attribute (for example, a Python property),
+        the projection is not applied because its dependencies are unknown.
+        """
+        mapper = self.metadata.mapper
+        columns: list[orm.ColumnProperty] = []
+        relations: dict[str, list[orm.ColumnProperty] | None] = {}
+        for field in fields:
+            name, _, related_name = field.partition(".")
+            if name in mapper.relationships:
+                related_mapper = mapper.relationships[name].mapper
+                if not related_name:
+                    relations[name] = None  # load the whole related object
+                elif related_name in related_mapper.column_attrs:
+                    if (related_columns := relations.setdefault(name, [])) is not None:
+                        related_columns.append(related_mapper.column_attrs[related_name])
+                else:
+                    return self
+            elif name in mapper.column_attrs and not related_name:
+                columns.append(mapper.column_attrs[name])
+            else:
+                return self
+
+        def loadable(props: typing.Iterable[orm.ColumnProperty]) -> list[typing.Any]:
+            # query expressions are populated by with_expression() and cannot be combined with load_only()
+            return [prop.class_attribute for prop in props if not dict(prop.strategy_key).get("query_expression")]
+
+        options: list[typing.Any] = [orm.load_only(getattr(self.model_class, self.pk_column), *loadable(columns))]
+        for relation_name, related_columns in relations.items():
+            option = build_relation_loader(self.model_class, [relation_name])
+            if related_columns is not None:
+                option = option.load_only(*loadable(related_columns))
+            options.append(option)
+        return self._clone(_options=(*self._options, *options))
+
+    def prefetch(self, fields: typing.Sequence[str]) -> typing.Self:
+        """
+        Eager load all relations referenced by the field names.
+
+        Unlike `only`, it does not limit loaded columns, so it is safe to use with fields of unknown origin.
+        """
+        relation_paths = {tuple(self.metadata.get_relation_path(field)) for field in fields}
+        options = [build_relation_loader(self.model_class, path) for path in sorted(relation_paths) if path]
+        if not options:
+            return self
+        return self._clone(_options=(*self._options, *options))
+
+    def _count_statement(self) -> sa.Select[tuple[int]]:
+        return sa.select(sa.func.count()).select_from(self._stmt)
 
     async def count(self, request: Request) -> int:
-        stmt = sa.select(sa.func.count("*")).select_from(self._stmt)
-        result = await get_dbsession(request).scalars(stmt)
+        result = await get_dbsession(request).scalars(self._count_statement(), self._params)
+        return result.one()
+
+    async def _count_on_connection(self, engine: AsyncEngine) -> int:
+        async with engine.connect() as connection:
+            result = await connection.execute(self._count_statement(), self._params)
+            return result.scalar_one()
+
+    async def _fetch_page_and_count(self, request: Request, limit: int, offset: int) -> tuple[list[T], int]:
+        """
+        Fetch page rows along with the total count according to `count_execution`.
+
+        "concurrent" runs the count on a separate connection from the engine pool (so it does not see
+        uncommitted changes of the current session), "window" selects `count(*) OVER ()` along with the rows.
+        Both fall back to sequential queries when they are not applicable (window count is not applicable to
+        DISTINCT statements and statements that eager load collections with joins).
+        """
+        session = get_dbsession(request)
+        stmt = self._stmt.limit(limit).offset(offset)
+
+        # window count is computed before DISTINCT is applied and counts rows multiplied by collection joins,
+        # so it cannot be used for such queries
+        stmt_is_plain = not self._stmt._distinct and not has_joined_collections(self._stmt)
+        if self.count_execution == "window" and stmt_is_plain:
+            result = await session.execute(stmt.add_columns(sa.func.count().over()), self._params)
+            rows = result.all()
+            if rows:
+                return [row[0] for row in rows], rows[0][1]
+            return [], await self.count(request)  # the page is out of range, no rows to read the count from
+
+        if self.count_execution == "concurrent" and isinstance(session.bind, AsyncEngine):
+            page_result, row_count = await asyncio.gather(
+                session.scalars(stmt, self._params),
+                self._count_on_connection(session.bind),
+            )
+            return list(page_result.unique().all()), row_count
+
+        row_count = await self.count(request)
+        page_result = await session.scalars(stmt, self._params)
+        return list(page_result.unique().all()), row_count  # unique() merges rows of joined collections
+
+    async def count_capped(self, request: Request, cap: int) -> int:
+        """Count rows but stop at `cap` + 1 rows, the database does not scan further."""
+        stmt = sa.select(sa.func.count()).select_from(self._stmt.limit(cap + 1).subquery())
+        result = await get_dbsession(request).scalars(stmt, self._params)
         return result.one()
 
+    async def estimate_count(self, request: Request) -> int:
+        """
+        Return the planner's row estimate for the current statement.
+
+        Works for PostgreSQL only, other databases fall back to the exact count.
+        """
+        connection = await get_dbsession(request).connection()
+        if connection.dialect.name != "postgresql":
+            return await self.count(request)
+
+        # expanding parameters (like InFilter values) are rendered as one placeholder per value
+        compiled = self._stmt.compile(dialect=connection.dialect)
+        expanded = compiled.construct_expanded_state(self._params)
+        parameters: typing.Sequence[typing.Any] | typing.Mapping[str, typing.Any] = expanded.parameters
+        if compiled.positional:
+            parameters = expanded.positional_parameters
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {expanded.statement}", parameters)
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def one(self, request: Request) -> int:
         try:
-            result = await get_dbsession(request).scalars(self._stmt)
+            result = await get_dbsession(request).scalars(self._stmt, self._params)
             return result.one()
         except NoResultFound:
             raise NoObjectError()
@@ -203,63 +601,514 @@ class SADataSource(DataSource[T]):
             get_dbsession(request).add(instance)
             await get_dbsession(request).commit()
         except IntegrityError as ex:
-            if "duplicate key" in str(ex):
+            if is_duplicate_error(ex):
                 raise DuplicateError()
             raise
 
+    async def _flush_in_batches(
+        self,
+        request: Request,
+        instances: typing.Sequence[T],
+        batch_size: int,
+        changes: typing.Sequence[typing.Mapping[str, typing.Any]] | None = None,
+    ) -> None:
+        """
+        Flush objects in batches within one transaction, each batch uses a savepoint.
+
+        When a batch fails on a unique constraint, its objects are retried one by one to find the duplicates,
+        the rest of the objects is committed and the duplicates are reported with one DuplicateError.
+        Rolling back a savepoint expires persistent objects, `changes` are their attribute values to set again
+        within the retry savepoint (entering a savepoint flushes the session).
+        """
+        session = get_dbsession(request)
+        for instance in instances:
+            # leaving a savepoint flushes the whole session, so objects are attached batch by batch
+            if instance in session:
+                session.expunge(instance)
+
+        duplicates: list[int] = []
+        for start in range(0, len(instances), batch_size):
+            batch = instances[start : start + batch_size]
+            try:
+                async with session.begin_nested():
+                    session.add_all(batch)
+            except IntegrityError as ex:
+                if not is_duplicate_error(ex):
+                    raise
+                for offset, instance in enumerate(batch):
+                    try:
+                        async with session.begin_nested():
+                            session.add(instance)
+                            for attr, value in (changes[start + offset] if changes else {}).items():
+                                setattr(instance, attr, value)
+                    except IntegrityError as row_ex:
+                        if not is_duplicate_error(row_ex):
+                            raise
+                        duplicates.append(start + offset)
+
+        await session.commit()
+        if duplicates:
+            raise DuplicateError(f"{len(duplicates)} objects are duplicates.", rows=duplicates)
+
+    def _get_copy_columns(self, instances: typing.Sequence[T]) -> list[orm.ColumnProperty] | None:
+        """
+        Return column properties to copy or None when the objects cannot be loaded with COPY.
+
+        Columns that are None in every object are skipped so the database fills them with server defaults.
+        Columns with server defaults that are set in some objects only would need two statements, and Python side
+        defaults are applied by the ORM only, the regular path is used for both.
+        """
+        mapper = self.metadata.mapper
+        if mapper.inherits is not None or not isinstance(mapper.local_table, sa.Table):
+            return None
+
+        columns: list[orm.ColumnProperty] = []
+        for prop in mapper.column_attrs:
+            column = prop.columns[0]
+            if len(prop.columns) > 1 or column.table is not mapper.local_table:
+                return None
+            values = [getattr(instance, prop.key) is None for instance in instances]
+            if any(values) and column.default is not None:
+                return None  # COPY would write NULL instead of the Python side default
+            if all(values):
+                continue
+            if any(values) and (column.server_default is not None or column is mapper.local_table.autoincrement_column):
+                return None
+            columns.append(prop)
+        return columns
+
+    async def _copy_batch(self, request: Request, instances: typing.Sequence[T]) -> bool:
+        """Load objects with COPY FROM STDIN, return False if it is not possible for these objects."""
+        columns = self._get_copy_columns(instances)
+        if not columns:
+            return False
+
+        session = get_dbsession(request)
+        connection = await session.connection()
+        table = typing.cast(sa.Table, self.metadata.mapper.local_table)
+        processors = [prop.columns[0].type.bind_processor(connection.dialect) for prop in columns]
+        records = [
+            tuple(
+                processor(value) if processor else value
+                for processor, value in zip(processors, [getattr(instance, prop.key) for prop in columns])
+            )
+            for instance in instances
+        ]
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        assert driver_connection is not None
+        try:
+            async with session.begin_nested():
+                await driver_connection.copy_records_to_table(
+                    table.name,
+                    schema_name=table.schema,
+                    columns=[prop.columns[0].name for prop in columns],
+                    records=records,
+                )
+        except Exception as ex:
+            if getattr(ex, "sqlstate", None) == "23505":  # unique_violation, let the regular path find duplicates
+                return False
+            raise
+        return True
+
+    async def _copy_in_batches(self, request: Request, instances: typing.Sequence[T], batch_size: int) -> None:
+        """
+        Load objects with PostgreSQL COPY, batches that cannot be copied go through the regular path.
+
+        Type conversions of SQLAlchemy column types apply but ORM events and Python side defaults do not.
+        """
+        rest: list[int] = []
+        for start in range(0, len(instances), batch_size):
+            batch = instances[start : start + batch_size]
+            if not await self._copy_batch(request, batch):
+                rest.extend(range(start, start + len(batch)))
+
+        if not rest:
+            await get_dbsession(request).commit()
+            return
+
+        try:
+            await self._flush_in_batches(request, [instances[index] for index in rest], batch_size)
+        except DuplicateError as ex:
+            raise DuplicateError(*ex.args, rows=[rest[index] for index in ex.rows])
+
+    def _supports_copy(self, request: Request) -> bool:
+        return get_dbsession(request).get_bind().dialect.driver == "asyncpg"
+
+    async def bulk_create(
+        self, request: Request, instances: typing.Sequence[T], batch_size: int = 1000, fast: bool = False
+    ) -> None:
+        if fast and instances and self._supports_copy(request):
+            await self._copy_in_batches(request, instances, batch_size)
+        else:
+            await self._flush_in_batches(request, instances, batch_size)
+
+    async def bulk_update(self, request: Request, instances: typing.Sequence[T], batch_size: int = 1000) -> None:
+        column_keys = self.metadata.mapper.column_attrs.keys()
+        changes = [
+            {key: state.dict[key] for key in column_keys if state.attrs[key].history.has_changes()}
+            for state in [orm.attributes.instance_state(instance) for instance in instances]
+        ]
+        await self._flush_in_batches(request, instances, batch_size, changes)
+
+    async def upsert(
+        self,
+        request: Request,
+        rows: typing.Sequence[typing.Mapping[str, typing.Any]],
+        conflict_fields: typing.Sequence[str] | None = None,
+        batch_size: int = 1000,
+    ) -> None:
+        if not rows:
+            return
+
+        session = get_dbsession(request)
+        dialect_name = session.get_bind().dialect.name
+        conflict_fields = conflict_fields or [self.pk_column]
+        column_attrs = self.metadata.mapper.column_attrs
+        update_fields: typing.Sequence[str] = [field for field in rows[0] if field not in conflict_fields]
+        column_names = {field: column_attrs[field].columns[0].name for field in [*conflict_fields, *update_fields]}
+
+        stmt: typing.Any
+        match dialect_name:
+            case "postgresql" | "sqlite":
+                stmt = (postgresql.insert if dialect_name == "postgresql" else sqlite.insert)(self.model_class)
+                index_elements = [column_names[field] for field in conflict_fields]
+                if update_fields:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=index_elements,
+                        set_={column_names[field]: stmt.excluded[column_names[field]] for field in update_fields},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            case "mysql" | "mariadb":
+                stmt = mysql.insert(self.model_class)
+                update_fields = update_fields or conflict_fields[:1]  # an update clause is required
+                stmt = stmt.on_duplicate_key_update(
+                    {column_names[field]: stmt.inserted[column_names[field]] for field in update_fields}
+                )
+            case _:
+                raise NotImplementedError(f"Upserts are not supported for {dialect_name} databases.")
+
+        # each batch is sent as a single executemany
+        for start in range(0, len(rows), batch_size):
+            await session.execute(stmt, [dict(row) for row in rows[start : start + batch_size]])
+        await session.commit()
+
     async def delete(self, request: Request, instance: T) -> None:
         await get_dbsession(request).delete(instance)
         await get_dbsession(request).commit([instance])
 
     async def delete_all(self, request: Request) -> None:
-        delete_stmt = sa.delete(self.model_class).where(self._stmt.whereclause)
-        await get_dbsession(request).execute(delete_stmt)
+        delete_stmt = sa.delete(self.model_class)
+        if self._stmt.whereclause is not None:
+            delete_stmt = delete_stmt.where(self._stmt.whereclause)
+        await get_dbsession(request).execute(delete_stmt, self._params)
         await get_dbsession(request).commit()
 
+    async def delete_batch(self, request: Request, batch_size: int) -> int:
+        session = get_dbsession(request)
+        pk_column = getattr(self.model_class, self.pk_column)
+        select_stmt = sa.select(pk_column).order_by(pk_column).limit(batch_size)
+        if self._stmt.whereclause is not None:
+            select_stmt = select_stmt.where(self._stmt.whereclause)
+
+        object_ids = list(await session.scalars(select_stmt, self._params))
+        if object_ids:
+            await session.execute(sa.delete(self.model_class).where(pk_column.in_(object_ids)))
+            await session.commit()
+        return len(object_ids)
+
     async def new(self) -> T:
         return self.model_class()
 
-    async def paginate(self, request: Request, page: int, page_size: int) -> Pagination[T]:
-        row_count = await self.count(request)
-
+    async def paginate(
+        self,
+        request: Request,
+        page: int,
+        page_size: int,
+        count_strategy: CountStrategy = "exact",
+        count_cap: int = 10_000,
+    ) -> Pagination[T]:
         offset = (page - 1) * page_size
-        stmt = self._stmt.limit(page_size).offset(offset)
-        result = await get_dbsession(request).scalars(stmt)
-        rows = result.all()
-        return Pagination(rows=list(rows), total_rows=row_count, page=page, page_size=page_size)
+        if count_strategy == "exact":
+            rows, row_count = await self._fetch_page_and_count(request, page_size, offset)
+            return Pagination(rows=rows, total_rows=row_count, page=page, page_size=page_size)
+
+        # without exact count, the next page is detected by fetching one extra row
+        stmt = self._stmt.limit(page_size + 1).offset(offset)
+        result = await get_dbsession(request).scalars(stmt, self._params)
+        rows = list(result.all())
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        seen_rows = offset + len(rows)
+
+        total_rows: int | None = None
+        total_exact = False
+        if not has_next and (rows or page == 1):
+            # this is the last page, the total is known for free
+            total_rows, total_exact = seen_rows, True
+        elif count_strategy == "estimated":
+            total_rows = max(await self.estimate_count(request), seen_rows + int(has_next))
+        elif count_strategy == "capped":
+            total_rows = await self.count_capped(request, count_cap)
+            total_exact = total_rows <= count_cap
+            total_rows = min(total_rows, count_cap)
+
+        return Pagination(
+            rows=rows,
+            total_rows=total_rows,
+            page=page,
+            page_size=page_size,
+            total_exact=total_exact,
+            has_next=has_next,
+            count_strategy=count_strategy,
+        )
+
+    def get_keyset_columns(self) -> list[tuple[str, sa.ColumnElement, SortingType]]:
+        """
+        Return (field, column, direction) triples the keyset pagination sorts by.
+
+        These are the active ordering fields followed by the primary key, which makes the sort order total.
+        """
+        props = self.metadata.get_column_properties(list(self._ordering.keys()))
+        keys: list[tuple[str, sa.ColumnElement, SortingType]] = []
+        for ordering_field, ordering_dir in self._ordering.items():
+            if prop := props.get(ordering_field):
+                if (column := self.get_sort_column(ordering_field, prop)) is not None:
+                    keys.append((ordering_field, column, ordering_dir))
+
+        if self.pk_column not in self._ordering:
+            keys.append((self.pk_column, self.metadata.mapper.column_attrs[self.pk_column].columns[0], "asc"))
+        return keys
+
+    def _keyset_clause(
+        self,
+        keys: typing.Sequence[tuple[str, sa.ColumnElement, SortingType]],
+        values: typing.Sequence[typing.Any],
+        backwards: bool,
+        nulls_largest: bool,
+    ) -> sa.ColumnElement[bool]:
+        """
+        Build a seek predicate that selects rows located after (or before) the given key values.
+
+        For keys (a ASC, b DESC) it produces: a > :a OR (a = :a AND b < :b).
+        NULLs are sorted by the database default (`nulls_largest` tells which), so NULL key values
+        and nullable columns get IS NULL / IS NOT NULL branches that follow the same order.
+        """
+
+        def nullable(column: sa.ColumnElement) -> bool:
+            return not isinstance(column, sa.Column) or column.nullable is not False
+
+        def equals(column: sa.ColumnElement, value: typing.Any) -> sa.ColumnElement[bool]:
+            return column.is_(None) if value is None else column == value
+
+        def follows(column: sa.ColumnElement, value: typing.Any, ascending: bool) -> sa.ColumnElement[bool]:
+            # NULLs come after all values when moving towards larger values and they are the largest
+            nulls_follow = nulls_largest == ascending
+            if value is None:
+                return column.is_not(None) if not nulls_follow else sa.false()
+            comparison = column > value if ascending else column < value
+            if nulls_follow and nullable(column):
+                return sa.or_(comparison, column.is_(None))
+            return comparison
+
+        clauses: list[sa.ColumnElement[bool]] = []
+        for index, (_, column, direction) in enumerate(keys):
+            ascending = (direction == "asc") != backwards
+            previous = [equals(keys[prev][1], values[prev]) for prev in range(index)]
+            clauses.append(sa.and_(*previous, follows(column, values[index], ascending)))
+        return sa.or_(*clauses)
+
+    async def stream(self, request: Request, batch_size: int = 1000) -> typing.AsyncIterator[T]:
+        # rows are read from a server-side cursor, yield_per keeps at most one batch of objects in memory
+        result = await get_dbsession(request).stream_scalars(
+            self._stmt, self._params, execution_options={"yield_per": batch_size}
+        )
+        async for obj in result:
+            yield obj
+
+    async def paginate_by_cursor(self, request: Request, cursor: Cursor | None, page_size: int) -> CursorPagination[T]:
+        keys = self.get_keyset_columns()
+        signature = [f"-{field}" if direction == "desc" else field for field, _, direction in keys]
+        if cursor is not None and cursor.keys != signature:
+            # the cursor was generated for another ordering, start from the beginning
+            cursor = None
+
+        backwards = cursor is not None and cursor.direction == "previous"
+        stmt = self._stmt.order_by(None)
+        if cursor is not None:
+            # PostgreSQL and Oracle sort NULLs as larger than any value, other databases as smaller
+            nulls_largest = get_dbsession(request).get_bind().dialect.name in ("postgresql", "oracle")
+            stmt = stmt.where(self._keyset_clause(keys, cursor.values, backwards, nulls_largest))
+        for _, column, direction in keys:
+            descending = (direction == "desc") != backwards
+            stmt = stmt.order_by(column.desc() if descending else column.asc())
+
+        # key values are selected along with the entity so cursors never trigger lazy loads of relations,
+        # one extra row tells if there are more rows in the requested direction
+        stmt = stmt.add_columns(*[column for _, column, _ in keys]).limit(page_size + 1)
+        result = await get_dbsession(request).execute(stmt, self._params)
+        rows = list(result.all())
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        has_next = True if backwards else has_more
+        has_previous = has_more if backwards else cursor is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(Cursor("next", signature, list(rows[-1][1:])))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(Cursor("previous", signature, list(rows[0][1:])))
+        return CursorPagination(
+            rows=[row[0] for row in rows],
+            page_size=page_size,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
 
     def get_pk(self, obj: T) -> str:
         return str(getattr(obj, self.pk_column))
 
-    def _clone(self, stmt: sa.Select | None = None) -> typing.Self:
-        return self.__class__(
-            query=self.query,
-            model_class=self.model_class,
-            query_for_list=self.query_for_list,
-            _stmt=stmt if stmt is not None else self._stmt,
-        )
+    def _clone(self, **changes: typing.Any) -> typing.Self:
+        """Return a shallow copy with the given attributes replaced, the statement is rebuilt lazily."""
+        clone = copy.copy(self)
+        clone.__dict__.pop("_stmt", None)
+        clone.__dict__.update(changes)
+        return clone
 
     def __repr__(self) -> str:  # pragma: no cover
         return repr(self._stmt)
 
 
+class LazyLoadWarning(UserWarning):
+    """Issued when a request lazy loads the same relationship many times (the N+1 queries problem)."""
+
+
+_lazy_loads: contextvars.ContextVar[collections.Counter[str] | None] = contextvars.ContextVar(
+    "_lazy_loads", default=None
+)
+
+
+def _count_lazy_loads(orm_execute_state: orm.ORMExecuteState) -> None:
+    counter = _lazy_loads.get()
+    if counter is not None and orm_execute_state.lazy_loaded_from is not None:
+        path = orm_execute_state.loader_strategy_path
+        counter[str(path[-1]) if path else "unknown"] += 1
+
+
+class LazyLoadDetectorMiddleware:
+    """
+    Count lazy loads of relationships per request and warn about N+1 queries.
+
+    A relationship lazy loaded `threshold` or more times during a request issues `LazyLoadWarning`.
+    This is a debugging aid, enable it in development only.
+    """
+
+    def __init__(self, app: ASGIApp, threshold: int = 2) -> None:
+        self.app = app
+        self.threshold = threshold
+        if not event.contains(orm.Session, "do_orm_execute", _count_lazy_loads):
+            event.listen(orm.Session, "do_orm_execute", _count_lazy_loads)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter: collections.Counter[str] = collections.Counter()
+        token = _lazy_loads.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _lazy_loads.reset(token)
+
+        for attribute, count in counter.most_common():
+            if count >= self.threshold:
+                warnings.warn(
+                    f'{scope["path"]}: relationship {attribute} was lazy loaded {count} times, '
+                    f"consider eager loading it.",
+                    LazyLoadWarning,
+                )
+
+
+SessionSource = AsyncSession | async_sessionmaker[AsyncSession]
+
+
+@contextlib.asynccontextmanager
+async def _use_session(dbsession: SessionSource) -> typing.AsyncIterator[AsyncSession]:
+    if isinstance(dbsession, AsyncSession):
+        yield dbsession
+    else:
+        async with dbsession() as session:
+            yield session
+
+
+def get_cache_tags(stmt: sa.ClauseElement) -> list[str]:
+    """Return choices cache tags of the tables the statement reads from."""
+    return sorted({f"table:{table.fullname}" for table in find_tables(stmt, include_joins=True)})
+
+
+def _get_choices_cache_key(
+    stmt: sa.Select,
+    value_attr: str | typing.Callable[[typing.Any], str],
+    label_attr: str | typing.Callable[[typing.Any], str],
+) -> str:
+    """
+    Return a cache key of choices loaded by the statement.
+
+    The statement text and parameters identify the query, attribute getters shape the choices.
+    Callables are identified by their definition, not by id(), ids are reused once the objects are collected.
+    """
+
+    def describe(attr: str | typing.Callable[[typing.Any], str]) -> str:
+        if isinstance(attr, str):
+            return attr
+        code = getattr(attr, "__code__", None)
+        location = f"{code.co_filename}:{code.co_firstlineno}" if code else ""
+        return f"{getattr(attr, '__module__', '')}.{getattr(attr, '__qualname__', repr(attr))}:{location}"
+
+    compiled = stmt.compile()
+    return f"{compiled}:{compiled.params!r}:{describe(value_attr)}:{describe(label_attr)}"
+
+
 async def load_choices(
-    dbsession: AsyncSession,
+    dbsession: SessionSource,
     field: wtforms.SelectField,
     stmt: sa.Select,
     value_attr: str | typing.Callable[[typing.Any], str] = "id",
     label_attr: str | typing.Callable[[typing.Any], str] = str,
     empty_choice: bool = True,
     empty_choice_label: str = "",
+    cache_ttl: int | None = None,
+    cache_key: str = "",
 ) -> None:
+    """
+    Load field choices from the database.
+
+    When `dbsession` is a session maker the query runs in a new session, so several calls can run concurrently.
+    With `cache_ttl` the choices are kept in the choices cache for that many seconds, or until a resource
+    writes into one of the queried tables. Add the request dependent part (like a tenant id) to `cache_key`
+    when the statement depends on the request.
+    """
+
     def callback(obj: object, attr: str) -> str:
         return getattr(obj, attr)
 
     value_getter = value_attr if callable(value_attr) else functools.partial(callback, attr=value_attr)
     label_getter = label_attr if callable(label_attr) else functools.partial(callback, attr=label_attr)
 
-    rows = await dbsession.execute(stmt)
-    field.choices = [(value_getter(row), label_getter(row)) for row in rows.scalars()]
+    async def load() -> list[tuple[typing.Any, str]]:
+        async with _use_session(dbsession) as session:
+            rows = await session.execute(stmt)
+            return [(value_getter(row), label_getter(row)) for row in rows.scalars()]
+
+    if cache_ttl:
+        key = f"{cache_key}:{_get_choices_cache_key(stmt, value_attr, label_attr)}"
+        field.choices = await choices_cache.get_or_load(key, load, cache_ttl, get_cache_tags(stmt))
+    else:
+        field.choices = await load()
     if empty_choice:
         field.choices.insert(0, ("", empty_choice_label))
 
@@ -271,8 +1120,22 @@ def form_choices_from(
     query: sa.Select | None = None,
     empty_choice: bool = True,
     empty_choice_label: str = "",
+    sessionmaker: async_sessionmaker[AsyncSession] | None = None,
+    cache_ttl: int | None = None,
+    cache_key: typing.Callable[[Request], str] | None = None,
 ) -> typing.Any:
-    query = query or sa.select(model_class)
+    """
+    Create a choices loader for the model.
+
+    The loader uses `request.state.dbsession` unless `sessionmaker` is given, a loader with own sessions
+    (and so own pooled connections) can run concurrently with other loaders.
+    With `cache_ttl` the choices are kept in the choices cache for that many seconds, or until a resource
+    writes into one of the queried tables. When the query depends on the request (per tenant or user data),
+    `cache_key` must return a key that tells such requests apart.
+    """
+    query = query if query is not None else sa.select(model_class)
+    tags = get_cache_tags(query)
+    query_key = _get_choices_cache_key(query, value_attr, label_attr) if cache_ttl else ""
 
     def callback(obj: object, attr: str) -> str:
         return getattr(obj, attr)
@@ -280,13 +1143,19 @@ def form_choices_from(
     value_getter = value_attr if callable(value_attr) else functools.partial(callback, attr=value_attr)
     label_getter = label_attr if callable(label_attr) else functools.partial(callback, attr=label_attr)
 
+    async def load(request: Request) -> list[tuple[typing.Any, str]]:
+        async with _use_session(sessionmaker or request.state.dbsession) as session:
+            return [(value_getter(row), label_getter(row)) for row in await session.scalars(query)]
+
     async def loader(request: Request) -> typing.Sequence[tuple[typing.Any, str]]:
-        result = await request.state.dbsession.scalars(query)
         choices: list[tuple[typing.Any, str]] = []
         if empty_choice:
             choices.append(("", empty_choice_label))
-        for row in result:
-            choices.append((value_getter(row), label_getter(row)))
+        if cache_ttl:
+            key = f"{cache_key(request) if cache_key else ''}:{query_key}"
+            choices.extend(await choices_cache.get_or_load(key, functools.partial(load, request), cache_ttl, tags))
+        else:
+            choices.extend(await load(request))
         return choices
 
     return loader
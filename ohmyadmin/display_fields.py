@@ -7,6 +7,7 @@ from starlette.datastructures import URL
 from starlette.requests import Request
 
 from ohmyadmin.helpers import snake_to_sentence
+from ohmyadmin.routing import url_for
 
 
 def default_value_getter(obj: typing.Any, attr: str) -> typing.Any:
@@ -26,6 +27,7 @@ class DisplayField:
         default_if_none: str = "-",
         link: bool = False,
         link_to: ResourceActionLink = "edit",
+        source_fields: typing.Sequence[str] | None = None,
     ) -> None:
         self.name = name
         self.link = link
@@ -34,6 +36,12 @@ class DisplayField:
         self.label = label or snake_to_sentence(name)
         self.value_getter = value_getter or functools.partial(default_value_getter, attr=name)
 
+        # model fields the value is computed from, used to limit loaded columns.
+        # None means "unknown": custom value getters may read any attribute.
+        self.source_fields = source_fields
+        if source_fields is None and value_getter is None:
+            self.source_fields = [name]
+
     def get_field_value(self, request: Request, obj: typing.Any) -> str:
         obj_value = self.get_value(obj)
         if obj_value is None:
@@ -54,5 +62,5 @@ class DisplayField:
             return self.link_to(request, obj)
 
         if self.link_to == "edit":
-            return request.url_for(resource.get_edit_route_name(), object_id=object_id)
-        return request.url_for(resource.get_display_route_name(), object_id=object_id)
+            return url_for(request, resource.get_edit_route_name(), object_id=object_id)
+        return url_for(request, resource.get_display_route_name(), object_id=object_id)
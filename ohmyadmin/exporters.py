@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import abc
+import csv
+import datetime
+import decimal
+import io
+import json
+import re
+import typing
+import zipfile
+from xml.sax.saxutils import escape
+
+from ohmyadmin.display_fields import DisplayField
+
+
+class _WriteOnlyStream:
+    """A stream that cannot seek, zipfile writes entries with data descriptors into such streams."""
+
+    def __init__(self, buffer: io.BytesIO) -> None:
+        self.buffer = buffer
+
+    def write(self, data: bytes) -> int:
+        return self.buffer.write(data)
+
+    def flush(self) -> None:
+        pass
+
+
+class Exporter(abc.ABC):
+    """
+    Serializes objects into a file format, one row per object and one column per display field.
+
+    Rows are written into an in-memory buffer which is drained every `chunk_size` bytes,
+    so the memory usage does not depend on the number of exported objects.
+    Exporters keep state while exporting, create a new instance for every export.
+    """
+
+    format: str = ""
+    label: str = ""
+    media_type: str = "application/octet-stream"
+    file_extension: str = ""
+    chunk_size: int = 64 * 1024
+
+    def __init__(self, fields: typing.Sequence[DisplayField]) -> None:
+        self.fields = fields
+
+    def get_header(self) -> list[str]:
+        return [str(field.label) for field in self.fields]
+
+    def get_values(self, obj: typing.Any) -> list[typing.Any]:
+        return [field.get_value(obj) for field in self.fields]
+
+    @abc.abstractmethod
+    def write_header(self, stream: typing.BinaryIO) -> None:
+        ...
+
+    @abc.abstractmethod
+    def write_row(self, stream: typing.BinaryIO, values: typing.Sequence[typing.Any]) -> None:
+        ...
+
+    def finish(self, stream: typing.BinaryIO) -> None:
+        pass
+
+    async def export(self, objects: typing.AsyncIterable[typing.Any]) -> typing.AsyncIterator[bytes]:
+        stream = io.BytesIO()
+        self.write_header(stream)
+        async for obj in objects:
+            self.write_row(stream, self.get_values(obj))
+            if stream.tell() >= self.chunk_size:
+                yield stream.getvalue()
+                stream.seek(0)
+                stream.truncate()
+
+        self.finish(stream)
+        yield stream.getvalue()
+
+
+class CSVExporter(Exporter):
+    format = "csv"
+    label = "CSV"
+    media_type = "text/csv"
+    file_extension = "csv"
+
+    def _write(self, stream: typing.BinaryIO, values: typing.Sequence[typing.Any]) -> None:
+        line = io.StringIO()
+        csv.writer(line).writerow(["" if value is None else value for value in values])
+        stream.write(line.getvalue().encode())
+
+    def write_header(self, stream: typing.BinaryIO) -> None:
+        self._write(stream, self.get_header())
+
+    def write_row(self, stream: typing.BinaryIO, values: typing.Sequence[typing.Any]) -> None:
+        self._write(stream, values)
+
+
+class JSONLinesExporter(Exporter):
+    format = "jsonl"
+    label = "JSON Lines"
+    media_type = "application/jsonl"
+    file_extension = "jsonl"
+
+    def write_header(self, stream: typing.BinaryIO) -> None:
+        pass
+
+    def write_row(self, stream: typing.BinaryIO, values: typing.Sequence[typing.Any]) -> None:
+        row = {field.name: value for field, value in zip(self.fields, values)}
+        stream.write(json.dumps(row, default=str).encode() + b"\n")
+
+
+_XLSX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml"
+ ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml"
+ ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+_XLSX_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="xl/workbook.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>
+</Relationships>"""
+
+_XLSX_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_XLSX_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="worksheets/sheet1.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>
+</Relationships>"""
+
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_END = "</sheetData></worksheet>"
+
+# characters that are not allowed in XML documents
+_XML_ILLEGAL_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class XLSXExporter(Exporter):
+    """
+    Writes a minimal single sheet workbook.
+
+    The sheet is compressed into the zip container as rows arrive, so no third-party library
+    and no temporary files are needed. Numbers are written as numeric cells, everything else as text.
+    """
+
+    format = "xlsx"
+    label = "Excel"
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    file_extension = "xlsx"
+
+    def _format_cell(self, value: typing.Any) -> str:
+        if value is None:
+            return "<c/>"
+        if isinstance(value, (int, float, decimal.Decimal)) and not isinstance(value, bool):
+            return f"<c><v>{value}</v></c>"
+        if isinstance(value, (datetime.date, datetime.time)):
+            value = value.isoformat()
+        text = escape(_XML_ILLEGAL_CHARS.sub("", str(value)))
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def _write(self, values: typing.Sequence[typing.Any]) -> None:
+        cells = "".join(self._format_cell(value) for value in values)
+        self._sheet.write(f"<row>{cells}</row>".encode())
+
+    def write_header(self, stream: typing.BinaryIO) -> None:
+        zip_stream = typing.cast(typing.IO[bytes], _WriteOnlyStream(typing.cast(io.BytesIO, stream)))
+        self._zip = zipfile.ZipFile(zip_stream, "w", zipfile.ZIP_DEFLATED)
+        self._zip.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w")
+        self._sheet.write(_XLSX_SHEET_START.encode())
+        self._write(self.get_header())
+
+    def write_row(self, stream: typing.BinaryIO, values: typing.Sequence[typing.Any]) -> None:
+        self._write(values)
+
+    def finish(self, stream: typing.BinaryIO) -> None:
+        self._sheet.write(_XLSX_SHEET_END.encode())
+        self._sheet.close()
+        self._zip.close()
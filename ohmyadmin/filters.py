@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 import contextvars
+import dataclasses
 import decimal
 import functools
 import typing
@@ -13,6 +14,7 @@ from starlette_babel import gettext_lazy as _
 
 from ohmyadmin.datasources import datasource
 from ohmyadmin.datasources.datasource import DataSource, DateOperation, NumberFilter, NumberOperation
+from ohmyadmin.forms.fields import AutocompleteSource, use_autocomplete
 from ohmyadmin.forms.utils import create_form, safe_enum_coerce
 from ohmyadmin.helpers import snake_to_sentence
 from ohmyadmin.ordering import get_ordering_value
@@ -63,6 +65,38 @@ class Filter(abc.ABC, typing.Generic[F]):
         """
 
 
+@dataclasses.dataclass
+class FilterState:
+    """A filter evaluated for the current request: its form, whether it is active and its indicator context."""
+
+    filter: Filter
+    form: wtforms.Form
+    active: bool
+
+    @functools.cached_property
+    def indicator_context(self) -> typing.Mapping[str, typing.Any]:
+        return self.filter.get_indicator_context()
+
+
+async def evaluate_filters(request: Request, filters: typing.Iterable[Filter]) -> list[FilterState]:
+    """
+    Build forms of the filters from the query string and test which filters are active, once per request.
+
+    States are kept in `request.state`, the following calls (for example, from templates) reuse them.
+    """
+    cache: dict[int, FilterState] | None = getattr(request.state, "filter_states", None)
+    if cache is None:
+        cache = request.state.filter_states = {}
+
+    states: list[FilterState] = []
+    for filter_ in filters:
+        if (state := cache.get(id(filter_))) is None:
+            form = await filter_.get_form(request)
+            state = cache[id(filter_)] = FilterState(filter_, form, active=bool(filter_.is_active(request)))
+        states.append(state)
+    return states
+
+
 class SearchFilter(Filter):
     visible_in_toolbar = False
 
@@ -330,20 +364,26 @@ class ChoiceFilter(Filter[ChoiceFilterForm]):
         label: str = "",
         filter_id: str = "",
         *,
-        choices: typing.Any | ChoiceLoader,
+        choices: typing.Any | ChoiceLoader = (),
         coerce: type[str | int | float | decimal.Decimal] = str,
+        autocomplete: AutocompleteSource | None = None,
         **kwargs: typing.Any,
     ) -> None:
+        """Pass a resource as `autocomplete` to search choices with its autocomplete endpoint instead of `choices`."""
         super().__init__(query_param, label, filter_id=filter_id, **kwargs)
         self.coerce = coerce
         self.choices = choices
+        self.autocomplete = autocomplete
 
     async def get_form(self, request: Request) -> ChoiceFilterForm:
-        choices = self.choices
-        if callable(self.choices):
+        form: ChoiceFilterForm = await super().get_form(request)
+        if self.autocomplete is not None:
+            choices = await use_autocomplete(request, form.choice, self.autocomplete, [form.choice.data])
+        elif callable(self.choices):
             choices = await self.choices(request)
+        else:
+            choices = self.choices
 
-        form: ChoiceFilterForm = await super().get_form(request)
         form.choice.coerce = self.coerce
         form.choice.choices = [("", ""), *choices]
         return form
@@ -378,18 +418,25 @@ class MultiChoiceFilter(Filter[MultiChoiceFilterForm]):
         label: str = "",
         filter_id: str = "",
         *,
-        choices: typing.Any,
+        choices: typing.Any = (),
         coerce: type[str | int | float | decimal.Decimal] = str,
+        autocomplete: AutocompleteSource | None = None,
         **kwargs: typing.Any,
     ) -> None:
+        """Pass a resource as `autocomplete` to search choices with its autocomplete endpoint instead of `choices`."""
         super().__init__(query_param, label, filter_id=filter_id, **kwargs)
         self.coerce = coerce
         self.choices = choices
+        self.autocomplete = autocomplete
 
     async def get_form(self, request: Request) -> ChoiceFilterForm:
         form: ChoiceFilterForm = await super().get_form(request)
         form.choice.coerce = self.coerce
-        form.choice.choices = self.choices
+        if self.autocomplete is not None:
+            values = form.choice.data or []
+            form.choice.choices = await use_autocomplete(request, form.choice, self.autocomplete, values)
+        else:
+            form.choice.choices = self.choices
         return form
 
     def apply(self, request: Request, query: DataSource, form: MultiChoiceFilterForm) -> DataSource:
@@ -402,8 +449,8 @@ class MultiChoiceFilter(Filter[MultiChoiceFilterForm]):
         return query
 
     def is_active(self, request: Request) -> bool:
-        if self.form.validate():
-            return bool(self.form.data["choice"])
+        if self.form.choice.validate(self.form):
+            return bool(self.form.choice.data)
         return False
 
     def get_indicator_context(self) -> dict[str, typing.Any]:
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import typing
+
+import wtforms
+from markupsafe import escape, Markup
+from starlette.requests import Request
+
+from ohmyadmin.forms.utils import Initable
+from ohmyadmin.routing import url_for
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from ohmyadmin.resources.resource import ResourceScreen
+
+AutocompleteSource: typing.TypeAlias = "type[ResourceScreen] | ResourceScreen"
+
+
+def get_autocomplete_resource(request: Request, resource: AutocompleteSource) -> ResourceScreen:
+    """Return the resource instance registered in the admin, resources may be referenced by their classes."""
+    if not isinstance(resource, type):
+        return resource
+
+    for screen in request.state.ohmyadmin.screens:
+        if isinstance(screen, resource):
+            return screen
+    raise ValueError(f"Resource {resource.__name__} is not registered in the admin.")
+
+
+async def load_autocomplete_choices(
+    request: Request, resource: AutocompleteSource, values: typing.Iterable[typing.Any]
+) -> tuple[str, list[tuple[str, str]]]:
+    """Return the autocomplete URL of the resource and choices for the selected values."""
+    resource = get_autocomplete_resource(request, resource)
+    url = str(url_for(request, resource.get_autocomplete_route_name()))
+    values = [value for value in values if value not in (None, "")]
+    return url, await resource.get_autocomplete_choices(request, values) if values else []
+
+
+class AutocompleteWidget(wtforms.widgets.Select):
+    """
+    Renders a select with the selected options only, the o-autocomplete element searches the rest on the server.
+
+    Without JavaScript the select keeps the current value.
+    """
+
+    def __call__(self, field: wtforms.Field, **kwargs: typing.Any) -> Markup:
+        select = super().__call__(field, **kwargs)
+        placeholder = escape(getattr(field, "placeholder", ""))
+        url = escape(getattr(field, "autocomplete_url", ""))
+        return Markup(f'<o-autocomplete url="{url}" placeholder="{placeholder}">{select}</o-autocomplete>')
+
+
+async def use_autocomplete(
+    request: Request, field: wtforms.Field, resource: AutocompleteSource, values: typing.Iterable[typing.Any]
+) -> list[tuple[str, str]]:
+    """Render the field with the autocomplete widget and return choices of the selected values."""
+    url, choices = await load_autocomplete_choices(request, resource, values)
+    field.widget = AutocompleteWidget(multiple=isinstance(field, wtforms.SelectMultipleField))
+    field.autocomplete_url = url
+    return choices
+
+
+class AutocompleteField(wtforms.SelectField, Initable):
+    """
+    A select field for large relations, options are searched by the autocomplete endpoint of `resource`.
+
+    Only the selected option is loaded and rendered. `resource` is a resource class (registered in the admin)
+    or instance that lists the related objects, its `autocomplete_fields` are searched.
+    """
+
+    widget = AutocompleteWidget()
+
+    def __init__(
+        self,
+        label: str | None = None,
+        validators: typing.Sequence[typing.Any] | None = None,
+        *,
+        resource: AutocompleteSource,
+        placeholder: str = "",
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(label, validators, choices=[], **kwargs)
+        self.resource = resource
+        self.placeholder = placeholder
+        self.autocomplete_url = ""
+
+    def get_selected_values(self) -> list[typing.Any]:
+        return [self.data]
+
+    async def init(self, request: Request) -> None:
+        self.autocomplete_url, self.choices = await load_autocomplete_choices(
+            request, self.resource, self.get_selected_values()
+        )
+
+
+class MultipleAutocompleteField(wtforms.SelectMultipleField, AutocompleteField):
+    widget = AutocompleteWidget(multiple=True)
+
+    def get_selected_values(self) -> list[typing.Any]:
+        return list(self.data or [])
@@ -1,16 +1,30 @@
 import abc
+import asyncio
 import enum
 import inspect
+import time
 import typing
+import warnings
+
 import wtforms
 from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import ImmutableMultiDict
 from starlette.requests import Request
 
 _F = typing.TypeVar("_F", bound=wtforms.Form)
+_V = typing.TypeVar("_V")
+
+DEFAULT_INIT_CONCURRENCY = 10
+SLOW_INIT_THRESHOLD = 0.5  # seconds
+
+
+class SlowInitWarning(UserWarning):
+    """Issued when a field initializer takes longer than the threshold."""
 
 
 class Initable(abc.ABC):  # pragma: no cover
+    name: str  # implemented by form fields
+
     @abc.abstractmethod
     async def init(self, request: Request) -> None:
         ...
@@ -45,10 +59,74 @@ def iterate_form_fields(
             yield field
 
 
-async def init_form(request: Request, form: wtforms.Form) -> None:
-    for field in iterate_form_fields(form):
-        if isinstance(field, Initable):
-            await field.init(request)
+async def init_concurrently(
+    initializers: typing.Mapping[str, typing.Awaitable[typing.Any]],
+    max_concurrency: int = DEFAULT_INIT_CONCURRENCY,
+    slow_threshold: float | None = SLOW_INIT_THRESHOLD,
+) -> dict[str, float]:
+    """
+    Await initializers (like choice loaders) concurrently, at most `max_concurrency` at once.
+
+    Return the time each initializer took in seconds, by name. Initializers slower than `slow_threshold` seconds
+    issue SlowInitWarning. Note that one AsyncSession cannot run concurrent queries, give each loader its own
+    session (see `load_choices`).
+    """
+    if not initializers:
+        return {}  # most forms have nothing to initialize
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    timings: dict[str, float] = {}
+
+    async def run(name: str, initializer: typing.Awaitable[typing.Any]) -> None:
+        async with semaphore:
+            started_at = time.perf_counter()
+            await initializer
+            timings[name] = time.perf_counter() - started_at
+
+    await asyncio.gather(*[run(name, initializer) for name, initializer in initializers.items()])
+    if slow_threshold is not None:
+        for name, elapsed in timings.items():
+            if elapsed > slow_threshold:
+                warnings.warn(f"Initializing {name} took {elapsed * 1000:.0f} ms.", SlowInitWarning)
+    return timings
+
+
+async def init_form(
+    request: Request,
+    form: wtforms.Form,
+    max_concurrency: int = 1,
+) -> dict[str, float]:
+    """
+    Initialize Initable fields and return the time each field took, by field name.
+
+    Fields are initialized one by one because they usually query the request session (`request.state.dbsession`),
+    which cannot run concurrent operations. Pass `max_concurrency` greater than 1 when every field initializer
+    uses its own session (like `form_choices_from` with `sessionmaker`).
+    """
+    return await init_concurrently(
+        {field.name: field.init(request) for field in iterate_form_fields(form) if isinstance(field, Initable)},
+        max_concurrency=max_concurrency,
+    )
+
+
+def blocking(validator: _V) -> _V:
+    """
+    Mark a validator as blocking (one that does I/O, like a database lookup), it will run in a thread pool.
+
+    Validator classes can set `blocking = True` class attribute instead.
+    """
+    setattr(validator, "blocking", True)
+    return validator
+
+
+def is_async_validator(validator: typing.Callable[..., typing.Any]) -> bool:
+    return inspect.iscoroutinefunction(validator) or inspect.iscoroutinefunction(getattr(validator, "__call__", None))
+
+
+def is_blocking_validator(validator: typing.Callable[..., typing.Any]) -> bool:
+    if isinstance(validator, wtforms.validators.Email) and validator.check_deliverability:
+        return True  # resolves the domain
+    return bool(getattr(validator, "blocking", False))
 
 
 async def validate_form(form: wtforms.Form) -> bool:
@@ -56,17 +134,20 @@ async def validate_form(form: wtforms.Form) -> bool:
     Perform form validation.
 
     This function does not call Form.validate or Field.validate, instead it implements own logic that supports async
-    validators.
+    validators. Async validators are awaited, validators marked with `blocking` run in a thread pool
+    and the rest (like all builtin WTForms validators) are called inline.
     """
     is_valid = True
     for field in iterate_form_fields(form):
         for validator in field.validators:
             field.errors = list(field.errors) if field.errors is not None else []
             try:
-                if inspect.iscoroutinefunction(validator):
+                if is_async_validator(validator):
                     await validator(form, field)
-                else:
+                elif is_blocking_validator(validator):
                     await run_in_threadpool(validator, form, field)
+                else:
+                    validator(form, field)
             except (wtforms.ValidationError, wtforms.validators.StopValidation) as ex:
                 field.errors = list(field.errors)
                 field.errors.extend(ex.args)
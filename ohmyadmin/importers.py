@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import abc
+import csv
+import dataclasses
+import io
+import itertools
+import json
+import typing
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import ImmutableMultiDict
+
+
+class ParseError(Exception):
+    """Raised when the uploaded file cannot be parsed."""
+
+
+@dataclasses.dataclass
+class ImportReport:
+    """Outcome of an import, errors are pairs of 1-based row numbers (the CSV header is not counted) and messages."""
+
+    total: int = 0
+    created: int = 0
+    elapsed: float = 0.0
+    errors: list[tuple[int, str]] = dataclasses.field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> int:
+        return round(self.total / self.elapsed) if self.elapsed else self.total
+
+    def add_error(self, row_number: int, message: str) -> None:
+        self.errors.append((row_number, message))
+
+
+def _to_string(value: typing.Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class Importer(abc.ABC):
+    """
+    Parses an uploaded file into rows, one mapping of field names to values per row.
+
+    The file is read lazily in batches, so the memory usage does not depend on the file size.
+    Parsing is blocking and runs in a thread pool.
+    """
+
+    format: str = ""
+    label: str = ""
+    file_extension: str = ""
+
+    def __init__(self, file: typing.BinaryIO) -> None:
+        self.file = file
+
+    @abc.abstractmethod
+    def read_rows(self) -> typing.Iterator[typing.Mapping[str, typing.Any]]:
+        ...
+
+    async def iter_batches(self, batch_size: int) -> typing.AsyncIterator[list[typing.Mapping[str, typing.Any]]]:
+        rows = self.read_rows()
+        while batch := await run_in_threadpool(lambda: list(itertools.islice(rows, batch_size))):
+            yield batch
+
+    @classmethod
+    def to_form_data(cls, row: typing.Mapping[str, typing.Any]) -> ImmutableMultiDict:
+        """Convert a row into form data, list values become repeated keys."""
+        items: list[tuple[str, str]] = []
+        for key, value in row.items():
+            for item in value if isinstance(value, list) else [value]:
+                if item is not None:
+                    items.append((key, _to_string(item)))
+        return ImmutableMultiDict(items)
+
+
+class CSVImporter(Importer):
+    """Reads CSV files with a header row, the header contains form field names."""
+
+    format = "csv"
+    label = "CSV"
+    file_extension = "csv"
+
+    def read_rows(self) -> typing.Iterator[typing.Mapping[str, typing.Any]]:
+        # utf-8-sig strips the byte order mark that spreadsheet apps put into exported files
+        stream = io.TextIOWrapper(self.file, encoding="utf-8-sig", newline="")
+        try:
+            for row in csv.DictReader(stream):
+                yield {key: value for key, value in row.items() if key}
+        except (csv.Error, UnicodeDecodeError) as ex:
+            raise ParseError(str(ex)) from ex
+        finally:
+            stream.detach()
+
+
+class JSONLinesImporter(Importer):
+    """Reads files with one JSON object per line."""
+
+    format = "jsonl"
+    label = "JSON Lines"
+    file_extension = "jsonl"
+
+    def read_rows(self) -> typing.Iterator[typing.Mapping[str, typing.Any]]:
+        for line_number, line in enumerate(self.file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as ex:
+                raise ParseError(f"Line {line_number}: {ex}") from ex
+            if not isinstance(row, dict):
+                raise ParseError(f"Line {line_number}: expected an object.")
+            yield row
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import dataclasses
+import datetime
+import decimal
+import json
 import math
 import typing
+import uuid
+
 from starlette.requests import Request
 
 M = typing.TypeVar("M")
+PaginationMode = typing.Literal["offset", "keyset"]
+CountStrategy = typing.Literal["exact", "estimated", "capped", "none"]
+CursorDirection = typing.Literal["next", "previous"]
 
 
 def get_page_value(request: Request, param_name: str = "page") -> int:
@@ -31,23 +42,49 @@ def get_page_size_value(
 
 
 class Pagination(typing.Generic[M]):
+    """
+    A page of offset pagination.
+
+    When the total count is not exact (see `CountStrategy`), `total_rows` holds an estimate, a cap
+    or None and `has_next` is detected by fetching one extra row instead.
+    """
+
     def __init__(
-        self, rows: typing.Sequence[M], total_rows: int, page: int, page_size: int
+        self,
+        rows: typing.Sequence[M],
+        total_rows: int | None,
+        page: int,
+        page_size: int,
+        total_exact: bool = True,
+        has_next: bool | None = None,
+        count_strategy: CountStrategy = "exact",
     ) -> None:
         self.rows = rows
         self.total_rows = total_rows
         self.page = page
         self.page_size = page_size
+        self.total_exact = total_exact
+        self.count_strategy = count_strategy
+        self._has_next = has_next
         self._pointer = 0
 
     @property
     def total_pages(self) -> int:
         """Total pages in the row set."""
-        return math.ceil(self.total_rows / self.page_size)
+        known_pages = self.page + 1 if self._has_next else self.page
+        if self.total_rows is None:
+            return known_pages
+
+        total_pages = math.ceil(self.total_rows / self.page_size)
+        if not self.total_exact:
+            return max(total_pages, known_pages)
+        return total_pages
 
     @property
     def has_next(self) -> bool:
         """Test if the next page is available."""
+        if self._has_next is not None:
+            return self._has_next
         return self.page < self.total_pages
 
     @property
@@ -88,6 +125,8 @@ class Pagination(typing.Generic[M]):
     @property
     def end_index(self) -> int:
         """The 1-based index of the last item on this page."""
+        if self.total_rows is None or not self.total_exact:
+            return self.start_index + len(self.rows) - 1
         return min(self.start_index + self.page_size - 1, self.total_rows)
 
     def iter_pages(
@@ -145,7 +184,147 @@ class Pagination(typing.Generic[M]):
         return len(self.rows) > 0
 
     def __str__(self) -> str:
-        return f"Page {self.page} of {self.total_pages}, rows {self.start_index} - {self.end_index} of {self.total_rows}."
+        total_rows: typing.Any = self.total_rows
+        if total_rows is None:
+            total_rows = "unknown"
+        elif not self.total_exact:
+            total_rows = f"~{total_rows}"
+        return f"Page {self.page} of {self.total_pages}, rows {self.start_index} - {self.end_index} of {total_rows}."
 
     def __repr__(self) -> str:
         return f"<Page: page={self.page}, total_pages={self.total_pages}>"
+
+
+@dataclasses.dataclass
+class Cursor:
+    """
+    Position of a keyset page.
+
+    `keys` is the ordering signature the cursor was generated for (like `["-created_at", "id"]`), `values` are the
+    values of these keys taken from the boundary row of the page.
+    """
+
+    direction: CursorDirection
+    keys: list[str]
+    values: list[typing.Any]
+
+
+def _encode_cursor_value(value: typing.Any) -> typing.Any:
+    match value:
+        case None | bool() | int() | float() | str():
+            return value
+        case datetime.datetime():
+            return {"t": "datetime", "v": value.isoformat()}
+        case datetime.date():
+            return {"t": "date", "v": value.isoformat()}
+        case datetime.time():
+            return {"t": "time", "v": value.isoformat()}
+        case decimal.Decimal():
+            return {"t": "decimal", "v": str(value)}
+        case uuid.UUID():
+            return {"t": "uuid", "v": str(value)}
+    raise TypeError(f"Value of type {type(value).__name__} cannot be stored in cursor.")
+
+
+def _decode_cursor_value(value: typing.Any) -> typing.Any:
+    if not isinstance(value, dict):
+        return value
+
+    match value:
+        case {"t": "datetime", "v": str(raw)}:
+            return datetime.datetime.fromisoformat(raw)
+        case {"t": "date", "v": str(raw)}:
+            return datetime.date.fromisoformat(raw)
+        case {"t": "time", "v": str(raw)}:
+            return datetime.time.fromisoformat(raw)
+        case {"t": "decimal", "v": str(raw)}:
+            return decimal.Decimal(raw)
+        case {"t": "uuid", "v": str(raw)}:
+            return uuid.UUID(raw)
+    raise ValueError("Unsupported cursor value.")
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Serialize cursor into an opaque URL-safe string."""
+    payload = {
+        "d": cursor.direction,
+        "k": cursor.keys,
+        "v": [_encode_cursor_value(value) for value in cursor.values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Cursor | None:
+    """Deserialize cursor produced by `encode_cursor`. Returns None if the value is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        payload = json.loads(raw)
+        direction = payload["d"]
+        if direction not in ("next", "previous"):
+            return None
+        keys = [str(key) for key in payload["k"]]
+        values = [_decode_cursor_value(value) for value in payload["v"]]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+
+    if len(keys) != len(values):
+        return None
+    return Cursor(direction=direction, keys=keys, values=values)
+
+
+def get_cursor_value(request: Request, param_name: str = "cursor") -> Cursor | None:
+    if value := request.query_params.get(param_name):
+        return decode_cursor(value)
+    return None
+
+
+class CursorPagination(typing.Generic[M]):
+    """
+    A page of keyset (seek) pagination.
+
+    Unlike `Pagination`, it does not know the page number nor the total count of rows,
+    it only knows how to reach the neighbour pages.
+    """
+
+    def __init__(
+        self,
+        rows: typing.Sequence[M],
+        page_size: int,
+        next_cursor: str | None = None,
+        previous_cursor: str | None = None,
+    ) -> None:
+        self.rows = rows
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self) -> bool:
+        """Test if the next page is available."""
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        """Test if the previous page is available."""
+        return self.previous_cursor is not None
+
+    @property
+    def has_other(self) -> bool:
+        """Test if page has next or previous pages."""
+        return self.has_next or self.has_previous
+
+    def __iter__(self) -> typing.Iterator[M]:
+        return iter(self.rows)
+
+    def __getitem__(self, item: int) -> M:
+        return self.rows[item]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __bool__(self) -> bool:
+        return len(self.rows) > 0
+
+    def __repr__(self) -> str:
+        return f"<CursorPage: rows={len(self.rows)}, has_next={self.has_next}, has_previous={self.has_previous}>"
@@ -1,7 +1,10 @@
+import asyncio
 import enum
+import time
 import typing
 
-from starlette.datastructures import URL
+import wtforms
+from starlette.datastructures import URL, UploadFile
 from starlette.requests import Request
 from starlette.responses import Response
 from starlette_babel import gettext_lazy as _
@@ -10,7 +13,10 @@ from starlette_flash import flash
 from ohmyadmin import htmx
 from ohmyadmin.actions import actions, ActionVariant
 from ohmyadmin.actions.actions import ObjectIds
-from ohmyadmin.datasources.datasource import InFilter
+from ohmyadmin.datasources.datasource import DataSource, DuplicateError, InFilter
+from ohmyadmin.forms.utils import Initable, init_form, iterate_form_fields, validate_form
+from ohmyadmin.importers import CSVImporter, Importer, ImportReport, JSONLinesImporter, ParseError
+from ohmyadmin.routing import url_for
 from ohmyadmin.templating import render_to_response
 from ohmyadmin.screens import DisplayScreen, TableScreen
 
@@ -35,7 +41,7 @@ class CreateResourceAction(actions.Action):
 
     def get_url(self, request: Request, model: typing.Any | None = None) -> URL:
         resource: ResourceScreen = request.state.resource
-        return request.url_for(resource.get_create_route_name())
+        return url_for(request, resource.get_create_route_name())
 
 
 class EditResourceAction(actions.LinkAction):
@@ -46,7 +52,7 @@ class EditResourceAction(actions.LinkAction):
         assert model, f"{self.__class__.__name__} can be used in model context only."
         resource: ResourceScreen = request.state.resource
         object_id = resource.datasource.get_pk(model)
-        return request.url_for(resource.get_edit_route_name(), object_id=object_id)
+        return url_for(request, resource.get_edit_route_name(), object_id=object_id)
 
 
 class ViewResourceAction(actions.LinkAction):
@@ -57,7 +63,7 @@ class ViewResourceAction(actions.LinkAction):
         assert model, f"{self.__class__.__name__} can be used in model context only."
         resource: ResourceScreen = request.state.resource
         object_id = resource.datasource.get_pk(model)
-        return request.url_for(resource.get_display_route_name(), object_id=object_id)
+        return url_for(request, resource.get_display_route_name(), object_id=object_id)
 
 
 class SaveResourceAction(actions.SubmitAction):
@@ -73,7 +79,7 @@ class SaveResourceAndReturnAction(actions.SubmitAction):
 class ReturnToResourceIndexAction(actions.LinkAction):
     def get_url(self, request: Request, model: typing.Any | None = None) -> URL:
         resource: ResourceScreen = request.state.resource
-        return request.url_for(resource.get_index_route_name())
+        return url_for(request, resource.get_index_route_name())
 
 
 class DeleteResourceAction2(actions.ModalAction):
@@ -115,14 +121,188 @@ class DeleteResourceAction(actions.NewAction):
     dangerous = True
     label = _("Delete")
 
-    async def apply(self, request: Request, object_ids: ObjectIds) -> Response:
-        pk_field = request.state.resource.datasource.get_id_field()
+    # when set, objects are deleted in primary key batches of this size, each batch is committed separately.
+    # the modal polls the action for the next batch and displays the progress, the user can cancel between batches.
+    batch_size: int | None = None
+    progress_template: str = "ohmyadmin/resources/delete_progress.html"
+
+    def get_query(self, request: Request, object_ids: ObjectIds) -> DataSource:
         query = request.state.resource.datasource
-        if object_ids == "__all__":
-            await query.delete_all()
-        else:
-            query = query.filter(InFilter(pk_field, object_ids))
-
-        count = await query.count(request)
-        await query.delete_all(request)
-        return htmx.response().close_modal().toast(_("{count} objects deleted".format(count=count))).refresh()
+        if object_ids == "__all__" or "__all__" in object_ids:
+            return query
+
+        pk_field = query.get_id_field()
+        return query.filter(InFilter(pk_field, list(object_ids)))
+
+    async def apply(self, request: Request, object_ids: ObjectIds) -> Response:
+        query = self.get_query(request, object_ids)
+        if not self.batch_size:
+            count = await query.count(request)
+            await query.delete_all(request)
+            await request.state.resource.invalidate_cache(request)
+            return htmx.response().close_modal().toast(_("{count} objects deleted").format(count=count)).refresh()
+
+        return await self.apply_batch(request, query, self.batch_size)
+
+    async def apply_batch(self, request: Request, query: DataSource, batch_size: int) -> Response:
+        # progress is carried in the polling url, so every request deletes a single batch and holds no state
+        try:
+            total = int(request.query_params.get("_total") or await query.count(request))
+            deleted = int(request.query_params.get("_deleted") or 0)
+            if total < 0 or deleted < 0:
+                raise ValueError()
+        except ValueError:
+            return htmx.response(400).toast(_("Invalid deletion progress."), "error")
+
+        if "_cancel" in request.query_params:
+            message = _("Deletion cancelled, {deleted} of {total} objects deleted.").format(
+                deleted=deleted, total=total
+            )
+            return htmx.response().close_modal().toast(message).refresh()
+
+        deleted_in_batch = await query.delete_batch(request, batch_size)
+        deleted += deleted_in_batch
+        await request.state.resource.invalidate_cache(request)
+        if deleted_in_batch < batch_size:
+            return htmx.response().close_modal().toast(_("{count} objects deleted").format(count=deleted)).refresh()
+
+        return render_to_response(
+            request,
+            self.progress_template,
+            {
+                "action": self,
+                "total": total,
+                "deleted": deleted,
+                "percent": min(100, round(deleted * 100 / total)) if total else 100,
+                "next_url": request.url.include_query_params(_total=total, _deleted=deleted),
+                "cancel_url": request.url.include_query_params(_total=total, _deleted=deleted, _cancel=1),
+            },
+        )
+
+
+class ImportForm(wtforms.Form):
+    file = wtforms.FileField(_("File"), validators=[wtforms.validators.data_required()])
+    format = wtforms.SelectField(
+        _("Format"),
+        choices=[("", _("Detect by file extension")), ("csv", "CSV"), ("jsonl", "JSON Lines")],
+        default="",
+    )
+
+
+class ImportResourceAction(actions.NewAction):
+    """
+    Create resource objects from an uploaded CSV or JSON Lines file.
+
+    Column names (or JSON keys) are the names of the resource form fields. The file is read in batches of `batch_size`
+    rows, every row is validated with the create form and valid rows of the batch are saved with one bulk insert.
+    Set `fast` to let the data source use bulk loading (COPY on PostgreSQL with asyncpg), ORM events do not run then.
+    """
+
+    label = _("Import")
+    modal_title = _("Import objects")
+    modal_description = _("Upload a file with one object per row, column names must match the form fields.")
+    ok_button_label = _("Import")
+    form_class = ImportForm
+    template_name = "ohmyadmin/resources/import_action.html"
+    result_template: str = "ohmyadmin/resources/import_result.html"
+    importer_classes: typing.Sequence[type[Importer]] = (CSVImporter, JSONLinesImporter)
+    batch_size: int = 1000
+    fast: bool = False
+    max_displayed_errors: int = 50
+
+    def get_importer_class(self, upload: UploadFile, format: str) -> type[Importer] | None:
+        extension = (upload.filename or "").rpartition(".")[2].lower()
+        for importer_class in self.importer_classes:
+            if importer_class.format == format or (not format and importer_class.file_extension == extension):
+                return importer_class
+        return None
+
+    async def create_form_template(self, request: Request) -> wtforms.Form:
+        """
+        Create and initialize an empty create form, row forms reuse its choices.
+
+        Resource form initializers (like choice loaders) run once per import instead of once per row.
+        """
+        resource: ResourceScreen = request.state.resource
+        form_class = resource.create_form_class or resource.form_class
+        form = form_class()
+        await resource.init_create_form(request, form)
+        return form
+
+    async def create_row_form(
+        self, request: Request, row: typing.Mapping[str, typing.Any], template: wtforms.Form
+    ) -> wtforms.Form:
+        form = type(template)(Importer.to_form_data(row))
+        for name in [name for name in form._fields if name not in template._fields]:
+            del form[name]  # removed by the resource initializer
+
+        template_fields = {field.name: field for field in iterate_form_fields(template)}
+        for field in iterate_form_fields(form):
+            if field.name in template_fields and hasattr(field, "choices") and not isinstance(field, Initable):
+                field.choices = template_fields[field.name].choices
+
+        # initable fields (like autocompletes) depend on the row values
+        await init_form(request, form)
+        return form
+
+    async def import_batch(
+        self,
+        request: Request,
+        rows: typing.Sequence[typing.Mapping[str, typing.Any]],
+        report: ImportReport,
+        template: wtforms.Form,
+    ) -> None:
+        resource: ResourceScreen = request.state.resource
+        assert resource.datasource
+        first_row = report.total + 1
+        report.total += len(rows)
+        forms = [await self.create_row_form(request, row, template) for row in rows]
+        results = await asyncio.gather(*[validate_form(form) for form in forms])
+
+        objects: list[typing.Any] = []
+        row_numbers: list[int] = []
+        for row_number, form, is_valid in zip(range(first_row, report.total + 1), forms, results):
+            if not is_valid:
+                messages = [f"{name}: {', '.join(map(str, errors))}" for name, errors in form.errors.items()]
+                report.add_error(row_number, "; ".join(messages))
+                continue
+
+            obj = await resource.datasource.new()
+            await resource.populate_object(request, form, obj)
+            objects.append(obj)
+            row_numbers.append(row_number)
+
+        try:
+            await resource.datasource.bulk_create(request, objects, batch_size=self.batch_size, fast=self.fast)
+            report.created += len(objects)
+        except DuplicateError as ex:
+            report.created += len(objects) - len(ex.rows)
+            for index in ex.rows:
+                report.add_error(row_numbers[index], _("Duplicate object.", domain="ohmyadmin"))
+
+    async def apply(self, request: Request, object_ids: ObjectIds) -> Response:
+        form_data = await request.form()
+        upload = form_data["file"]
+        assert isinstance(upload, UploadFile)
+        importer_class = self.get_importer_class(upload, str(form_data.get("format", "")))
+        if not importer_class:
+            return htmx.response(400).toast(_("Unsupported file format."), "error")
+
+        report = ImportReport()
+        started_at = time.perf_counter()
+        template = await self.create_form_template(request)
+        try:
+            async for rows in importer_class(upload.file).iter_batches(self.batch_size):
+                await self.import_batch(request, rows, report, template)
+        except ParseError as ex:
+            report.add_error(report.total + 1, str(ex))
+        report.elapsed = time.perf_counter() - started_at
+        if report.created:
+            await request.state.resource.invalidate_cache(request)
+
+        response = render_to_response(
+            request,
+            self.result_template,
+            {"action": self, "report": report, "errors": report.errors[: self.max_displayed_errors]},
+        )
+        return htmx.toast(response, _("{count} objects imported.").format(count=report.created))
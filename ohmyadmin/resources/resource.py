@@ -2,9 +2,11 @@ import typing
 
 import slugify
 import wtforms
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware import Middleware
+from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import JSONResponse, Response
 from starlette.routing import BaseRoute, Mount, Route
 from starlette_babel import gettext_lazy as _
 from starlette_flash import flash
@@ -12,20 +14,31 @@ from starlette_flash import flash
 from ohmyadmin import filters, htmx, metrics, screens
 from ohmyadmin.actions import actions
 from ohmyadmin.breadcrumbs import Breadcrumb
+from ohmyadmin.caching import choices_cache
 from ohmyadmin.components import Component, FormLayoutBuilder
 from ohmyadmin.components.display import DetailView
 from ohmyadmin.components.form import FormView
 from ohmyadmin.components.index import IndexView
-from ohmyadmin.datasources.datasource import DataSource, DuplicateError, InFilter
+from ohmyadmin.datasources.datasource import (
+    DataSource,
+    DuplicateError,
+    InFilter,
+    OrFilter,
+    StringFilter,
+    StringOperation,
+)
 from ohmyadmin.forms.utils import populate_object
 from ohmyadmin.helpers import pluralize, snake_to_sentence
+from ohmyadmin.pagination import CountStrategy, decode_cursor, PaginationMode
 from ohmyadmin.resources.actions import (
     DeleteResourceAction,
     EditResourceAction,
+    ImportResourceAction,
     SubmitActionType,
 )
 from ohmyadmin.resources.policy import AccessPolicy, PermissiveAccessPolicy
 from ohmyadmin.routing import LazyURL
+from ohmyadmin.templating import render_to_response
 from ohmyadmin.screens.base import ExposeViewMiddleware, Screen
 
 
@@ -62,12 +75,21 @@ class ResourceScreen(Screen):
     # actions
     action_classes: typing.Sequence[type[actions.NewAction]] = tuple()
 
+    # import
+    allow_import: typing.ClassVar[bool] = False
+    import_action_class: typing.ClassVar[type[actions.NewAction]] = ImportResourceAction
+
     # index page
     index_view_class: IndexView = IndexView
     page_param: typing.ClassVar[str] = "page"
     page_size_param: typing.ClassVar[str] = "page_size"
     page_size: typing.ClassVar[int] = 25
     page_sizes: typing.ClassVar[typing.Sequence[int]] = [10, 25, 50, 100]
+    pagination_mode: typing.ClassVar[PaginationMode] = "offset"
+    cursor_param: typing.ClassVar[str] = "cursor"
+    count_strategy: typing.ClassVar[CountStrategy] = "exact"
+    count_cap: typing.ClassVar[int] = 10_000
+    streaming: typing.ClassVar[bool] = False
 
     ordering_param: typing.ClassVar[str] = "ordering"
     ordering_fields: typing.Sequence[str] = tuple()
@@ -84,6 +106,12 @@ class ResourceScreen(Screen):
     searchable_fields: typing.Sequence[str] = tuple()
     search_filter: filters.Filter | None = None
 
+    # autocomplete endpoint, used by autocomplete fields and filters of other resources
+    autocomplete_fields: typing.Sequence[str] = tuple()  # defaults to searchable_fields
+    autocomplete_operation: typing.ClassVar[StringOperation] = StringOperation.STARTSWITH
+    autocomplete_page_size: typing.ClassVar[int] = 20
+    autocomplete_template: typing.ClassVar[str] = "ohmyadmin/forms/autocomplete_results.html"
+
     # edit page
     form_class: type[wtforms.Form] = wtforms.Form
     form_view_class: type[FormView] = FormView
@@ -166,6 +194,11 @@ class ResourceScreen(Screen):
                 page_size_param=self.page_size_param,
                 page_size=self.page_size,
                 page_sizes=self.page_sizes,
+                pagination_mode=self.pagination_mode,
+                cursor_param=self.cursor_param,
+                count_strategy=self.count_strategy,
+                count_cap=self.count_cap,
+                streaming=self.streaming,
                 ordering_param=self.ordering_param,
                 ordering_fields=self.ordering_fields,
                 ordering_filter=self.ordering_filter,
@@ -287,6 +320,24 @@ class ResourceScreen(Screen):
     def get_display_page_route(cls, object_id: int) -> LazyURL:
         return LazyURL(cls.get_display_route_name(), path_params=dict(object_id=object_id))
 
+    @classmethod
+    def get_autocomplete_route_name(cls) -> str:
+        return "{url_name}.autocomplete".format(url_name=cls.url_name)
+
+    @classmethod
+    def get_cache_tag(cls) -> str:
+        """Return the fragment cache tag that is invalidated when objects of this resource change."""
+        return cls.get_index_route_name()
+
+    async def invalidate_cache(self, request: Request) -> None:
+        assert self.datasource
+        if fragment_cache := getattr(request.state.ohmyadmin, "fragment_cache", None):
+            if fragment_cache.backend.blocking:
+                await run_in_threadpool(fragment_cache.invalidate, self.get_cache_tag())
+            else:
+                fragment_cache.invalidate(self.get_cache_tag())
+        choices_cache.invalidate(*self.datasource.get_cache_tags())
+
     @classmethod
     def get_action_route(
         cls, action: type[actions.NewAction], object_ids: typing.Sequence[str] | None = None
@@ -299,7 +350,10 @@ class ResourceScreen(Screen):
         )
 
     def get_action_classes(self) -> list[type[actions.NewAction]]:
-        return self.action_classes or []
+        action_classes = list(self.action_classes or [])
+        if self.allow_import:
+            action_classes.append(self.import_action_class)
+        return action_classes
 
     def get_action_class(self, action_id: str) -> type[actions.NewAction]:
         for action in self.get_action_classes():
@@ -332,6 +386,7 @@ class ResourceScreen(Screen):
                 Route(
                     "/actions/{action_id}", self.action_view, name="ohmyadmin.resource.action", methods=["get", "post"]
                 ),
+                Route("/autocomplete", self.autocomplete_view, name=self.get_autocomplete_route_name()),
                 self.index_screen.get_route(),
             ],
             middleware=[Middleware(ExposeViewMiddleware, screen=self, resource=self)],
@@ -356,6 +411,61 @@ class ResourceScreen(Screen):
         object_ids = request.query_params.getlist("object_id")
         return await action.dispatch(request, object_ids)
 
+    def get_autocomplete_label(self, obj: typing.Any) -> str:
+        return str(obj)
+
+    async def get_autocomplete_choices(
+        self, request: Request, values: typing.Sequence[typing.Any]
+    ) -> list[tuple[str, str]]:
+        """Return (value, label) pairs of the objects with the given primary keys, in the order of the keys."""
+        assert self.datasource
+        pk_field = self.datasource.get_id_field()
+        page = await self.datasource.filter(InFilter(pk_field, list(values))).paginate(
+            request, page=1, page_size=len(values), count_strategy="none"
+        )
+        labels = {self.datasource.get_pk(obj): self.get_autocomplete_label(obj) for obj in page.rows}
+        return [(str(value), labels[str(value)]) for value in values if str(value) in labels]
+
+    async def autocomplete_view(self, request: Request) -> Response:
+        """
+        Search objects for autocomplete fields.
+
+        The search term ("q" query param) is matched against `autocomplete_fields` with `autocomplete_operation`,
+        results are paged by keyset, the next page is requested with the "cursor" param.
+        Returns JSON unless the request is made by HTMX.
+        """
+        assert self.datasource
+        if not self.access_policy.can_list(request):
+            raise HTTPException(403)
+
+        datasource = self.datasource
+        fields = self.autocomplete_fields or self.searchable_fields
+        if fields and (term := request.query_params.get("q", "").strip()):
+            datasource = datasource.filter(
+                OrFilter(
+                    [
+                        StringFilter(field, term, predicate=self.autocomplete_operation, case_insensitive=True)
+                        for field in fields
+                    ]
+                )
+            )
+        if fields:
+            datasource = datasource.order_by({fields[0]: "asc"})
+
+        cursor = decode_cursor(request.query_params.get("cursor", ""))
+        page = await datasource.paginate_by_cursor(request, cursor, self.autocomplete_page_size)
+        choices = [(self.datasource.get_pk(obj), self.get_autocomplete_label(obj)) for obj in page]
+        if htmx.is_htmx_request(request):
+            next_url = request.url.include_query_params(cursor=page.next_cursor) if page.next_cursor else None
+            return render_to_response(request, self.autocomplete_template, {"choices": choices, "next_url": next_url})
+
+        return JSONResponse(
+            {
+                "results": [{"value": value, "label": label} for value, label in choices],
+                "next_cursor": page.next_cursor,
+            }
+        )
+
     async def init_form(self, request: Request, form: wtforms.Form) -> None:
         pass
 
@@ -382,6 +492,7 @@ class ResourceScreen(Screen):
         try:
             await self.populate_object(request, form, model)
             await self.datasource.create(request, model)
+            await self.invalidate_cache(request)
         except DuplicateError:
             message = _("Duplicate resource. There is another {label} like this already.", domain="ohmyadmin").format(
                 label=self.label.lower(),
@@ -402,6 +513,7 @@ class ResourceScreen(Screen):
     async def perform_update(self, request: Request, form: wtforms.Form, model: object) -> Response:
         await self.populate_object(request, form, model)
         await self.datasource.update(request, model)
+        await self.invalidate_cache(request)
 
         toast_message = self.update_message.format(object=model, label=self.label, label_plural=self.label_plural)
         response = htmx.response()
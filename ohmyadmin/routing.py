@@ -1,15 +1,139 @@
 from __future__ import annotations
 
 import typing
+from urllib.parse import urlencode
 
-from starlette.datastructures import URL
+from starlette.convertors import Convertor
+from starlette.datastructures import URL, URLPath
 from starlette.requests import Request
+from starlette.routing import (
+    BaseRoute,
+    get_route_path,
+    Match,
+    Mount,
+    NoMatchFound,
+    replace_params,
+    Route,
+    WebSocketRoute,
+)
+from starlette.types import Receive, Scope, Send
 
 
 class URLProvider(typing.Protocol):
     url_name: str
 
 
+class PrefixDispatcher(BaseRoute):
+    """
+    Dispatches requests to mounts by the first two segments of the path with a dict lookup.
+
+    Mount paths must be static and consist of two segments, like "/group/view".
+    A router tries its routes one by one, this route replaces a list of such mounts so the cost of matching
+    does not grow with the number of mounts. When mounts share a path, the first one wins, like in a router.
+    """
+
+    def __init__(self, mounts: typing.Iterable[Mount]) -> None:
+        self.mounts: dict[str, Mount] = {}
+        for mount in mounts:
+            self.mounts.setdefault(mount.path, mount)
+
+    @property
+    def routes(self) -> list[Mount]:
+        return list(self.mounts.values())
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+
+        # "/group/view/rest" -> ["", "group", "view", "rest"]
+        segments = get_route_path(scope).split("/", 3)
+        if len(segments) < 4 or (mount := self.mounts.get(f"/{segments[1]}/{segments[2]}")) is None:
+            return Match.NONE, {}
+        return mount.matches(scope)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # the matched mount stores its app as the endpoint of the child scope
+        await scope["endpoint"](scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
+        for mount in self.mounts.values():
+            try:
+                return mount.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+
+class URLIndex:
+    """
+    Maps route names to path templates so URLs are reversed without walking the tree of mounts.
+
+    It indexes plain routes and mounts, routes that cannot be indexed (like Host) are reversed by Starlette.
+    Paths are relative to the router the index is built for.
+    """
+
+    def __init__(self, routes: typing.Iterable[BaseRoute]) -> None:
+        # route name -> (path template, param convertors, whether it is a named mount with a "path" param)
+        self._templates: dict[str, list[tuple[str, dict[str, Convertor[typing.Any]], bool]]] = {}
+        self._add_routes(routes, prefix="", convertors={}, name_prefix="")
+
+    def _add(self, name: str, template: str, convertors: dict[str, Convertor[typing.Any]], is_mount: bool) -> None:
+        self._templates.setdefault(name, []).append((template, convertors, is_mount))
+
+    def _add_routes(
+        self,
+        routes: typing.Iterable[BaseRoute],
+        prefix: str,
+        convertors: dict[str, Convertor[typing.Any]],
+        name_prefix: str,
+    ) -> None:
+        for route in routes:
+            if isinstance(route, (Route, WebSocketRoute)):
+                path_format = prefix + route.path_format
+                self._add(name_prefix + route.name, path_format, convertors | route.param_convertors, False)
+            elif isinstance(route, Mount):
+                # mirror Mount.url_path_for: the prefix is the mount path without the trailing slash
+                mount_prefix = prefix + route.path_format.removesuffix("{path}").rstrip("/")
+                mount_convertors = convertors | route.param_convertors
+                if route.name:
+                    self._add(name_prefix + route.name, prefix + route.path_format, mount_convertors, True)
+                mount_convertors = {key: value for key, value in mount_convertors.items() if key != "path"}
+                child_name_prefix = f"{name_prefix}{route.name}:" if route.name else name_prefix
+                self._add_routes(route.routes, mount_prefix, mount_convertors, child_name_prefix)
+            elif isinstance(route, PrefixDispatcher):
+                self._add_routes(route.routes, prefix, convertors, name_prefix)
+
+    def url_path_for(self, name: str, path_params: typing.Mapping[str, typing.Any]) -> str | None:
+        """Return the path for the route or None if the route is not in the index."""
+        for template, convertors, is_mount in self._templates.get(name, ()):
+            if path_params.keys() != convertors.keys():
+                continue
+            if not path_params:
+                return template
+
+            params = dict(path_params)
+            if is_mount:
+                params["path"] = str(params["path"]).lstrip("/")
+            path, _ = replace_params(template, convertors, params)
+            return path
+        return None
+
+
+def url_for(request: Request, name: str, /, **path_params: typing.Any) -> URL:
+    """
+    Reverse a route name using the admin URL index.
+
+    Names that are not admin routes (or requests that did not pass through the admin) are reversed by Starlette.
+    """
+    admin = getattr(request.state, "ohmyadmin", None)
+    root_path = request.scope.get("ohmyadmin_root_path")
+    if admin is None or root_path is None or (path := admin.url_index.url_path_for(name, path_params)) is None:
+        return request.url_for(name, **path_params)
+
+    base_url = request.base_url
+    return URL(f"{base_url.scheme}://{base_url.netloc}{root_path}{path}")
+
+
 class LazyURL:
     def __init__(
         self,
@@ -22,15 +146,17 @@ class LazyURL:
         self.path_params = path_params or {}
 
     def resolve(self, request: Request) -> URL:
-        url = request.url_for(self.route_name, **self.path_params)
+        url = url_for(request, self.route_name, **self.path_params)
+        if not self.query_params:
+            return url
+
+        query: list[tuple[str, typing.Any]] = []
         for query_param, value in self.query_params.items():
             if isinstance(value, (list, tuple, set)):
-                for subvalue in value:
-                    url = url.include_query_params(**{query_param: subvalue})
+                query.extend((query_param, subvalue) for subvalue in value)
             else:
-                url = url.include_query_params(**{query_param: value})
-
-        return url
+                query.append((query_param, value))
+        return url.replace(query=urlencode(query)) if query else url
 
 
 def url_to(screen: URLProvider, **params: typing.Any) -> LazyURL:
@@ -13,6 +13,7 @@ from ohmyadmin import metrics
 from ohmyadmin.actions import actions
 from ohmyadmin.breadcrumbs import Breadcrumb
 from ohmyadmin.components.base import Component, PageToolbar
+from ohmyadmin.routing import url_for
 
 
 class Screen(abc.ABC):
@@ -36,7 +37,7 @@ class Screen(abc.ABC):
         return f"ohmyadmin.screen.{slug}"
 
     def get_url(self, request: Request) -> URL:
-        return request.url_for(self.url_name)
+        return url_for(request, self.url_name)
 
     def get_action_route_name(self, action: actions.Action) -> str:
         return f"{self.url_name}.actions.{action.slug}"
@@ -74,8 +75,6 @@ class ExposeViewMiddleware:
         self.variables = variables
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        request = Request(scope, receive, send)
-        for name, value in self.variables.items():
-            setattr(request.state, name, value)
-
+        # the same dict backs request.state
+        scope.setdefault("state", {}).update(self.variables)
         await self.app(scope, receive, send)
@@ -1,16 +1,29 @@
 import typing
 
+import slugify
+from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import BaseRoute, Mount, Route
 from starlette_babel import gettext_lazy as _
 
 from ohmyadmin import htmx
 from ohmyadmin.actions.actions import Action, ModalAction
 from ohmyadmin.components.index import IndexView
 from ohmyadmin.datasources.datasource import DataSource
-from ohmyadmin.filters import Filter, OrderingFilter, SearchFilter
-from ohmyadmin.pagination import get_page_size_value, get_page_value
-from ohmyadmin.templating import render_to_response
+from ohmyadmin.display_fields import DisplayField
+from ohmyadmin.exporters import CSVExporter, Exporter, JSONLinesExporter, XLSXExporter
+from ohmyadmin.filters import evaluate_filters, Filter, FilterState, OrderingFilter, SearchFilter
+from ohmyadmin.pagination import (
+    CountStrategy,
+    CursorPagination,
+    get_cursor_value,
+    get_page_size_value,
+    get_page_value,
+    Pagination,
+    PaginationMode,
+)
+from ohmyadmin.templating import render_to_response, stream_to_response
 from ohmyadmin.screens.base import Screen
 
 
@@ -22,6 +35,18 @@ class IndexScreen(Screen):
     page_size: typing.ClassVar[int] = 25
     page_sizes: typing.ClassVar[typing.Sequence[int]] = [10, 25, 50, 100]
 
+    # "keyset" navigates with opaque cursors instead of page numbers, deep pages cost the same as the first one
+    pagination_mode: typing.ClassVar[PaginationMode] = "offset"
+    cursor_param: typing.ClassVar[str] = "cursor"
+
+    # how the total row count is computed for offset pagination, see CountStrategy
+    count_strategy: typing.ClassVar[CountStrategy] = "exact"
+    count_cap: typing.ClassVar[int] = 10_000
+
+    # formats the filtered rows can be downloaded in, see ExportAction
+    export_formats: typing.ClassVar[typing.Sequence[type[Exporter]]] = (CSVExporter, JSONLinesExporter, XLSXExporter)
+    export_batch_size: typing.ClassVar[int] = 1000
+
     filters: typing.Sequence[Filter] = tuple()
     batch_actions: typing.Sequence[ModalAction] = tuple()
 
@@ -35,6 +60,9 @@ class IndexScreen(Screen):
     ordering_fields: typing.Sequence[str] = tuple()
     ordering_filter: Filter | None = None
 
+    # send the page shell (layout, menu, filters) before the table is rendered, see stream_to_response
+    streaming: typing.ClassVar[bool] = False
+
     view_class: IndexView = IndexView
     template: str = "ohmyadmin/screens/index/page.html"
     content_template: str = "ohmyadmin/screens/index/content.html"
@@ -57,6 +85,15 @@ class IndexScreen(Screen):
         assert self.datasource, "No data source configured."
         return self.datasource.get_query_for_list()
 
+    def apply_projection(self, request: Request, query: DataSource) -> DataSource:
+        """
+        Narrow the query that loads the listed rows.
+
+        It is applied only when rendering the list, `get_query` is shared with exports and batch actions,
+        which may read any attribute.
+        """
+        return query
+
     def get_ordering_param(self) -> str:
         return self.ordering_param
 
@@ -66,18 +103,58 @@ class IndexScreen(Screen):
     def get_ordering_fields(self) -> typing.Sequence[str]:
         return self.ordering_fields
 
+    async def get_filter_states(self, request: Request) -> list[FilterState]:
+        """Return states of the page filters, see evaluate_filters."""
+        return await evaluate_filters(request, self.filters)
+
     async def apply_filters(self, request: Request, query: DataSource) -> DataSource:
-        filters = [self.search_filter, self.ordering_filter, *self.filters]
+        filters = [f for f in [self.search_filter, self.ordering_filter, *self.filters] if f is not None]
 
-        for filter_ in filters:
-            filter_form = await filter_.get_form(request)
-            query = filter_.apply(request, query, filter_form)
+        for state in await evaluate_filters(request, filters):
+            query = state.filter.apply(request, query, state.form)
         return query
 
+    def get_export_fields(self) -> typing.Sequence[DisplayField]:
+        return []
+
+    def get_export_route_name(self) -> str:
+        return f"{self.url_name}.export"
+
+    async def export(self, request: Request) -> Response:
+        """Stream all rows matching the current filters and ordering in the requested format."""
+        exporter_class = next((e for e in self.export_formats if e.format == request.path_params["format"]), None)
+        if exporter_class is None:
+            raise HTTPException(404, "Unsupported export format.")
+
+        query = self.get_query(request)
+        query = await self.apply_filters(request, query)
+        exporter = exporter_class(self.get_export_fields())
+        filename = "{name}.{extension}".format(
+            name=slugify.slugify(str(self.label)) or "export", extension=exporter.file_extension
+        )
+        return StreamingResponse(
+            exporter.export(query.stream(request, self.export_batch_size)),
+            media_type=exporter.media_type,
+            headers={"content-disposition": f'attachment; filename="{filename}"'},
+        )
+
+    def get_route(self) -> BaseRoute:
+        return Mount(
+            "",
+            routes=[
+                Route("/export/{format}", self.export, name=self.get_export_route_name()),
+                super().get_route(),
+            ],
+        )
+
     def render_content(self, request: Request, context: typing.Mapping[str, typing.Any]) -> Response:
+        if self.streaming:
+            return stream_to_response(request, self.content_template, context)
         return render_to_response(request, self.content_template, context)
 
     def render_page(self, request: Request, context: typing.Mapping[str, typing.Any]) -> Response:
+        if self.streaming:
+            return stream_to_response(request, self.template, context)
         return render_to_response(request, self.template, context)
 
     async def dispatch(self, request: Request) -> Response:
@@ -85,9 +162,16 @@ class IndexScreen(Screen):
         page_size = get_page_size_value(request, self.page_size_param, max(self.page_sizes), self.page_size)
         query = self.get_query(request)
         query = await self.apply_filters(request, query)
-        models = await query.paginate(request, page, page_size)
-        should_refresh_filters = htmx.matches_target(request, "datatable") and any(
-            ["x-ohmyadmin-force-filter-refresh" in request.headers, any([f.is_active(request) for f in self.filters])]
+        query = self.apply_projection(request, query)
+        models: Pagination | CursorPagination
+        if self.pagination_mode == "keyset":
+            cursor = get_cursor_value(request, self.cursor_param)
+            models = await query.paginate_by_cursor(request, cursor, page_size)
+        else:
+            models = await query.paginate(request, page, page_size, self.count_strategy, self.count_cap)
+        filter_states = await self.get_filter_states(request)
+        should_refresh_filters = htmx.matches_target(request, "datatable") and (
+            "x-ohmyadmin-force-filter-refresh" in request.headers or any(state.active for state in filter_states)
         )
 
         component = self.view_class(models)
@@ -100,14 +184,15 @@ class IndexScreen(Screen):
                     "screen": self,
                     "models": models,
                     "oob_filters": should_refresh_filters,
+                    "filter_states": filter_states,
                 },
             )
 
         # clean url from unused filters
         push_url = request.url
-        for filter_ in self.filters:
-            if not filter_.is_active(request):
-                push_url = push_url.remove_query_params([f.name for f in filter_.form])
+        for state in filter_states:
+            if not state.active:
+                push_url = push_url.remove_query_params([field.name for field in state.form])
         if not request.query_params.get(self.search_param):
             push_url = push_url.remove_query_params(self.search_param)
         setattr(request, "_url", push_url)  # TODO: fixme
@@ -122,6 +207,7 @@ class IndexScreen(Screen):
                 "page_title": self.label,
                 "page_description": self.description,
                 "oob_filters": should_refresh_filters,
+                "filter_states": filter_states,
                 "search_term": request.query_params.get(self.search_param, ""),
             },
         )
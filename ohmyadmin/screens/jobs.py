@@ -0,0 +1,5 @@
+from ohmyadmin.screens.base import Screen
+
+
+class JobScreen(Screen):
+    """The screen the job status page is rendered for, it is not mounted as a route."""
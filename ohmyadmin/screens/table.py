@@ -1,5 +1,8 @@
 import typing
 
+from starlette.requests import Request
+
+from ohmyadmin.datasources.datasource import DataSource
 from ohmyadmin.screens.index import IndexScreen
 from ohmyadmin.views.base import IndexView
 from ohmyadmin.views.table import TableView
@@ -9,5 +12,42 @@ from ohmyadmin.display_fields import DisplayField
 class TableScreen(IndexScreen):
     columns: typing.Sequence[DisplayField] = tuple()
 
+    # load only the model fields the columns read, off by default because row actions, labels
+    # and value getters may read other attributes which would lazy load under an async session
+    project_columns: bool = False
+
+    # extra model fields to load when projecting, for example those row actions or __str__ read
+    projection_fields: typing.Sequence[str] = tuple()
+
     def get_view(self) -> IndexView:
         return TableView(columns=self.columns)
+
+    def get_export_fields(self) -> typing.Sequence[DisplayField]:
+        return self.columns
+
+    def get_projection(self) -> typing.Sequence[str] | None:
+        """
+        Return model fields to load for the list or None to load whole rows.
+
+        Projection applies only when `project_columns` is set and every column declares what it reads.
+        The primary key is always loaded.
+        """
+        if not self.project_columns or not self.columns:
+            return None
+
+        fields: list[str] = list(self.projection_fields)
+        for column in self.columns:
+            if column.source_fields is None:
+                return None
+            fields.extend(column.source_fields)
+        return fields
+
+    def get_query(self, request: Request) -> DataSource:
+        # relations the columns read are eager loaded for every caller, this does not limit loaded columns
+        query = super().get_query(request)
+        return query.prefetch([field for column in self.columns for field in column.source_fields or []])
+
+    def apply_projection(self, request: Request, query: DataSource) -> DataSource:
+        if (fields := self.get_projection()) is not None:
+            return query.only(fields)
+        return query
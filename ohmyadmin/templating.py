@@ -1,17 +1,23 @@
 import functools
+import os
 import time
 import typing
 
 import jinja2
 import markupsafe
 from markupsafe import Markup
+from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import URL
 from starlette.requests import Request
-from starlette.responses import HTMLResponse
+from starlette.responses import HTMLResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from starlette_babel.contrib.jinja import configure_jinja_env
+
+from ohmyadmin.routing import url_for
 
 
 def static_url(request: Request, path: str) -> str:
-    url = request.url_for("ohmyadmin.static", path=path)
+    url = url_for(request, "ohmyadmin.static", path=path)
     if request.app.debug:
         url = url.include_query_params(_ts=time.time())
     return str(url)
@@ -21,7 +27,12 @@ def media_url(request: Request, path: str) -> URL:
     if path.startswith("http"):
         return URL(path)
 
-    return request.url_for("ohmyadmin.media", path=path)
+    return url_for(request, "ohmyadmin.media", path=path)
+
+
+@jinja2.pass_context
+def template_url_for(context: jinja2.runtime.Context, name: str, /, **path_params: typing.Any) -> URL:
+    return url_for(context["request"], name, **path_params)
 
 
 def url_matches(request: Request, url: URL | str) -> bool:
@@ -68,7 +79,40 @@ def to_html_attrs(attrs: typing.Mapping[str, typing.Any]) -> str:
         else:
             parts.append(f'{key}="{markupsafe.escape(value)}"')
 
-    return ' '.join(parts).strip()
+    return " ".join(parts).strip()
+
+
+class ThreadedTemplateResponse(HTMLResponse):
+    """
+    Render the template in a worker thread when the response is sent.
+
+    The body is empty until then. Used when the fragment cache backend is blocking,
+    so reads of cached components do not hold the event loop.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        name: str,
+        context: typing.Mapping[str, typing.Any] | None = None,
+        status_code: int = 200,
+        headers: typing.Mapping[str, str] | None = None,
+    ) -> None:
+        self.request = request
+        self.name = name
+        self.context = context
+        super().__init__(status_code=status_code, headers=headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = await run_in_threadpool(
+            self.request.state.ohmyadmin.templating.TemplateResponse,
+            self.request,
+            self.name,
+            context=self.context,
+        )
+        self.body = response.body
+        self.headers["content-length"] = str(len(self.body))
+        await super().__call__(scope, receive, send)
 
 
 def render_to_response(
@@ -78,6 +122,10 @@ def render_to_response(
     status_code: int = 200,
     headers: typing.Mapping[str, str] | None = None,
 ) -> HTMLResponse:
+    fragment_cache = getattr(request.state.ohmyadmin, "fragment_cache", None)
+    if fragment_cache is not None and fragment_cache.backend.blocking:
+        return ThreadedTemplateResponse(request, name, context=context, status_code=status_code, headers=headers)
+
     return request.state.ohmyadmin.templating.TemplateResponse(
         request,
         name,
@@ -87,7 +135,33 @@ def render_to_response(
     )
 
 
-def render_to_string(request: Request, name: str, context: typing.Mapping[str, typing.Any] | None = None) -> str:
+def stream_to_response(
+    request: Request,
+    name: str,
+    context: typing.Mapping[str, typing.Any] | None = None,
+    status_code: int = 200,
+    headers: typing.Mapping[str, str] | None = None,
+    buffer_size: int = 64,
+) -> StreamingResponse:
+    """
+    Render the template while the response is being sent.
+
+    Output is flushed every `buffer_size` template chunks, so the beginning of the page reaches the browser
+    before the rest is rendered. Errors raised during rendering cannot change the response status anymore,
+    the browser receives a truncated page.
+    """
+    templating = request.state.ohmyadmin.templating
+    context = dict(context or {})
+    context.setdefault("request", request)
+    for context_processor in templating.context_processors:
+        context.update(context_processor(request))
+
+    stream = templating.get_template(name).stream(context)
+    stream.enable_buffering(buffer_size)
+    return StreamingResponse(stream, status_code=status_code, headers=headers, media_type="text/html")
+
+
+def _get_render_context(request: Request, context: typing.Mapping[str, typing.Any] | None) -> dict[str, typing.Any]:
     context = dict(context or {})
     context.update(
         {
@@ -96,5 +170,81 @@ def render_to_string(request: Request, name: str, context: typing.Mapping[str, t
             "static_url": functools.partial(static_url, request),
         }
     )
-    content = request.state.ohmyadmin.templating.env.get_template(name).render(context)
+    return context
+
+
+def render_to_string(request: Request, name: str, context: typing.Mapping[str, typing.Any] | None = None) -> str:
+    content = request.state.ohmyadmin.templating.env.get_template(name).render(_get_render_context(request, context))
     return Markup(content)
+
+
+def render_to_stream(
+    request: Request, name: str, context: typing.Mapping[str, typing.Any] | None = None
+) -> typing.Iterator[str]:
+    """Like render_to_string, but yield the output in pieces as the template produces them."""
+    template = request.state.ohmyadmin.templating.env.get_template(name)
+    for chunk in template.generate(_get_render_context(request, context)):
+        yield Markup(chunk)
+
+
+class MemoryBytecodeCache(jinja2.BytecodeCache):
+    """
+    Keeps compiled templates in memory.
+
+    It helps when several environments of one process load the same templates (tests, multiple admin instances),
+    use `jinja2.FileSystemBytecodeCache` to share compiled templates between processes and restarts.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[str, bytes] = {}
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        if code := self._cache.get(bucket.key):
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        self._cache[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def create_jinja_env(
+    template_dir: str | os.PathLike | None = None,
+    template_package: str | None = None,
+    bytecode_cache: jinja2.BytecodeCache | None = None,
+) -> jinja2.Environment:
+    jinja_loaders: list[jinja2.BaseLoader] = [jinja2.PackageLoader("ohmyadmin")]
+    if template_dir:
+        jinja_loaders.append(jinja2.FileSystemLoader(template_dir))
+    if template_package:
+        jinja_loaders.append(jinja2.PackageLoader(template_package))
+
+    jinja_env = jinja2.Environment(
+        autoescape=True,
+        undefined=jinja2.StrictUndefined,
+        extensions=["jinja2.ext.do"],
+        loader=jinja2.ChoiceLoader(jinja_loaders),
+        bytecode_cache=bytecode_cache,
+    )
+    jinja_env.filters.update({"object_id": id, "model_pk": model_pk, "to_html_attrs": to_html_attrs})
+    jinja_env.globals["url_for"] = template_url_for
+    configure_jinja_env(jinja_env)
+    return jinja_env
+
+
+def precompile_templates(jinja_env: jinja2.Environment) -> dict[str, Exception]:
+    """
+    Compile every template known to the environment loaders.
+
+    Compiled templates are kept in the environment cache and stored into its bytecode cache, if any,
+    so the first requests do not pay for compilation. Returns compilation errors by template name,
+    templates that fail to compile are skipped and fail again when rendered.
+    """
+    errors: dict[str, Exception] = {}
+    for name in jinja_env.list_templates():
+        try:
+            jinja_env.get_template(name)
+        except jinja2.TemplateError as ex:
+            errors[name] = ex
+    return errors
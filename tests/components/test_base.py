@@ -3,7 +3,7 @@ import pathlib
 import pytest
 from starlette.requests import Request
 
-from ohmyadmin.components import Builder, Component, ComposeComponent, When
+from ohmyadmin.components import Builder, Cached, Component, ComposeComponent, When
 
 
 class WorldComponent(Component):
@@ -63,3 +63,35 @@ def test_when(template_dir: pathlib.Path, http_get: Request, expression: bool, e
         when_false=TwoComponents(),
     )
     assert component.render(http_get) == expected
+
+
+class CountingComponent(Component):
+    renders = 0
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def render(self, request: Request) -> str:
+        CountingComponent.renders += 1
+        return f"<b>{self.name}</b>"
+
+    def cache_key(self, request: Request) -> str | None:
+        return self.name
+
+
+def test_cached_component(http_get: Request) -> None:
+    CountingComponent.renders = 0
+    assert Cached(CountingComponent("a"), tags=["users"]).render(http_get) == "<b>a</b>"
+    assert Cached(CountingComponent("a"), tags=["users"]).render(http_get) == "<b>a</b>"
+    assert Cached(CountingComponent("b"), key="explicit").render(http_get) == "<b>b</b>"
+    assert CountingComponent.renders == 2
+
+    http_get.state.ohmyadmin.fragment_cache.invalidate("users")
+    Cached(CountingComponent("a"), tags=["users"]).render(http_get)
+    assert CountingComponent.renders == 3
+
+
+def test_cached_component_without_key(template_dir: pathlib.Path, http_get: Request) -> None:
+    (template_dir / "world.html").write_text("world")
+    assert Cached(WorldComponent()).render(http_get) == "world"
+    assert len(http_get.state.ohmyadmin.fragment_cache.backend) == 0
@@ -0,0 +1,96 @@
+import dataclasses
+import pathlib
+import re
+
+from starlette.requests import Request
+
+from ohmyadmin.components import (
+    Badge,
+    BadgeColor,
+    BoolValue,
+    Component,
+    Link,
+    Table,
+    TableColumn,
+    TableHeadCell,
+    TableRow,
+    Text,
+)
+
+
+@dataclasses.dataclass
+class Order:
+    id: int
+    number: str
+    status: str
+    paid: bool
+
+
+class Custom(Component):
+    template_name = "custom.html"
+
+
+def build_row(order: Order) -> TableRow[TableColumn]:
+    return TableRow(
+        children=[
+            TableColumn(Link(f"/orders/{order.id}", text=order.number)),
+            TableColumn(Text(f"<{order.number}>"), colspan=2),
+            TableColumn(Badge(order.status, {"new": BadgeColor.BLUE})),
+            TableColumn(BoolValue(order.paid, as_text=False)),
+            TableColumn(Custom()),
+        ]
+    )
+
+
+def normalize(html: str) -> str:
+    return re.sub(r"\s*(<|>)\s*", r"\1", str(html))
+
+
+def test_compiled_table_renders_like_components(template_dir: pathlib.Path, http_get: Request) -> None:
+    (template_dir / "custom.html").write_text("custom")
+    orders = [Order(1, "N1", "new", True), Order(2, "N2", "paid", False)]
+    header = TableRow(children=[TableHeadCell("Number")])
+
+    html = Table(orders, header=header, row_builder=build_row).render(http_get)
+    compiled_html = Table(orders, header=header, row_builder=build_row, compiled=True).render(http_get)
+    assert normalize(compiled_html) == normalize(html)
+    assert "&lt;N1&gt;" in compiled_html
+    assert "custom" in compiled_html
+
+
+class HighlightedRow(TableRow[TableColumn]):
+    template_name = "highlighted_row.html"
+
+
+class WideColumn(TableColumn):
+    template_name = "wide_cell.html"
+
+
+def test_compiled_table_renders_subclasses_with_own_templates(template_dir: pathlib.Path, http_get: Request) -> None:
+    (template_dir / "highlighted_row.html").write_text('<tr class="highlighted">{{ component.children|length }}</tr>')
+    (template_dir / "wide_cell.html").write_text('<td class="wide">{{ component.child.text }}</td>')
+    orders = [Order(1, "N1", "new", True), Order(2, "N2", "paid", False)]
+    header = TableRow(children=[TableHeadCell("Number")])
+
+    def build_custom_row(order: Order) -> TableRow[TableColumn]:
+        if order.paid:
+            return HighlightedRow(children=[TableColumn(Text(order.number))])
+        return TableRow(children=[WideColumn(Text(order.number)), TableColumn(Text(order.status))])
+
+    html = Table(orders, header=header, row_builder=build_custom_row).render(http_get)
+    compiled_html = Table(orders, header=header, row_builder=build_custom_row, compiled=True).render(http_get)
+    assert normalize(compiled_html) == normalize(html)
+    assert '<tr class="highlighted">1</tr>' in compiled_html
+    assert '<td class="wide">N2</td>' in compiled_html
+
+
+def test_table_renders_rows_in_separate_chunks(template_dir: pathlib.Path, http_get: Request) -> None:
+    (template_dir / "custom.html").write_text("custom")
+    orders = [Order(1, "N1", "new", True), Order(2, "N2", "paid", False)]
+    header = TableRow(children=[TableHeadCell("Number")])
+
+    for compiled in [False, True]:
+        table = Table(orders, header=header, row_builder=build_row, compiled=compiled)
+        chunks = list(table.render_stream(http_get))
+        assert "".join(chunks) == table.render(http_get)
+        assert next(i for i, c in enumerate(chunks) if "N1" in c) < next(i for i, c in enumerate(chunks) if "N2" in c)
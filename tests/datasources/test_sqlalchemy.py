@@ -0,0 +1,617 @@
+import asyncio
+import datetime
+import sqlite3
+import types
+import typing
+import warnings
+from unittest import mock
+
+import pytest
+import sqlalchemy as sa
+import wtforms
+from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncConnection, create_async_engine
+from starlette.requests import Request
+from starlette.types import Receive, Scope, Send
+
+from ohmyadmin.caching import choices_cache
+from ohmyadmin.datasources.datasource import DuplicateError, InFilter, OrFilter, StringFilter, StringOperation
+from ohmyadmin.datasources.sqlalchemy import (
+    CountExecution,
+    form_choices_from,
+    get_filter_shape,
+    has_joined_collections,
+    LazyLoadDetectorMiddleware,
+    LazyLoadWarning,
+    get_model_metadata,
+    load_choices,
+    SADataSource,
+    statement_cache,
+    StatementCache,
+)
+from ohmyadmin.forms.utils import init_concurrently
+from ohmyadmin.pagination import decode_cursor
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str]
+    orders: orm.Mapped[list["Order"]] = orm.relationship(back_populates="customer")
+
+
+class Order(Base):
+    __tablename__ = "orders"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    number: orm.Mapped[str] = orm.mapped_column(unique=True)
+    notes: orm.Mapped[str] = orm.mapped_column(sa.Text)
+    priority: orm.Mapped[int | None]
+    customer_id: orm.Mapped[int] = orm.mapped_column(sa.ForeignKey("customers.id"))
+    customer: orm.Mapped[Customer] = orm.relationship(back_populates="orders")
+
+
+class Event(Base):
+    __tablename__ = "events"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str]
+    status: orm.Mapped[str] = orm.mapped_column(default="new")
+    created_at: orm.Mapped[datetime.datetime] = orm.mapped_column(default=lambda: datetime.datetime(2026, 1, 1))
+
+
+def compile_query(datasource: SADataSource) -> str:
+    return str(datasource._stmt.compile()).replace("\n", "")
+
+
+def test_model_metadata_is_shared() -> None:
+    assert get_model_metadata(Order) is get_model_metadata(Order)
+    assert SADataSource(Order).metadata is SADataSource(Order).order_by({"number": "asc"}).metadata
+
+
+def test_model_metadata() -> None:
+    metadata = get_model_metadata(Order)
+    assert metadata.pk_field == "id"
+    assert metadata.get_caster("id") is int
+    assert metadata.get_relation_path("customer.name") == ["customer"]
+    assert metadata.is_sortable("number")
+    assert metadata.is_sortable("customer.name")
+    assert not metadata.is_sortable("unknown")
+    assert not get_model_metadata(Customer).is_sortable("orders.number")
+
+
+def test_order_by_related_field_uses_subquery() -> None:
+    sql = compile_query(SADataSource(Order).order_by({"customer.name": "desc"}))
+    assert "ORDER BY (SELECT customers.name FROM customers WHERE customers.id = orders.customer_id) DESC" in sql
+
+
+def test_order_by_joined_related_field() -> None:
+    datasource = SADataSource(Order, query=sa.select(Order).join(Order.customer))
+    assert compile_query(datasource.order_by({"customer.name": "asc"})).endswith("ORDER BY customers.name ASC")
+
+
+def test_filter_by_related_field_uses_exists() -> None:
+    datasource = SADataSource(Order).filter(StringFilter("customer.name", "john", StringOperation.EXACT))
+    assert "WHERE EXISTS (SELECT 1 FROM customers" in compile_query(datasource)
+
+
+def test_only() -> None:
+    sql = compile_query(SADataSource(Order).only(["number", "customer.name"]))
+    assert sql.startswith(
+        "SELECT orders.id, orders.number, orders.customer_id, customers_1.id AS id_1, customers_1.name"
+    )
+    assert "notes" not in sql
+
+
+def test_only_ignores_unknown_fields() -> None:
+    datasource = SADataSource(Order)
+    assert datasource.only(["number", "total"]) is datasource
+
+
+def test_prefetch() -> None:
+    sql = compile_query(SADataSource(Order).prefetch(["customer.name"]))
+    assert "LEFT OUTER JOIN customers AS customers_1" in sql
+
+
+def test_filters_and_ordering_are_applied_in_one_statement() -> None:
+    datasource = SADataSource(Order, query=sa.select(Order).order_by(Order.id))
+    assert compile_query(datasource).endswith("ORDER BY orders.id")
+
+    datasource = datasource.order_by({"number": "desc"})
+    datasource = datasource.filter(StringFilter("number", "1", StringOperation.EXACT))
+    datasource = datasource.filter(StringFilter("notes", "2", StringOperation.EXACT))
+    assert compile_query(datasource).endswith(
+        "WHERE orders.number = :filter0_0 AND orders.notes = :filter1_0 ORDER BY orders.number DESC"
+    )
+
+
+def test_clone_does_not_modify_original() -> None:
+    datasource = SADataSource(Order)
+    sql = compile_query(datasource)
+    clone = datasource.filter(StringFilter("number", "1", StringOperation.EXACT)).order_by({"number": "asc"})
+    assert clone.metadata is datasource.metadata
+    assert clone.pk_cast is datasource.pk_cast
+    assert compile_query(datasource) == sql
+    assert compile_query(clone.get_query_for_list()) == sql
+
+
+def test_filter_shape_ignores_values() -> None:
+    assert get_filter_shape(InFilter("id", [1])) == get_filter_shape(InFilter("id", [2, 3]))
+    assert get_filter_shape(OrFilter([StringFilter("number", "1", StringOperation.EXACT)])) == get_filter_shape(
+        OrFilter([StringFilter("number", "2", StringOperation.EXACT)])
+    )
+    assert get_filter_shape(StringFilter("number", "1", StringOperation.EXACT)) != get_filter_shape(
+        StringFilter("number", "1", StringOperation.CONTAINS)
+    )
+
+
+def test_filter_expressions_are_cached_by_shape() -> None:
+    statement_cache.clear()
+    first = SADataSource(Order).filter(InFilter("id", ["1", "2"]))
+    second = SADataSource(Order).filter(InFilter("id", ["3"]))
+    assert (statement_cache.hits, statement_cache.misses) == (1, 1)
+    assert compile_query(first) == compile_query(second)
+    assert first._params == {"filter0_0": [1, 2]}
+    assert second._params == {"filter0_0": [3]}
+
+    datasource = second.filter(StringFilter("customer.name", "john", StringOperation.EXACT))
+    assert datasource._params == {"filter0_0": [3], "filter1_0": "john"}
+    assert datasource.get_query_for_list()._params == {}
+
+
+def test_statement_cache_evicts_least_recently_used() -> None:
+    cache = StatementCache(maxsize=2)
+    cache.get_or_create("a", lambda: 1)
+    cache.get_or_create("b", lambda: 2)
+    cache.get_or_create("a", lambda: 3)
+    cache.get_or_create("c", lambda: 4)
+    assert len(cache) == 2
+    assert cache.get_or_create("a", lambda: 5) == 1
+    assert cache.get_or_create("b", lambda: 6) == 6
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+@pytest.fixture
+async def db_request() -> typing.AsyncGenerator[Request, None]:
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        session.add(Customer(id=1, name="John"))
+        await session.commit()
+        yield Request({"type": "http", "state": {"dbsession": session, "dbsessionmaker": sessionmaker}})
+    await engine.dispose()
+
+
+async def test_bulk_create(db_request: Request) -> None:
+    datasource = SADataSource(Order)
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(5)]
+    await datasource.bulk_create(db_request, orders, batch_size=2)
+    assert await datasource.count(db_request) == 5
+
+
+async def test_bulk_create_reports_duplicates(db_request: Request) -> None:
+    datasource = SADataSource(Order)
+    await datasource.create(db_request, Order(number="2", notes="", customer_id=1))
+
+    orders = [Order(number=number, notes="", customer_id=1) for number in ["1", "2", "3", "3", "4"]]
+    with pytest.raises(DuplicateError) as ex:
+        await datasource.bulk_create(db_request, orders, batch_size=2)
+    assert ex.value.rows == [1, 3]
+    assert await datasource.count(db_request) == 4
+
+
+async def test_bulk_update(db_request: Request) -> None:
+    datasource = SADataSource(Order)
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(3)]
+    await datasource.bulk_create(db_request, orders)
+    for order in orders:
+        order.notes = "updated"
+    await datasource.bulk_update(db_request, orders, batch_size=2)
+    assert await datasource.filter(StringFilter("notes", "updated", StringOperation.EXACT)).count(db_request) == 3
+
+
+async def test_bulk_update_reports_duplicates(db_request: Request) -> None:
+    datasource = SADataSource(Order)
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(5)]
+    await datasource.bulk_create(db_request, orders)
+    for order in orders:
+        order.notes = "updated"
+    orders[3].number = "1"
+
+    with pytest.raises(DuplicateError) as ex:
+        await datasource.bulk_update(db_request, orders, batch_size=2)
+    assert ex.value.rows == [3]
+
+    result = await db_request.state.dbsession.execute(sa.select(Order.number, Order.notes).order_by(Order.id))
+    assert result.all() == [("0", "updated"), ("1", "updated"), ("2", "updated"), ("3", ""), ("4", "updated")]
+
+
+async def test_upsert(db_request: Request) -> None:
+    datasource = SADataSource(Order)
+    await datasource.create(db_request, Order(id=1, number="1", notes="", customer_id=1))
+    await datasource.upsert(
+        db_request,
+        [
+            {"id": 1, "number": "1", "notes": "updated", "customer_id": 1},
+            {"id": 2, "number": "2", "notes": "new", "customer_id": 1},
+        ],
+        batch_size=1,
+    )
+    result = await db_request.state.dbsession.execute(sa.select(Order.id, Order.notes).order_by(Order.id))
+    assert result.all() == [(1, "updated"), (2, "new")]
+
+    await datasource.upsert(db_request, [{"number": "2", "notes": "by number", "customer_id": 1}], ["number"])
+    assert await datasource.filter(StringFilter("notes", "by number", StringOperation.EXACT)).count(db_request) == 1
+
+
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+async def test_paginate_by_cursor_with_nulls(db_request: Request, direction: typing.Literal["asc", "desc"]) -> None:
+    datasource = SADataSource(Order)
+    priorities = [2, None, 1, None, 3]
+    await datasource.bulk_create(
+        db_request,
+        [
+            Order(number=str(index), notes="", priority=priority, customer_id=1)
+            for index, priority in enumerate(priorities)
+        ],
+    )
+    datasource = datasource.order_by({"priority": direction})
+    # SQLite sorts NULLs first in ascending order
+    expected = [2, 4, 3, 1, 5] if direction == "asc" else [5, 1, 3, 2, 4]
+
+    seen: list[int] = []
+    page = await datasource.paginate_by_cursor(db_request, None, 2)
+    seen.extend(order.id for order in page)
+    while page.next_cursor:
+        page = await datasource.paginate_by_cursor(db_request, decode_cursor(page.next_cursor), 2)
+        seen.extend(order.id for order in page)
+    assert seen == expected
+
+    # walk back from the last page
+    seen = [order.id for order in page]
+    while page.previous_cursor:
+        page = await datasource.paginate_by_cursor(db_request, decode_cursor(page.previous_cursor), 2)
+        seen = [order.id for order in page] + seen
+    assert seen == expected
+
+
+def test_keyset_clause_with_nulls_largest() -> None:
+    datasource = SADataSource(Order).order_by({"priority": "asc"})
+    keys = datasource.get_keyset_columns()
+    sql = str(datasource._keyset_clause(keys, [1, 2], backwards=False, nulls_largest=True).compile())
+    assert sql == (
+        "orders.priority > :priority_1 OR orders.priority IS NULL "
+        "OR orders.priority = :priority_2 AND orders.id > :id_1"
+    )
+
+    sql = str(datasource._keyset_clause(keys, [None, 2], backwards=False, nulls_largest=True).compile())
+    assert sql == "false OR orders.priority IS NULL AND orders.id > :id_1"
+
+
+def test_copy_columns_skip_unset_columns() -> None:
+    datasource = SADataSource(Order)
+    orders = [Order(number="1", notes="", customer_id=1), Order(number="2", notes="", customer_id=1)]
+    columns = datasource._get_copy_columns(orders)
+    assert columns is not None
+    assert [prop.key for prop in columns] == ["number", "notes", "customer_id"]
+
+    # the primary key is generated for one object and given for another, COPY cannot do both
+    orders[0].id = 10
+    assert datasource._get_copy_columns(orders) is None
+
+
+def test_copy_columns_leave_python_defaults_to_the_orm() -> None:
+    datasource = SADataSource(Event)
+    assert datasource._get_copy_columns([Event(name="a")]) is None
+    assert datasource._get_copy_columns([Event(name="a", status="new"), Event(name="b")]) is None
+
+    events = [Event(name="a", status="new", created_at=datetime.datetime(2026, 2, 1))]
+    columns = datasource._get_copy_columns(events)
+    assert columns is not None
+    assert [prop.key for prop in columns] == ["name", "status", "created_at"]
+
+
+async def test_fast_bulk_create_falls_back_to_inserts(db_request: Request) -> None:
+    datasource = SADataSource(Order)
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(3)]
+    await datasource.bulk_create(db_request, orders, fast=True)
+    assert await datasource.count(db_request) == 3
+
+
+@pytest.fixture
+def executed_statements(db_request: Request) -> typing.Generator[list[str], None, None]:
+    statements: list[str] = []
+
+    def listener(*args: typing.Any) -> None:
+        statements.append(args[2])
+
+    engine = db_request.state.dbsession.bind.sync_engine
+    sa.event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.parametrize("count_execution", ["sequential", "concurrent", "window"])
+async def test_paginate_count_execution(
+    db_request: Request, count_execution: CountExecution, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(5)]
+    await SADataSource(Order).bulk_create(db_request, orders)
+
+    count_connections: list[str] = []
+    count_on_connection = SADataSource._count_on_connection
+
+    async def spy(self: SADataSource, engine: typing.Any) -> int:
+        count_connections.append("count")
+        return await count_on_connection(self, engine)
+
+    monkeypatch.setattr(SADataSource, "_count_on_connection", spy)
+    datasource = SADataSource(Order, count_execution=count_execution).order_by({"number": "asc"})
+    page = await datasource.paginate(db_request, page=2, page_size=2)
+    assert [order.number for order in page.rows] == ["2", "3"]
+    assert page.total_rows == 5
+
+    page = await datasource.paginate(db_request, page=4, page_size=2)  # out of range
+    assert (list(page.rows), page.total_rows) == ([], 5)
+    assert len(count_connections) == (2 if count_execution == "concurrent" else 0)
+
+
+async def test_paginate_without_exact_count(db_request: Request) -> None:
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(6)]
+    await SADataSource(Order).bulk_create(db_request, orders)
+    datasource = SADataSource(Order).filter(InFilter("number", ["0", "1", "2", "3", "4"])).order_by({"number": "asc"})
+
+    page = await datasource.paginate(db_request, page=1, page_size=2, count_strategy="none")
+    assert [order.number for order in page.rows] == ["0", "1"]
+    assert (page.total_rows, page.total_exact, page.has_next) == (None, False, True)
+
+    page = await datasource.paginate(db_request, page=3, page_size=2, count_strategy="none")
+    assert (page.total_rows, page.total_exact, page.has_next) == (5, True, False)  # the last page
+
+    page = await datasource.paginate(db_request, page=1, page_size=2, count_strategy="capped", count_cap=3)
+    assert (page.total_rows, page.total_exact) == (3, False)
+    page = await datasource.paginate(db_request, page=1, page_size=2, count_strategy="capped", count_cap=10)
+    assert (page.total_rows, page.total_exact) == (5, True)
+
+    # SQLite has no estimates, the exact count is used
+    page = await datasource.paginate(db_request, page=1, page_size=2, count_strategy="estimated")
+    assert (page.total_rows, page.total_exact, page.has_next) == (5, False, True)
+
+
+async def test_estimate_count_renders_expanding_parameters() -> None:
+    executed: list[tuple[str, typing.Any]] = []
+
+    class Connection:
+        dialect = postgresql.asyncpg.dialect()
+
+        async def exec_driver_sql(self, sql: str, parameters: typing.Any) -> typing.Any:
+            executed.append((sql, parameters))
+            return types.SimpleNamespace(scalar_one=lambda: '[{"Plan": {"Plan Rows": 42}}]')
+
+    async def connection() -> Connection:
+        return Connection()
+
+    session = types.SimpleNamespace(connection=connection)
+    request = Request({"type": "http", "state": {"dbsession": session}})
+    datasource = SADataSource(Order).filter(StringFilter("notes", "x", StringOperation.EXACT))
+    datasource = datasource.filter(InFilter("number", ["1", "2"]))
+
+    assert await datasource.estimate_count(request) == 42
+    sql, parameters = executed[0]
+    assert "POSTCOMPILE" not in sql
+    assert "orders.number IN ($2::VARCHAR, $3::VARCHAR)" in sql
+    assert parameters == ("x", "1", "2")
+
+
+async def test_window_count_runs_one_query(db_request: Request, executed_statements: list[str]) -> None:
+    await SADataSource(Order).bulk_create(db_request, [Order(number="1", notes="", customer_id=1)])
+    executed_statements.clear()
+
+    page = await SADataSource(Order, count_execution="window").paginate(db_request, page=1, page_size=10)
+    assert page.total_rows == 1
+    assert len(executed_statements) == 1
+    assert "OVER ()" in executed_statements[0]
+
+
+async def test_window_count_skips_joined_collections(db_request: Request, executed_statements: list[str]) -> None:
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(3)]
+    await SADataSource(Order).bulk_create(db_request, orders)
+    executed_statements.clear()
+
+    # joined orders multiply customer rows, the window count would count orders
+    query = sa.select(Customer).options(orm.joinedload(Customer.orders))
+    page = await SADataSource(Customer, query=query, count_execution="window").paginate(db_request, 1, 10)
+    assert page.total_rows == 1
+    assert len(page.rows[0].orders) == 3
+    assert not any("OVER ()" in statement for statement in executed_statements)
+
+
+def test_has_joined_collections() -> None:
+    assert has_joined_collections(sa.select(Customer).options(orm.joinedload(Customer.orders)))
+    assert not has_joined_collections(sa.select(Customer).options(orm.selectinload(Customer.orders)))
+    assert not has_joined_collections(sa.select(Order).options(orm.joinedload(Order.customer)))
+
+
+class IntegrityViolation(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        self.sqlstate = sqlstate
+
+
+class CopyConnection:
+    """Implements asyncpg's copy_records_to_table on top of the aiosqlite connection."""
+
+    def __init__(self, connection: typing.Any) -> None:
+        self.connection = connection
+        self.copied: list[list[tuple[typing.Any, ...]]] = []
+
+    async def copy_records_to_table(
+        self, table_name: str, *, schema_name: str | None, columns: list[str], records: list[tuple[typing.Any, ...]]
+    ) -> None:
+        placeholders = ", ".join("?" for _ in columns)
+        try:
+            await self.connection.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})", records
+            )
+        except sqlite3.IntegrityError as ex:
+            # unique_violation or not_null_violation
+            raise IntegrityViolation("23505" if "UNIQUE" in str(ex) else "23502") from ex
+        self.copied.append(records)
+
+
+@pytest.fixture
+def copy_connection(db_request: Request, monkeypatch: pytest.MonkeyPatch) -> CopyConnection:
+    connection = CopyConnection(None)
+    get_raw_connection = AsyncConnection.get_raw_connection
+
+    async def patched(self: AsyncConnection) -> typing.Any:
+        connection.connection = (await get_raw_connection(self)).driver_connection
+        return types.SimpleNamespace(driver_connection=connection)
+
+    monkeypatch.setattr(AsyncConnection, "get_raw_connection", patched)
+    monkeypatch.setattr(SADataSource, "_supports_copy", lambda self, request: True)
+    return connection
+
+
+async def test_fast_bulk_create_copies_batches(db_request: Request, copy_connection: CopyConnection) -> None:
+    datasource = SADataSource(Order)
+    orders = [Order(number=str(index), notes="", customer_id=1) for index in range(5)]
+    await datasource.bulk_create(db_request, orders, batch_size=2, fast=True)
+    assert [len(records) for records in copy_connection.copied] == [2, 2, 1]
+    assert copy_connection.copied[0] == [("0", "", 1), ("1", "", 1)]
+    assert await datasource.count(db_request) == 5
+
+
+async def test_fast_bulk_create_applies_python_defaults(db_request: Request, copy_connection: CopyConnection) -> None:
+    datasource = SADataSource(Event)
+    for fast in [False, True]:
+        events = [Event(name="a", status="new"), Event(name="b", status="done")]  # created_at is not set
+        await datasource.bulk_create(db_request, events, fast=fast)
+
+    result = await db_request.state.dbsession.execute(sa.select(Event.name, Event.status, Event.created_at))
+    rows = result.all()
+    assert rows[:2] == rows[2:]
+    assert rows[0] == ("a", "new", datetime.datetime(2026, 1, 1))
+
+
+async def test_fast_bulk_create_reports_duplicates(db_request: Request, copy_connection: CopyConnection) -> None:
+    datasource = SADataSource(Order)
+    await datasource.create(db_request, Order(number="3", notes="", customer_id=1))
+
+    # the second batch violates the unique constraint and goes through the regular path
+    orders = [Order(number=number, notes="", customer_id=1) for number in ["1", "2", "3", "4", "5"]]
+    with pytest.raises(DuplicateError) as ex:
+        await datasource.bulk_create(db_request, orders, batch_size=2, fast=True)
+    assert ex.value.rows == [2]
+    assert [len(records) for records in copy_connection.copied] == [2, 1]
+    assert await datasource.count(db_request) == 5
+
+
+async def test_choice_loaders_run_concurrently_with_own_sessions(db_request: Request) -> None:
+    class Form(wtforms.Form):
+        customer_id = wtforms.SelectField()
+
+    form = Form()
+    sessionmaker = db_request.state.dbsessionmaker
+    customer_choices = form_choices_from(Customer, label_attr="name", empty_choice=False, sessionmaker=sessionmaker)
+    results = await asyncio.gather(
+        init_concurrently({"customer_id": load_choices(sessionmaker, form.customer_id, sa.select(Customer))}),
+        customer_choices(db_request),
+    )
+    assert list(results[0]) == ["customer_id"]
+    assert form.customer_id.choices[1][0] == 1
+    assert results[1] == [(1, "John")]
+
+
+async def test_cached_choice_loaders(db_request: Request) -> None:
+    choices_cache.clear()
+    loader = form_choices_from(Customer, label_attr="name", cache_ttl=60, cache_key=lambda request: "tenant-1")
+
+    class Form(wtforms.Form):
+        customer_id = wtforms.SelectField()
+
+    form = Form()
+    stmt = sa.select(Customer)
+    assert await loader(db_request) == [("", ""), (1, "John")]
+    await load_choices(db_request.state.dbsession, form.customer_id, stmt, label_attr="name", cache_ttl=60)
+
+    db_request.state.dbsession.add(Customer(id=2, name="Jane"))
+    await db_request.state.dbsession.flush()
+    assert await loader(db_request) == [("", ""), (1, "John")]
+    await load_choices(db_request.state.dbsession, form.customer_id, stmt, label_attr="name", cache_ttl=60)
+    assert form.customer_id.choices == [("", ""), (1, "John")]
+    assert choices_cache.hits == 2
+
+    choices_cache.invalidate(*SADataSource(Customer).get_cache_tags())
+    assert await loader(db_request) == [("", ""), (1, "John"), (2, "Jane")]
+    assert len(choices_cache) == 1
+
+
+async def test_cached_choice_loaders_are_keyed_by_query(db_request: Request) -> None:
+    choices_cache.clear()
+    assert await form_choices_from(Customer, label_attr="name", cache_ttl=60)(db_request) == [("", ""), (1, "John")]
+
+    # loaders created per request share the cached choices of the same query
+    assert await form_choices_from(Customer, label_attr="name", cache_ttl=60)(db_request) == [("", ""), (1, "John")]
+    assert choices_cache.hits == 1
+
+    assert await form_choices_from(Order, label_attr="number", cache_ttl=60)(db_request) == [("", "")]
+    query = sa.select(Customer).where(Customer.id > 1)
+    assert await form_choices_from(Customer, label_attr="name", cache_ttl=60, query=query)(db_request) == [("", "")]
+    label_loader = form_choices_from(Customer, label_attr=lambda obj: obj.name.upper(), cache_ttl=60)
+    assert await label_loader(db_request) == [("", ""), (1, "JOHN")]
+    assert choices_cache.hits == 1
+
+
+async def add_customers_with_orders(db_request: Request) -> None:
+    session = db_request.state.dbsession
+    session.add_all([Customer(id=index, name=f"Customer {index}") for index in range(2, 5)])
+    session.add_all([Order(number=str(index), notes="", customer_id=index % 3 + 2) for index in range(6)])
+    await session.commit()
+    session.expunge_all()
+
+
+async def test_prefetch_loads_relations(db_request: Request) -> None:
+    await add_customers_with_orders(db_request)
+    datasource = SADataSource(Customer).prefetch(["orders.number", "orders.customer.name"])
+    customers = (await datasource.paginate(db_request, page=1, page_size=10)).rows
+
+    # a lazy load would fail outside of the async session greenlet
+    assert {customer.name: len(customer.orders) for customer in customers} == {
+        "John": 0,
+        "Customer 2": 2,
+        "Customer 3": 2,
+        "Customer 4": 2,
+    }
+    assert all(order.customer is customer for customer in customers for order in customer.orders)
+
+
+async def test_lazy_load_detector(db_request: Request) -> None:
+    await add_customers_with_orders(db_request)
+    session = db_request.state.dbsession
+
+    def read_customer_names(sync_session: orm.Session) -> list[str]:
+        return [order.customer.name for order in sync_session.scalars(sa.select(Order))]
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await session.run_sync(read_customer_names)
+        session.expunge_all()
+
+    async def prefetching_app(scope: Scope, receive: Receive, send: Send) -> None:
+        page = await SADataSource(Order).prefetch(["customer.name"]).paginate(db_request, page=1, page_size=10)
+        assert [order.customer.name for order in page.rows]
+        session.expunge_all()
+
+    scope = {"type": "http", "path": "/orders"}
+    with pytest.warns(LazyLoadWarning, match="/orders: relationship Order.customer was lazy loaded 3 times"):
+        await LazyLoadDetectorMiddleware(app, threshold=3)(scope, mock.AsyncMock(), mock.AsyncMock())
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", LazyLoadWarning)
+        await LazyLoadDetectorMiddleware(app, threshold=4)(scope, mock.AsyncMock(), mock.AsyncMock())
+        await LazyLoadDetectorMiddleware(prefetching_app, threshold=1)(scope, mock.AsyncMock(), mock.AsyncMock())
@@ -0,0 +1,124 @@
+import json
+import typing
+
+import pytest
+import wtforms
+from async_storages import FileStorage, MemoryBackend
+from sqlalchemy import orm
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.datastructures import MultiDict
+from starlette.requests import Request
+
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.datasources.sqlalchemy import SADataSource
+from ohmyadmin.filters import ChoiceFilter, MultiChoiceFilter
+from ohmyadmin.forms.fields import AutocompleteField, MultipleAutocompleteField
+from ohmyadmin.forms.utils import init_form
+from ohmyadmin.resources.resource import ResourceScreen
+from ohmyadmin.testing import MarkupSelector
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class CustomerResource(ResourceScreen):
+    group = "Sales"
+    datasource = SADataSource(Customer)
+    autocomplete_fields = ("name",)
+    autocomplete_page_size = 2
+
+
+RequestFactory = typing.Callable[..., Request]
+
+
+@pytest.fixture
+async def make_request() -> typing.AsyncGenerator[RequestFactory, None]:
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    admin = OhMyAdmin(screens=[CustomerResource()], file_storage=FileStorage(MemoryBackend()))
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all(
+            [Customer(id=index, name=name) for index, name in enumerate(["Jane", "John", "Johnny", "Joe", "Mark"], 1)]
+        )
+        await session.commit()
+
+        def factory(query_string: str = "", headers: typing.Sequence[tuple[bytes, bytes]] = ()) -> Request:
+            return Request(
+                {
+                    "type": "http",
+                    "method": "GET",
+                    "path": "/admin/sales/customers/autocomplete",
+                    "root_path": "",
+                    "query_string": query_string.encode(),
+                    "headers": [(b"host", b"testserver"), *headers],
+                    "state": {"ohmyadmin": admin, "dbsession": session},
+                    "ohmyadmin_root_path": "/admin",
+                    "ohmyadmin_user_menu": [],
+                    "session": {},
+                }
+            )
+
+        yield factory
+    await engine.dispose()
+
+
+async def test_autocomplete_view(make_request: RequestFactory) -> None:
+    resource = CustomerResource()
+    response = await resource.autocomplete_view(make_request("q=jo"))
+    data = json.loads(response.body)
+    assert data["results"] == [{"value": "4", "label": "Joe"}, {"value": "2", "label": "John"}]
+
+    response = await resource.autocomplete_view(make_request(f"q=jo&cursor={data['next_cursor']}"))
+    data = json.loads(response.body)
+    assert data == {"results": [{"value": "3", "label": "Johnny"}], "next_cursor": None}
+
+
+async def test_autocomplete_view_renders_html_for_htmx(make_request: RequestFactory) -> None:
+    response = await CustomerResource().autocomplete_view(make_request("q=j", headers=[(b"hx-request", b"true")]))
+    selector = MarkupSelector(response.body)
+    assert [node.text for node in selector.root.select(".autocomplete-option")] == ["Jane", "Joe"]
+    assert "cursor=" in selector.get_attribute(".autocomplete-more", "hx-get")
+
+
+async def test_autocomplete_choices_keep_order(make_request: RequestFactory) -> None:
+    choices = await CustomerResource().get_autocomplete_choices(make_request(), [5, 100, 1])
+    assert choices == [("5", "Mark"), ("1", "Jane")]
+
+
+async def test_autocomplete_fields(make_request: RequestFactory) -> None:
+    class Form(wtforms.Form):
+        customer_id = AutocompleteField(resource=CustomerResource, coerce=int)
+        watchers = MultipleAutocompleteField(resource=CustomerResource, coerce=int)
+
+    form = Form(MultiDict([("customer_id", "2"), ("watchers", "1"), ("watchers", "5")]))
+    await init_form(make_request(), form)
+    assert form.customer_id.choices == [("2", "John")]
+
+    selector = MarkupSelector(str(form.customer_id))
+    assert selector.get_attribute("o-autocomplete", "url") == "http://testserver/admin/sales/customers/autocomplete"
+    assert [node["value"] for node in selector.root.select("option[selected]")] == ["2"]
+    assert MarkupSelector(str(form.watchers)).has_attribute("select", "multiple")
+    assert form.watchers.choices == [("1", "Jane"), ("5", "Mark")]
+
+
+async def test_choice_filters_with_autocomplete(make_request: RequestFactory) -> None:
+    choice_filter = ChoiceFilter("customer_id", autocomplete=CustomerResource)
+    form = await choice_filter.get_form(make_request("customer_id-choice=3"))
+    assert form.choice.choices == [("", ""), ("3", "Johnny")]
+    assert "o-autocomplete" in str(form.choice)
+
+    multi_filter = MultiChoiceFilter("customer_id", autocomplete=CustomerResource)
+    form = await multi_filter.get_form(make_request("customer_id-choice=3&customer_id-choice=4"))
+    assert form.choice.choices == [("3", "Johnny"), ("4", "Joe")]
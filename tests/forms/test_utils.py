@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import typing
+
+import pytest
+import wtforms
+from starlette.datastructures import MultiDict
+from starlette.requests import Request
+
+from ohmyadmin.forms.utils import blocking, init_concurrently, init_form, Initable, SlowInitWarning, validate_form
+
+
+async def test_validate_form_dispatches_validators() -> None:
+    threads: dict[str, int] = {}
+
+    def inline_validator(form: wtforms.Form, field: wtforms.Field) -> None:
+        threads["inline"] = threading.get_ident()
+
+    @blocking
+    def blocking_validator(form: wtforms.Form, field: wtforms.Field) -> None:
+        threads["blocking"] = threading.get_ident()
+
+    class AsyncValidator:
+        async def __call__(self, form: wtforms.Form, field: wtforms.Field) -> None:
+            threads["async"] = threading.get_ident()
+
+    class Form(wtforms.Form):
+        name = wtforms.StringField(validators=[inline_validator, blocking_validator, AsyncValidator()])
+
+    assert await validate_form(Form(MultiDict({"name": "value"})))
+    assert threads["inline"] == threads["async"] == threading.get_ident()
+    assert threads["blocking"] != threading.get_ident()
+
+
+async def test_validate_form_collects_errors() -> None:
+    async def async_validator(form: wtforms.Form, field: wtforms.Field) -> None:
+        raise wtforms.ValidationError("Taken.")
+
+    class ItemForm(wtforms.Form):
+        quantity = wtforms.IntegerField(validators=[wtforms.validators.NumberRange(min=1)])
+
+    class Form(wtforms.Form):
+        email = wtforms.StringField(validators=[wtforms.validators.Length(min=5), async_validator])
+        items: typing.Any = wtforms.FieldList(wtforms.FormField(ItemForm), min_entries=1)
+
+    form = Form(MultiDict({"email": "a@b", "items-0-quantity": "0"}))
+    assert not await validate_form(form)
+    assert form.email.errors == ["Field must be at least 5 characters long.", "Taken."]
+    assert form.items[0].quantity.errors == ["Number must be at least 1."]
+
+
+class SlowField(wtforms.StringField, Initable):
+    running = 0
+    max_running = 0
+
+    async def init(self, request: Request) -> None:
+        SlowField.running += 1
+        SlowField.max_running = max(SlowField.max_running, SlowField.running)
+        await asyncio.sleep(0.01)
+        SlowField.running -= 1
+
+
+async def test_init_form_runs_initializers_concurrently() -> None:
+    class Form(wtforms.Form):
+        first = SlowField()
+        second = SlowField()
+        third = SlowField()
+
+    request = Request({"type": "http"})
+    SlowField.max_running = 0
+    timings = await init_form(request, Form(), max_concurrency=2)
+    assert set(timings) == {"first", "second", "third"}
+    assert all(elapsed >= 0.01 for elapsed in timings.values())
+    assert SlowField.max_running == 2
+
+
+async def test_init_form_is_sequential_by_default() -> None:
+    class Form(wtforms.Form):
+        first = SlowField()
+        second = SlowField()
+
+    SlowField.max_running = 0
+    await init_form(Request({"type": "http"}), Form())
+    assert SlowField.max_running == 1
+
+
+async def test_init_concurrently_warns_about_slow_initializers() -> None:
+    with pytest.warns(SlowInitWarning, match="Initializing countries took"):
+        await init_concurrently({"countries": asyncio.sleep(0.02), "currencies": asyncio.sleep(0)}, slow_threshold=0.01)
+
+
+async def test_init_concurrently_without_initializers(monkeypatch: pytest.MonkeyPatch) -> None:
+    def semaphore(value: int) -> None:
+        raise AssertionError("Nothing to initialize, no semaphore is needed.")
+
+    monkeypatch.setattr(asyncio, "Semaphore", semaphore)
+    assert await init_concurrently({}) == {}
@@ -12,3 +12,12 @@ class User(BaseUser):
     email: str
     is_active: bool
     birthdate: datetime.date
+    avatar: str = ""
+
+    @property
+    def is_authenticated(self) -> bool:
+        return True
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
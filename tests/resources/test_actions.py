@@ -0,0 +1,154 @@
+import types
+import typing
+import urllib.parse
+from unittest import mock
+
+import pytest
+import sqlalchemy as sa
+import wtforms
+from sqlalchemy import orm
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, create_async_engine
+from starlette.requests import Request
+
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.datasources.sqlalchemy import SADataSource
+from ohmyadmin.forms.utils import populate_object
+from ohmyadmin.importers import ImportReport
+from ohmyadmin.resources.actions import DeleteResourceAction, ImportResourceAction
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Product(Base):
+    __tablename__ = "products"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str]
+    category: orm.Mapped[str] = orm.mapped_column(default="")
+
+
+RequestFactory = typing.Callable[[typing.Mapping[str, typing.Any]], Request]
+
+
+@pytest.fixture
+async def dbsession() -> typing.AsyncGenerator[AsyncSession, None]:
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all([Product(name=f"Product {index}") for index in range(5)])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def action_request(ohmyadmin: OhMyAdmin, dbsession: AsyncSession) -> RequestFactory:
+    def factory(query_params: typing.Mapping[str, typing.Any]) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "scheme": "http",
+                "server": ("testserver", 80),
+                "path": "/actions/delete",
+                "root_path": "",
+                "query_string": urllib.parse.urlencode(query_params).encode(),
+                "headers": [],
+                "session": {},
+                "ohmyadmin_user_menu": [],
+                "state": {
+                    "ohmyadmin": ohmyadmin,
+                    "dbsession": dbsession,
+                    "resource": types.SimpleNamespace(invalidate_cache=mock.AsyncMock()),
+                },
+            }
+        )
+
+    return factory
+
+
+async def count_products(dbsession: AsyncSession) -> int:
+    return await dbsession.scalar(sa.select(sa.func.count()).select_from(Product)) or 0
+
+
+async def test_batch_delete_reports_progress(action_request: RequestFactory, dbsession: AsyncSession) -> None:
+    action = DeleteResourceAction()
+    response = await action.apply_batch(action_request({}), SADataSource(Product), batch_size=2)
+    assert response.status_code == 200
+    assert "Deleted 2 of 5 objects." in response.body.decode()
+    assert "_total=5&amp;_deleted=2" in response.body.decode()
+    assert await count_products(dbsession) == 3
+
+    response = await action.apply_batch(action_request({"_total": 5, "_deleted": 2}), SADataSource(Product), 2)
+    assert "Deleted 4 of 5 objects." in response.body.decode()
+    assert await count_products(dbsession) == 1
+
+
+async def test_batch_delete_completes(action_request: RequestFactory, dbsession: AsyncSession) -> None:
+    await dbsession.execute(sa.delete(Product).where(Product.id <= 4))
+    await dbsession.commit()
+
+    request = action_request({"_total": 5, "_deleted": 4})
+    response = await DeleteResourceAction().apply_batch(request, SADataSource(Product), batch_size=2)
+    assert response.status_code == 204
+    assert "5 objects deleted" in response.headers["hx-trigger"]
+    assert await count_products(dbsession) == 0
+
+
+async def test_batch_delete_cancel(action_request: RequestFactory, dbsession: AsyncSession) -> None:
+    request = action_request({"_total": 5, "_deleted": 2, "_cancel": 1})
+    response = await DeleteResourceAction().apply_batch(request, SADataSource(Product), batch_size=2)
+    assert response.status_code == 204
+    assert "2 of 5 objects deleted" in response.headers["hx-trigger"]
+    assert await count_products(dbsession) == 5
+
+
+@pytest.mark.parametrize("query_params", [{"_total": "x"}, {"_total": 5, "_deleted": "1.5"}, {"_deleted": -1}])
+async def test_batch_delete_rejects_malformed_progress(
+    action_request: RequestFactory, dbsession: AsyncSession, query_params: dict[str, typing.Any]
+) -> None:
+    response = await DeleteResourceAction().apply_batch(action_request(query_params), SADataSource(Product), 2)
+    assert response.status_code == 400
+    assert await count_products(dbsession) == 5
+
+
+class ProductForm(wtforms.Form):
+    name = wtforms.StringField(validators=[wtforms.validators.DataRequired()])
+    category = wtforms.SelectField()
+    secret = wtforms.StringField()
+
+
+async def test_import_initializes_forms_once(action_request: RequestFactory, dbsession: AsyncSession) -> None:
+    calls: list[str] = []
+
+    async def init_create_form(request: Request, form: ProductForm) -> None:
+        calls.append("init")
+        form.category.choices = [("food", "Food"), ("toys", "Toys")]
+        del form.secret
+
+    request = action_request({})
+    request.state.resource = types.SimpleNamespace(
+        form_class=ProductForm,
+        create_form_class=None,
+        datasource=SADataSource(Product),
+        init_create_form=init_create_form,
+        populate_object=populate_object,
+    )
+    action = ImportResourceAction()
+    report = ImportReport()
+    template = await action.create_form_template(request)
+    await action.import_batch(request, [{"name": "Apple", "category": "food"}, {"category": "toys"}], report, template)
+    await action.import_batch(request, [{"name": "Car", "category": "toys", "secret": "x"}], report, template)
+
+    assert calls == ["init"]
+    assert (report.total, report.created) == (3, 2)
+    assert report.errors == [(2, "name: This field is required.")]
+
+    form = await action.create_row_form(request, {"name": "Doll"}, template)
+    assert form.category.choices == [("food", "Food"), ("toys", "Toys")]
+    assert "secret" not in form
+    result = await dbsession.execute(sa.select(Product.name, Product.category).where(Product.id > 5))
+    assert result.all() == [("Apple", "food"), ("Car", "toys")]
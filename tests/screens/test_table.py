@@ -0,0 +1,207 @@
+import asyncio
+import typing
+
+import httpx
+import pytest
+import sqlalchemy as sa
+from async_storages import FileStorage, MemoryBackend
+from sqlalchemy import orm
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.authentication import SimpleUser
+from starlette.requests import Request
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.types import Message, Receive, Scope, Send
+
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.authentication.policy import SESSION_KEY
+from ohmyadmin.components import Component, HTML, Table, TableColumn, TableHeadCell, TableRow, Text
+from ohmyadmin.components.index import IndexView
+from ohmyadmin.datasources.sqlalchemy import SADataSource
+from ohmyadmin.display_fields import DisplayField
+from ohmyadmin.screens.table import TableScreen
+from tests.auth import AuthTestPolicy
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str]
+
+
+class Order(Base):
+    __tablename__ = "orders"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    number: orm.Mapped[str]
+    notes: orm.Mapped[str]
+    customer_id: orm.Mapped[int] = orm.mapped_column(sa.ForeignKey("customers.id"))
+    customer: orm.Mapped[Customer] = orm.relationship()
+
+
+class AdminUser(SimpleUser):
+    avatar = ""
+
+    @property
+    def display_name(self) -> str:
+        return self.username
+
+
+class OrderList(IndexView):
+    # renders the values the columns read, a column outside the projection would fail to lazy load
+    def compose(self, request: Request) -> Component:
+        return HTML(" ".join(f"{order.number}/{order.customer.name}" for order in self.models))
+
+
+class OrderListWithActions(IndexView):
+    # like a row action, reads the primary key and a field the columns do not display
+    def compose(self, request: Request) -> Component:
+        return HTML(" ".join(f"/orders/{order.id}/notes/{order.notes}" for order in self.models))
+
+
+class OrderTable(IndexView):
+    def compose(self, request: Request) -> Component:
+        return Table(
+            self.models,
+            header=TableRow(children=[TableHeadCell("Number")]),
+            row_builder=lambda order: TableRow(children=[TableColumn(Text(order.number))]),
+        )
+
+
+class OrderScreen(TableScreen):
+    label = "Orders"
+    group = "Shop"
+    view_class = OrderList
+    datasource = SADataSource(Order)
+    columns = [DisplayField("number"), DisplayField("customer.name", value_getter=lambda obj: obj.customer.name)]
+
+
+class ProjectedOrderScreen(OrderScreen):
+    label = "Projected orders"
+    project_columns = True
+    columns = [
+        DisplayField("number"),
+        DisplayField("customer", value_getter=lambda obj: obj.customer.name, source_fields=["customer.name"]),
+    ]
+
+
+class UnprojectedOrderScreen(ProjectedOrderScreen):
+    label = "Unprojected orders"
+    project_columns = False
+
+
+class ProjectedOrderActionsScreen(ProjectedOrderScreen):
+    label = "Projected order actions"
+    view_class = OrderListWithActions
+    projection_fields = ["notes"]
+
+
+class StreamedOrderScreen(OrderScreen):
+    label = "Streamed orders"
+    view_class = OrderTable
+    streaming = True
+
+
+@pytest.fixture
+async def app() -> typing.AsyncGenerator[typing.Callable, None]:
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        customer = Customer(name="John")
+        session.add_all([Order(number="A-1", notes="secret", customer=customer)])
+        session.add_all([Order(number=f"B-{index}", notes="", customer=customer) for index in range(2, 51)])
+        await session.commit()
+
+    admin = OhMyAdmin(
+        screens=[OrderScreen(), ProjectedOrderScreen(), ProjectedOrderActionsScreen(), StreamedOrderScreen()],
+        file_storage=FileStorage(MemoryBackend()),
+        auth_policy=AuthTestPolicy(AdminUser("root")),
+    )
+    router = Starlette(routes=[Mount("/admin", app=admin)])
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        async with sessionmaker() as dbsession:
+            scope["session"] = {SESSION_KEY: "1"}
+            scope.setdefault("state", {})["dbsession"] = dbsession
+            await router(scope, receive, send)
+
+    yield app
+    await engine.dispose()
+
+
+async def test_renders_projected_list(app: typing.Callable) -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/admin/shop/projected-orders/")
+    assert response.status_code == 200
+    assert "A-1/John" in response.text
+
+
+async def test_row_actions_read_declared_fields_of_projected_rows(app: typing.Callable) -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/admin/shop/projected-order-actions/")
+    assert response.status_code == 200
+    assert "/orders/1/notes/secret" in response.text
+
+
+async def test_streamed_list_sends_rows_in_chunks(app: typing.Callable) -> None:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "path": "/admin/shop/streamed-orders/",
+        "root_path": "",
+        "query_string": b"page_size=50",
+        "headers": [(b"host", b"testserver")],
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        await asyncio.Event().wait()  # the client never disconnects
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    chunks = [message["body"].decode() for message in messages if message.get("body")]
+    first_row = next(index for index, chunk in enumerate(chunks) if "A-1" in chunk)
+    last_row = next(index for index, chunk in enumerate(chunks) if "B-50" in chunk)
+    assert first_row < last_row
+
+
+def test_projection_keeps_primary_key_and_declared_fields() -> None:
+    screen = ProjectedOrderActionsScreen()
+    request = Request({"type": "http"})
+    stmt = str(screen.apply_projection(request, screen.get_query(request))._stmt)  # type: ignore[attr-defined]
+    assert "orders.id" in stmt
+    assert "orders.notes" in stmt
+
+
+def test_projection_is_opt_in() -> None:
+    screen = UnprojectedOrderScreen()
+    request = Request({"type": "http"})
+    query = screen.get_query(request)
+    assert screen.apply_projection(request, query) is query
+
+
+def test_projection_is_not_applied_to_shared_query() -> None:
+    screen = ProjectedOrderScreen()
+    request = Request({"type": "http"})
+
+    query = screen.get_query(request)
+    assert "orders.notes" in str(query._stmt)  # type: ignore[attr-defined]
+    assert "orders.notes" not in str(screen.apply_projection(request, query)._stmt)  # type: ignore[attr-defined]
+
+
+def test_columns_with_unknown_sources_disable_projection() -> None:
+    screen = OrderScreen()
+    request = Request({"type": "http"})
+    query = screen.get_query(request)
+    assert screen.apply_projection(request, query) is query
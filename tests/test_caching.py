@@ -0,0 +1,216 @@
+import socketserver
+import threading
+import time
+import typing
+
+import pathlib
+
+import pytest
+from starlette.requests import Request
+from starlette.types import Message
+
+from ohmyadmin.caching import ChoicesCache, FragmentCache, MemoryCacheBackend, RedisCacheBackend
+from ohmyadmin.components import Cached, Component
+from ohmyadmin.templating import render_to_response
+
+
+class RedisStandIn(socketserver.StreamRequestHandler):
+    """Serves the subset of Redis commands used by RedisCacheBackend."""
+
+    data: dict[str, bytes] = {}
+
+    def read_command(self) -> list[bytes]:
+        header = self.rfile.readline()
+        if not header:
+            return []
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def write_bulk(self, value: bytes | None) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self) -> None:
+        while command := self.read_command():
+            name, args = command[0].upper(), command[1:]
+            if name == b"GET":
+                reply = self.write_bulk(self.data.get(args[0].decode()))
+            elif name == b"MGET":
+                reply = b"*%d\r\n" % len(args) + b"".join(self.write_bulk(self.data.get(a.decode())) for a in args)
+            elif name == b"SET":
+                self.data[args[0].decode()] = args[1]
+                reply = b"+OK\r\n"
+            elif name == b"DEL":
+                reply = b":%d\r\n" % int(self.data.pop(args[0].decode(), None) is not None)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def redis_url() -> typing.Generator[str, None, None]:
+    RedisStandIn.data = {}
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), RedisStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield "redis://127.0.0.1:{port}/0".format(port=server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    backend = MemoryCacheBackend(max_size=10)
+    backend.set("a", "aaaa")
+    backend.set("b", "bbbb")
+    assert backend.get("a") == "aaaa"
+    backend.set("c", "cccc")
+    assert backend.get("b") is None
+    assert backend.get("a") == "aaaa"
+    assert backend.size == 8
+
+    backend.set("d", "d" * 11)  # larger than the whole cache
+    assert backend.get("d") is None
+
+
+def test_memory_backend_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = MemoryCacheBackend()
+    backend.set("a", "value", ttl=10)
+    assert backend.get("a") == "value"
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_redis_backend(redis_url: str) -> None:
+    backend = RedisCacheBackend(redis_url)
+    assert backend.get("key") is None
+    backend.set("key", "значение", ttl=10)
+    assert backend.get("key") == "значение"
+    assert backend.get_many(["key", "missing"]) == ["значение", None]
+    backend.delete("key")
+    assert backend.get("key") is None
+    backend.close()
+
+
+def test_redis_backend_treats_connection_errors_as_misses() -> None:
+    backend = RedisCacheBackend("redis://127.0.0.1:1/0", timeout=0.1)
+    backend.set("key", "value")
+    assert backend.get("key") is None
+
+
+def test_redis_backend_skips_server_after_connection_error(redis_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = RedisCacheBackend(redis_url, retry_after=60)
+    connect = backend._connect
+    calls: list[str] = []
+
+    def failing_connect() -> None:
+        calls.append("connect")
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(backend, "_connect", failing_connect)
+    assert backend.get("key") is None
+    assert backend.get("key") is None
+    backend.set("key", "value")
+    assert calls == ["connect"]
+
+    # the server is tried again once the retry delay passes
+    monkeypatch.setattr(backend, "_connect", connect)
+    backend._retry_at = 0
+    backend.set("key", "value")
+    assert backend.get("key") == "value"
+    backend.close()
+
+
+async def test_blocking_backend_is_called_from_worker_threads(
+    redis_url: str, template_dir: pathlib.Path, http_get: Request, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Page(Component):
+        def render(self, request: Request) -> str:
+            return "page"
+
+    backend = RedisCacheBackend(redis_url)
+    execute = backend.execute
+    threads: list[threading.Thread] = []
+
+    def recording_execute(*args: str) -> typing.Any:
+        threads.append(threading.current_thread())
+        return execute(*args)
+
+    monkeypatch.setattr(backend, "execute", recording_execute)
+    monkeypatch.setattr(http_get.state.ohmyadmin, "fragment_cache", FragmentCache(backend))
+    (template_dir / "page.html").write_text("{{ component.render(request) }}")
+    http_get.scope.update({"session": {}, "ohmyadmin_user_menu": []})  # read by context processors
+
+    messages: list[Message] = []
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    response = render_to_response(http_get, "page.html", {"component": Cached(Page(), key="page")})
+    await response(http_get.scope, http_get.receive, send)
+    assert messages[1]["body"] == b"page"
+    assert response.headers["content-length"] == "4"
+    assert threads
+    assert threading.main_thread() not in threads
+    backend.close()
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "redis"])
+def test_fragment_cache(backend_name: str, request: pytest.FixtureRequest) -> None:
+    if backend_name == "memory":
+        cache = FragmentCache(MemoryCacheBackend())
+    else:
+        cache = FragmentCache(RedisCacheBackend(request.getfixturevalue("redis_url")))
+    calls: list[str] = []
+
+    def render() -> str:
+        calls.append("render")
+        return f"html{len(calls)}"
+
+    assert cache.get_or_render("menu", render, tags=["users"]) == "html1"
+    assert cache.get_or_render("menu", render, tags=["users"]) == "html1"
+    cache.invalidate("orders")
+    assert cache.get_or_render("menu", render, tags=["users"]) == "html1"
+    cache.invalidate("users")
+    assert cache.get_or_render("menu", render, tags=["users"]) == "html2"
+
+
+def choices_loader(*choices: tuple[typing.Any, str]) -> typing.Callable[[], typing.Awaitable[list[typing.Any]]]:
+    async def loader() -> list[typing.Any]:
+        return list(choices)
+
+    return loader
+
+
+async def test_choices_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ChoicesCache(max_size=2)
+    assert await cache.get_or_load("a", choices_loader((1, "One")), ttl=10) == [(1, "One")]
+    assert await cache.get_or_load("a", choices_loader((2, "Two")), ttl=10) == [(1, "One")]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await cache.get_or_load("b", choices_loader())
+    await cache.get_or_load("c", choices_loader())
+    assert len(cache) == 2
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert await cache.get_or_load("a", choices_loader((2, "Two")), ttl=10) == [(2, "Two")]
+
+
+async def test_choices_cache_invalidation() -> None:
+    cache = ChoicesCache()
+    await cache.get_or_load("countries", choices_loader(("us", "USA")), tags=["table:countries"])
+    await cache.get_or_load("currencies", choices_loader(("usd", "Dollar")), tags=["table:currencies"])
+    cache.invalidate("table:countries")
+    assert len(cache) == 1
+    assert await cache.get_or_load("countries", choices_loader(("de", "Germany"))) == [("de", "Germany")]
+
+    async def invalidating_loader() -> list[typing.Any]:
+        cache.invalidate("table:currencies")  # a write while the choices load
+        return []
+
+    await cache.get_or_load("brands", invalidating_loader)
+    assert await cache.get_or_load("brands", choices_loader((1, "Acme"))) == [(1, "Acme")]
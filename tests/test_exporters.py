@@ -0,0 +1,66 @@
+import datetime
+import io
+import json
+import typing
+import zipfile
+
+from ohmyadmin.display_fields import DisplayField
+from ohmyadmin.exporters import CSVExporter, Exporter, JSONLinesExporter, XLSXExporter
+from tests.models import User
+
+fields = [
+    DisplayField("id"),
+    DisplayField("email"),
+    DisplayField("birthdate"),
+    DisplayField("name", value_getter=lambda user: f"{user.first_name} {user.last_name}"),
+]
+
+
+async def iterate(objects: typing.Sequence[typing.Any]) -> typing.AsyncIterator[typing.Any]:
+    for obj in objects:
+        yield obj
+
+
+async def export(exporter: Exporter, objects: typing.Sequence[typing.Any]) -> bytes:
+    return b"".join([chunk async for chunk in exporter.export(iterate(objects))])
+
+
+users = [
+    User(1, "John", "Doe", "john@example.com", True, datetime.date(2000, 1, 2)),
+    User(2, "Jane", 'O"Neil', None, True, datetime.date(2001, 2, 3)),
+]
+
+
+async def test_csv_exporter() -> None:
+    content = await export(CSVExporter(fields), users)
+    assert content.decode().splitlines() == [
+        "Id,Email,Birthdate,Name",
+        "1,john@example.com,2000-01-02,John Doe",
+        '2,,2001-02-03,"Jane O""Neil"',
+    ]
+
+
+async def test_jsonl_exporter() -> None:
+    content = await export(JSONLinesExporter(fields), users)
+    assert [json.loads(line) for line in content.decode().splitlines()] == [
+        {"id": 1, "email": "john@example.com", "birthdate": "2000-01-02", "name": "John Doe"},
+        {"id": 2, "email": None, "birthdate": "2001-02-03", "name": 'Jane O"Neil'},
+    ]
+
+
+async def test_xlsx_exporter() -> None:
+    content = await export(XLSXExporter(fields), users)
+    archive = zipfile.ZipFile(io.BytesIO(content))
+    assert archive.testzip() is None
+    sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+    assert '<c><v>1</v></c><c t="inlineStr"><is><t xml:space="preserve">john@example.com</t></is></c>' in sheet
+    assert "<c/>" in sheet
+    assert 'Jane O"Neil' in sheet
+
+
+async def test_exporter_yields_chunks() -> None:
+    exporter = CSVExporter(fields)
+    exporter.chunk_size = 100
+    chunks = [chunk async for chunk in exporter.export(iterate(users * 10))]
+    assert len(chunks) > 1
+    assert all(len(chunk) < 200 for chunk in chunks)
@@ -0,0 +1,48 @@
+import typing
+
+import pytest
+from starlette.requests import Request
+
+from ohmyadmin import filters
+
+
+def make_request(query_string: bytes) -> Request:
+    return Request({"type": "http", "query_string": query_string, "headers": [], "state": {}})
+
+
+class CountingFilter(filters.StringFilter):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.calls = {"get_form": 0, "is_active": 0}
+
+    async def get_form(self, request: Request) -> filters.StringFilterForm:
+        self.calls["get_form"] += 1
+        return await super().get_form(request)
+
+    def is_active(self, request: Request) -> bool:
+        self.calls["is_active"] += 1
+        return super().is_active(request)
+
+
+async def test_evaluate_filters_once_per_request() -> None:
+    name_filter = CountingFilter("name")
+    email_filter = CountingFilter("email")
+    request = make_request(b"name-query=john&name-predicate=CONTAINS")
+
+    states = await filters.evaluate_filters(request, [name_filter, email_filter])
+    assert [state.active for state in states] == [True, False]
+    assert states[0].form.query.data == "john"
+
+    assert await filters.evaluate_filters(request, [email_filter]) == [states[1]]
+    assert name_filter.calls == email_filter.calls == {"get_form": 1, "is_active": 1}
+
+    await filters.evaluate_filters(make_request(b""), [name_filter])
+    assert name_filter.calls == {"get_form": 2, "is_active": 2}
+
+
+@pytest.mark.parametrize("query_string, active", [(b"status-choice=paid", True), (b"status-choice=unknown", False)])
+async def test_evaluate_filters_multichoice(query_string: bytes, active: bool) -> None:
+    choice_filter = filters.MultiChoiceFilter("status", choices=[("new", "New"), ("paid", "Paid")])
+
+    (state,) = await filters.evaluate_filters(make_request(query_string), [choice_filter])
+    assert state.active == active
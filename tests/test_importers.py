@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+from ohmyadmin.importers import CSVImporter, Importer, ImportReport, JSONLinesImporter, ParseError
+
+
+async def read_batches(importer: Importer, batch_size: int) -> list[list[dict]]:
+    return [[dict(row) for row in batch] async for batch in importer.iter_batches(batch_size)]
+
+
+async def test_csv_importer() -> None:
+    content = '﻿name,email\nJohn,john@example.com\n"O""Neil",\nJane,jane@example.com\n'
+    batches = await read_batches(CSVImporter(io.BytesIO(content.encode())), batch_size=2)
+    assert batches == [
+        [{"name": "John", "email": "john@example.com"}, {"name": 'O"Neil', "email": ""}],
+        [{"name": "Jane", "email": "jane@example.com"}],
+    ]
+
+
+async def test_jsonl_importer() -> None:
+    content = b'{"name": "John", "tags": ["a", "b"]}\n\n{"name": "Jane", "active": false}\n'
+    batches = await read_batches(JSONLinesImporter(io.BytesIO(content)), batch_size=10)
+    assert batches == [[{"name": "John", "tags": ["a", "b"]}, {"name": "Jane", "active": False}]]
+
+
+async def test_jsonl_importer_reports_bad_lines() -> None:
+    with pytest.raises(ParseError, match="Line 2"):
+        await read_batches(JSONLinesImporter(io.BytesIO(b'{"name": "John"}\n[1]\n')), batch_size=10)
+
+
+def test_to_form_data() -> None:
+    form_data = Importer.to_form_data({"name": "John", "tags": ["a", "b"], "active": True, "age": 30, "email": None})
+    assert list(form_data.multi_items()) == [
+        ("name", "John"),
+        ("tags", "a"),
+        ("tags", "b"),
+        ("active", "true"),
+        ("age", "30"),
+    ]
+
+
+def test_import_report() -> None:
+    report = ImportReport(total=100, created=99, elapsed=0.5)
+    report.add_error(3, "Duplicate object.")
+    assert report.rows_per_second == 200
+    assert report.errors == [(3, "Duplicate object.")]
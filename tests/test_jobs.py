@@ -0,0 +1,188 @@
+import asyncio
+import operator
+import typing
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Mount
+from starlette.types import Receive, Scope, Send
+
+from ohmyadmin.actions.actions import ModalAction
+from ohmyadmin.actions.jobs import AsyncioJobBackend, Job, ProcessPoolJobBackend
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.authentication.policy import SESSION_KEY
+
+
+async def wait_for(job: Job) -> Job:
+    while not job.finished:
+        await asyncio.sleep(0.001)
+    return job
+
+
+async def test_asyncio_backend_runs_job() -> None:
+    async def fn(job: Job, items: list[int]) -> int:
+        for index, _ in enumerate(items, start=1):
+            job.report_progress(index, len(items), message="processing")
+            await asyncio.sleep(0)
+        return sum(items)
+
+    backend = AsyncioJobBackend()
+    job = backend.submit(fn, [1, 2, 3], name="Sum")
+    assert job.status == "pending"
+    assert backend.get(job.id) is job
+
+    await wait_for(job)
+    assert job.status == "done"
+    assert job.result == 6
+    assert job.progress == 3
+    assert job.percent == 100
+    assert job.message == "processing"
+    assert job.finished_at
+
+
+async def test_asyncio_backend_failed_job() -> None:
+    async def fn(job: Job) -> None:
+        raise ValueError("boom")
+
+    job = await wait_for(AsyncioJobBackend().submit(fn))
+    assert job.status == "failed"
+    assert job.error == "boom"
+    assert job.name == "fn"
+
+
+async def test_asyncio_backend_cancel_job() -> None:
+    async def fn(job: Job) -> None:
+        await asyncio.sleep(10)
+
+    backend = AsyncioJobBackend()
+    job = backend.submit(fn)
+    await asyncio.sleep(0)
+    assert backend.cancel(job.id)
+    await wait_for(job)
+    assert job.status == "cancelled"
+    assert not backend.cancel(job.id)
+
+
+async def test_asyncio_backend_concurrency_limit() -> None:
+    running = 0
+    max_running = 0
+
+    async def fn(job: Job) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    backend = AsyncioJobBackend(max_workers=10)
+    jobs = [backend.submit(fn, concurrency_key="action", concurrency_limit=2) for _ in range(5)]
+    await asyncio.sleep(0.001)
+    assert [job.status for job in jobs].count("running") == 2
+    for job in jobs:
+        await wait_for(job)
+    assert max_running == 2
+
+
+async def test_asyncio_backend_forgets_old_jobs() -> None:
+    async def fn(job: Job) -> None:
+        pass
+
+    backend = AsyncioJobBackend(history_size=2)
+    jobs = [await wait_for(backend.submit(fn)) for _ in range(3)]
+    assert backend.get(jobs[0].id) is None
+    assert backend.get(jobs[2].id) is jobs[2]
+
+
+def test_job_percent() -> None:
+    job = Job(name="job")
+    assert job.percent is None
+    job.report_progress(1, 4)
+    assert job.percent == 25
+
+
+async def test_process_pool_backend() -> None:
+    backend = ProcessPoolJobBackend(max_workers=1)
+    try:
+        job = await wait_for(backend.submit(operator.add, 1, 2))
+        assert job.status == "done"
+        assert job.result == 3
+    finally:
+        backend.shutdown()
+
+
+async def test_wait_does_not_cancel_job() -> None:
+    async def fn(job: Job) -> None:
+        await asyncio.sleep(0.05)
+
+    backend = AsyncioJobBackend()
+    job = backend.submit(fn)
+    await backend.wait(job.id, timeout=0.001)
+    assert not job.finished
+    await backend.wait(job.id)
+    assert job.status == "done"
+
+
+@pytest.fixture
+async def client(ohmyadmin: OhMyAdmin) -> typing.AsyncGenerator[httpx.AsyncClient, None]:
+    router = Starlette(routes=[Mount("/admin", app=ohmyadmin)])
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        scope["session"] = {SESSION_KEY: "1"}
+        scope.setdefault("state", {})
+        await router(scope, receive, send)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
+
+
+async def slow_job(job: Job) -> None:
+    await asyncio.sleep(10)
+
+
+async def test_job_views(ohmyadmin: OhMyAdmin, client: httpx.AsyncClient) -> None:
+    job = ohmyadmin.job_backend.submit(slow_job, name="Rebuild index")
+    await asyncio.sleep(0)
+
+    response = await client.get(f"/admin/jobs/{job.id}")
+    assert response.status_code == 200
+    assert "Rebuild index" in response.text
+    assert "Running" in response.text
+
+    response = await client.get(f"/admin/jobs/{job.id}", headers={"hx-request": "true"})
+    assert response.text.lstrip().startswith("<div")
+
+    # the status is rendered after the job handled the cancellation
+    response = await client.post(f"/admin/jobs/{job.id}/cancel", headers={"hx-request": "true"})
+    assert "Cancelled" in response.text
+    assert job.status == "cancelled"
+
+    assert (await client.get("/admin/jobs/unknown")).status_code == 404
+
+
+async def test_action_start_job(ohmyadmin: OhMyAdmin) -> None:
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/admin/actions/rebuild",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "session": {},
+            "ohmyadmin_root_path": "/admin",
+            "ohmyadmin_user_menu": [],
+            "state": {"ohmyadmin": ohmyadmin},
+        }
+    )
+    response = await ModalAction(label="Rebuild index").start_job(request, slow_job)
+    job = ohmyadmin.job_backend.get(response.headers["x-ohmyadmin-job"])
+    assert job
+    assert job.name == "Rebuild index"
+    assert f"/admin/jobs/{job.id}" in response.body.decode()
+    ohmyadmin.job_backend.cancel(job.id)
+    await ohmyadmin.job_backend.wait(job.id)
+    assert job.status == "cancelled"
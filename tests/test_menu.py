@@ -0,0 +1,58 @@
+from async_storages import FileStorage, MemoryBackend
+from starlette.datastructures import URL
+from starlette.requests import Request
+
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.screens.base import Screen
+from ohmyadmin.testing import MarkupSelector
+
+
+class UsersScreen(Screen):
+    label = "Users"
+    group = "Auth"
+
+
+class GroupsScreen(Screen):
+    label = "Groups"
+    group = "Auth"
+
+
+class DocsScreen(Screen):
+    label = "Docs"
+
+    def get_url(self, request: Request) -> URL:
+        return URL("https://example.com/docs")
+
+
+def make_request(admin: OhMyAdmin, path: str, root_path: str = "") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": root_path + path,
+            "root_path": root_path + path,
+            "ohmyadmin_root_path": root_path,
+            "query_string": b"",
+            "headers": [],
+            "server": ("testserver", 80),
+            "scheme": "http",
+            "router": admin,
+            "state": {"ohmyadmin": admin},
+        }
+    )
+
+
+def test_default_menu_is_built_once_per_admin_root_path() -> None:
+    admin = OhMyAdmin(screens=[UsersScreen(), GroupsScreen(), DocsScreen()], file_storage=FileStorage(MemoryBackend()))
+    menu = admin._default_menu_builder(make_request(admin, "/auth/users/"))
+    assert admin._default_menu_builder(make_request(admin, "/auth/groups/")) is menu
+    assert admin._default_menu_builder(make_request(admin, "/auth/groups/", root_path="/admin")) is not menu
+
+    request = make_request(admin, "/auth/groups/", root_path="/admin")
+    selector = MarkupSelector(admin.menu_builder.render(request))
+    assert [node.get("href") for node in selector.root.select(".menu-item")] == [
+        "/admin/auth/users/",
+        "/admin/auth/groups/",
+        "https://example.com/docs",
+    ]
+    assert selector.get_text(".menu-item.active") == "Groups"
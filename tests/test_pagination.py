@@ -0,0 +1,50 @@
+import datetime
+import decimal
+import uuid
+
+from ohmyadmin.pagination import Cursor, CursorPagination, decode_cursor, encode_cursor, Pagination
+
+
+def test_cursor_roundtrip() -> None:
+    cursor = Cursor(
+        direction="next",
+        keys=["-created_at", "id"],
+        values=[datetime.datetime(2024, 1, 2, 3, 4, 5), 42],
+    )
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+
+def test_cursor_roundtrip_typed_values() -> None:
+    values = [datetime.date(2024, 1, 2), decimal.Decimal("1.50"), uuid.uuid4(), None, "text", 1.5, True]
+    cursor = Cursor(direction="previous", keys=[str(index) for index in range(len(values))], values=values)
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+
+def test_decode_malformed_cursor() -> None:
+    assert decode_cursor("not a cursor") is None
+    assert decode_cursor("") is None
+
+
+def test_cursor_pagination() -> None:
+    page = CursorPagination(rows=[1, 2], page_size=2, next_cursor="next")
+    assert page.has_next
+    assert not page.has_previous
+    assert page.has_other
+    assert list(page) == [1, 2]
+    assert len(page) == 2
+
+
+def test_pagination_without_total() -> None:
+    page = Pagination(rows=[1, 2], total_rows=None, page=2, page_size=2, total_exact=False, has_next=True)
+    assert page.has_next
+    assert page.has_previous
+    assert page.total_pages == 3
+    assert page.start_index == 3
+    assert page.end_index == 4
+    assert list(page.iter_pages()) == [1, 2, 3]
+
+
+def test_pagination_with_estimated_total() -> None:
+    page = Pagination(rows=[1, 2], total_rows=3, page=2, page_size=2, total_exact=False, has_next=True)
+    assert page.total_pages == 3
+    assert page.end_index == 4
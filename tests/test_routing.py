@@ -0,0 +1,129 @@
+import typing
+
+import pytest
+import sqlalchemy as sa
+from async_storages import FileStorage, MemoryBackend
+from sqlalchemy import orm
+from starlette.authentication import SimpleUser
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Mount, Route, Router
+from starlette.testclient import TestClient
+from starlette.types import Receive, Scope, Send
+
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.authentication.policy import SESSION_KEY
+from ohmyadmin.datasources.sqlalchemy import SADataSource
+from ohmyadmin.resources.resource import ResourceScreen
+from ohmyadmin.routing import LazyURL, url_for, URLIndex
+from ohmyadmin.screens.base import Screen
+from tests.auth import AuthTestPolicy
+
+
+class Base(orm.DeclarativeBase):
+    pass
+
+
+class Product(Base):
+    __tablename__ = "products"
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
+    name: orm.Mapped[str] = orm.mapped_column(sa.String)
+
+
+class ProductResource(ResourceScreen):
+    group = "Shop"
+    datasource = SADataSource(Product)
+
+
+@pytest.fixture
+def admin() -> OhMyAdmin:
+    return OhMyAdmin(screens=[ProductResource()], file_storage=FileStorage(MemoryBackend()))
+
+
+@pytest.fixture
+def admin_request(admin: OhMyAdmin) -> Request:
+    app = Router(routes=[Route("/", lambda request: None, name="home"), Mount("/admin", app=admin)])
+    return Request(
+        {
+            "type": "http",
+            "path": "/admin/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"example.com")],
+            "scheme": "https",
+            "router": app,
+            "state": {"ohmyadmin": admin},
+            "ohmyadmin_root_path": "/admin",
+        }
+    )
+
+
+reversals: list[tuple[str, dict[str, typing.Any]]] = [
+    ("ohmyadmin.welcome", {}),
+    ("ohmyadmin.static", {"path": "/main.css"}),
+    ("ohmyadmin.media", {"path": "photos/1.jpg"}),
+    ("ohmyadmin.jobs.status", {"job_id": "abc"}),
+    (ProductResource.get_index_route_name(), {}),
+    (ProductResource.get_edit_route_name(), {"object_id": 1}),
+    (ProductResource.get_display_route_name(), {"object_id": "x y"}),
+    ("ohmyadmin.resource.action", {"action_id": "delete"}),
+]
+
+
+@pytest.mark.parametrize("name, path_params", reversals)
+def test_url_index_matches_starlette(admin: OhMyAdmin, name: str, path_params: dict[str, typing.Any]) -> None:
+    assert admin.url_index.url_path_for(name, path_params) == admin.url_path_for(name, **path_params)
+
+
+@pytest.mark.parametrize("name, path_params", reversals)
+def test_url_for(admin_request: Request, name: str, path_params: dict[str, typing.Any]) -> None:
+    assert url_for(admin_request, name, **path_params) == admin_request.url_for(name, **path_params)
+
+
+def test_url_index_misses() -> None:
+    index = URLIndex([Route("/users/{id:int}", lambda request: None, name="user")])
+    assert index.url_path_for("user", {"id": 1}) == "/users/1"
+    assert index.url_path_for("user", {}) is None
+    assert index.url_path_for("unknown", {}) is None
+
+
+def test_url_for_falls_back_to_starlette(admin_request: Request) -> None:
+    assert str(url_for(admin_request, "home")) == "https://example.com/"
+
+
+def test_lazy_url_query_params(admin_request: Request) -> None:
+    url = LazyURL("ohmyadmin.resource.action", {"object_id": ["1", "2"], "all": 1}, {"action_id": "delete"})
+    assert str(url.resolve(admin_request)) == (
+        "https://example.com/admin/shop/products/actions/delete?object_id=1&object_id=2&all=1"
+    )
+
+
+def test_prefix_dispatcher() -> None:
+    class TextScreen(Screen):
+        async def dispatch(self, request: Request) -> Response:
+            return PlainTextResponse(f"{request.state.screen.label} {request.scope['root_path']}")
+
+    screens = [
+        type(f"Screen{index}", (TextScreen,), {"label": f"Screen {index}", "group": "Pages"})() for index in range(50)
+    ]
+    auth_policy = AuthTestPolicy(SimpleUser("root"))
+    admin = OhMyAdmin(screens=screens, file_storage=FileStorage(MemoryBackend()), auth_policy=auth_policy)
+    router = Router(routes=[Mount("/admin", app=admin)])
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        scope["session"] = {SESSION_KEY: "1"}
+        await router(scope, receive, send)
+
+    client = TestClient(app)
+
+    response = client.get("/admin/pages/screen-42/")
+    assert response.text == "Screen 42 /admin/pages/screen-42"
+    assert (
+        client.get("/admin/pages/screen-42", follow_redirects=False)
+        .headers["location"]
+        .endswith("/admin/pages/screen-42/")
+    )
+    assert client.get("/admin/pages/unknown/").status_code == 404
+    assert client.get("/admin/pages/").status_code == 404
+    assert admin.url_path_for(screens[42].url_name) == "/pages/screen-42/"
+    assert admin.url_index.url_path_for(screens[42].url_name, {}) == "/pages/screen-42/"
@@ -0,0 +1,58 @@
+import asyncio
+import pathlib
+import typing
+
+import jinja2
+from starlette.requests import Request
+
+from ohmyadmin.__main__ import main
+from ohmyadmin.app import OhMyAdmin
+from ohmyadmin.templating import create_jinja_env, MemoryBytecodeCache, precompile_templates, stream_to_response
+
+
+def test_precompile_templates(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "broken.html").write_text("{% if %}")
+    (tmp_path / "custom.html").write_text("hello")
+    jinja_env = create_jinja_env(template_dir=tmp_path)
+    errors = precompile_templates(jinja_env)
+    assert list(errors) == ["broken.html"]
+    assert isinstance(errors["broken.html"], jinja2.TemplateSyntaxError)
+    assert len(jinja_env.cache) == len(jinja_env.list_templates()) - 1
+
+
+def test_memory_bytecode_cache() -> None:
+    bytecode_cache = MemoryBytecodeCache()
+    OhMyAdmin(bytecode_cache=bytecode_cache, precompile=True)
+    assert len(bytecode_cache._cache) == len(create_jinja_env().list_templates())
+
+    # another environment loads templates from the cache without compiling them
+    jinja_env = create_jinja_env(bytecode_cache=bytecode_cache)
+    jinja_env.compile = None  # type: ignore[assignment]
+    jinja_env.get_template("ohmyadmin/base.html")
+
+
+def test_precompile_cli(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    assert main(["precompile-templates", str(cache_dir)]) == 0
+    assert len(list(cache_dir.iterdir())) == len(create_jinja_env().list_templates())
+
+
+async def test_stream_to_response(template_dir: pathlib.Path, ohmyadmin: OhMyAdmin) -> None:
+    (template_dir / "rows.html").write_text("<table>{% for row in rows %}<tr>{{ row }}</tr>{% endfor %}</table>")
+    scope = {"type": "http", "state": {"ohmyadmin": ohmyadmin}, "session": {}, "ohmyadmin_user_menu": []}
+    response = stream_to_response(Request(scope), "rows.html", {"rows": ["a", "<b>"]}, buffer_size=2)
+
+    messages: list[typing.MutableMapping[str, typing.Any]] = []
+
+    async def receive() -> typing.MutableMapping[str, typing.Any]:
+        await asyncio.Event().wait()  # the client never disconnects
+        return {"type": "http.disconnect"}
+
+    async def send(message: typing.MutableMapping[str, typing.Any]) -> None:
+        messages.append(message)
+
+    await response(scope, receive, send)
+    chunks = [message["body"] for message in messages if message.get("body")]
+    assert len(chunks) > 1
+    assert b"".join(chunks) == b"<table><tr>a</tr><tr>&lt;b&gt;</tr></table>"
+    assert messages[0]["headers"][0] == (b"content-type", b"text/html; charset=utf-8")